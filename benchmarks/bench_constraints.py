@@ -0,0 +1,86 @@
+"""
+Solve time with and without availability rules (scheduler.constraints).
+
+Every solver pass checks eligibility against per-employee bitsets, so a
+roster where a share of employees carry rules should solve about as fast
+as the same roster without them. The first row times the roster as read;
+the others give --share of the employees two or three random rules each,
+with and without a global "evening then morning" rest rule, and also time
+compiling the rules into bitsets. Every schedule is checked for seats its
+rules forbid.
+
+    python benchmarks/bench_constraints.py
+    python benchmarks/bench_constraints.py --sizes 1000 50000 --solver mincost
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+from synth import write_roster
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from scheduler import Availability, Calendar, SolveConfig, parse_roster, solve
+
+RULES = ["Monday", "Tuesday", "Sunday", "evening", "morning", "Friday morning", "Saturday evening",
+         "Wednesday afternoon"]
+REST = "evening then morning"
+
+def violations(schedule):
+    """Seats that break a static or rest rule."""
+    roster = schedule.roster
+    availability = Availability(roster, schedule.calendar)
+    held = {}
+    bad = 0
+    for slot in range(len(schedule.occupancy)):
+        for emp in schedule.slot_ids(slot):
+            held.setdefault(emp, []).append(slot)
+            bad += availability.static[emp] >> slot & 1
+    for emp in availability.rest:
+        slots = held.get(emp, [])
+        bad += bool(availability.rest_bits(emp, slots) & sum(1 << slot for slot in slots))
+    return bad
+
+def timed(roster, calendar, solver, seed, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schedule = solve(roster, SolveConfig(solver=solver, seed=seed, calendar=calendar))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, schedule
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--share", type=float, default=0.5, help="share of employees given rules")
+    parser.add_argument("--solver", default="greedy")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'rules':>22} {'compile ms':>11} {'solve ms':>9} {'vs none':>8} {'filled':>13} {'violations':>10}")
+    for n in args.sizes:
+        text = io.StringIO()
+        write_roster(text, n, True, "morning=0.5", args.seed)
+        # Enough seats for a fifth of the employees on each shift
+        calendar = Calendar(capacity=max(1, n // 5))
+        roster = parse_roster(io.StringIO(text.getvalue()), calendar)
+        rng = random.Random(args.seed)
+        constrained = {emp: rng.sample(RULES, rng.randint(2, 3)) for emp in range(n) if rng.random() < args.share}
+        baseline = None
+        for label, rules in [("none", {}), ("static", constrained),
+                             ("static + rest", {emp: rules + [REST] for emp, rules in constrained.items()})]:
+            roster.rules = rules
+            start = time.perf_counter()
+            Availability(roster, calendar)
+            compile_ms = (time.perf_counter() - start) * 1000 if rules else 0.0
+            seconds, schedule = timed(roster, calendar, args.solver, args.seed, args.repeat)
+            baseline = baseline or seconds
+            print(f"{n:>10} {label:>22} {compile_ms:>11.1f} {seconds * 1000:>9.1f} {seconds / baseline:>7.2f}x "
+                  f"{sum(schedule.occupancy):>6}/{len(schedule.seats):<6} {violations(schedule):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Memory held by a parsed roster and its schedule: the engine's Roster and
+Schedule against the dict layout every script used before it.
+
+The legacy side reads the CSV exactly as the original scripts did: one
+`{"preferences": {day: [shift, ...]}, "days_worked": 0}` dict per
+employee and a `{day: {shift: [names]}}` schedule. The engine side is
+`read_roster` and `solve`. Sizes are the bytes still allocated once each
+structure is built, as traced by tracemalloc, so parser temporaries do
+not count. A Schedule also carries the per-employee state (days worked,
+on-day flags, availability bitsets) that the legacy records kept inline,
+so it can outweigh a legacy schedule with few seats. The last columns
+are the size of one legacy record and of one `__slots__` Employee view.
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sizes 1000 100000 --capacity 1000
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from synth import write_roster
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from scheduler import DAYS, SHIFTS, SolveConfig, extract_shift, read_roster, solve
+
+def legacy_read(path):
+    """The CSV reader of src/2/employee.py before the engine."""
+    employees = {}
+    with open(path, newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            preferences = {}
+            for day in DAYS:
+                pref_list = []
+                for rank in ['_1', '_2', '_3']:
+                    key = day + rank
+                    if key in row:
+                        shift = extract_shift(row[key])
+                        if shift:
+                            pref_list.append(shift)
+                preferences[day] = pref_list
+            employees[row['name']] = {"preferences": preferences, "days_worked": 0}
+    return employees
+
+def legacy_schedule(schedule):
+    """The engine's seats in the legacy {day: {shift: [names]}} layout."""
+    return {day: {shift: list(names) for shift, names in shifts.items()}
+            for day, shifts in schedule.as_dict().items()}
+
+def retained(fn, *args):
+    """(result, bytes allocated by fn and still alive while the result is)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def deep_size(record):
+    """Bytes of one legacy record: its dicts and lists, not the shared strings."""
+    size = sys.getsizeof(record) + sys.getsizeof(record["preferences"])
+    return size + sum(sys.getsizeof(prefs) for prefs in record["preferences"].values())
+
+def mb(n):
+    return f"{n / 1e6:.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--capacity", type=int, default=2, help="seats per shift")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'dict roster':>12} {'Roster':>10} {'ratio':>6} "
+          f"{'dict schedule':>14} {'Schedule':>10} {'record':>7} {'view':>5}")
+    for n in args.sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False) as f:
+            write_roster(f, n, True, None, args.seed)
+            path = f.name
+        try:
+            employees, legacy_bytes = retained(legacy_read, path)
+            roster, roster_bytes = retained(read_roster, path)
+        finally:
+            os.unlink(path)
+        schedule, schedule_bytes = retained(solve, roster, SolveConfig(capacity=args.capacity, seed=args.seed))
+        # The legacy schedule only holds references to names the roster already has
+        _, legacy_schedule_bytes = retained(legacy_schedule, schedule)
+        record = deep_size(next(iter(employees.values())))
+        view = sys.getsizeof(roster[0])
+        print(f"{n:>10} {mb(legacy_bytes):>12} {mb(roster_bytes):>10} {legacy_bytes / roster_bytes:>5.1f}x "
+              f"{mb(legacy_schedule_bytes):>14} {mb(schedule_bytes):>10} {record:>6}B {view:>4}B")
+        del employees, roster, schedule
+    print(f"shifts: {', '.join(SHIFTS)}; schedule capacity {args.capacity} per shift")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+PDF export throughput in pages per second: the paginated schedule table,
+and the per-employee zip rendered with different numbers of worker
+processes.
+
+    python benchmarks/bench_pdf.py --sizes 100 1000 5000 --jobs 1 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+from scheduler import Calendar, SolveConfig, read_roster, solve
+from scheduler.pdfexport import export_employee_pdfs, write_schedule_pdf
+
+from synth import write_roster
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count()])
+    parser.add_argument("--table-capacity", type=int, default=50,
+                        help="seats per shift for the table, so name lists wrap and paginate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'export':>14} {'pages':>7} {'seconds':>8} {'pages/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for employees in args.sizes:
+            roster_path = os.path.join(tmp, f"roster_{employees}.csv")
+            with open(roster_path, 'w', newline='') as f:
+                write_roster(f, employees, True, "", args.seed)
+            roster = read_roster(roster_path)
+
+            crowded = Calendar(capacity=args.table_capacity)
+            schedule = solve(roster, SolveConfig(calendar=crowded, seed=args.seed, max_days=None))
+            start = time.perf_counter()
+            pages = write_schedule_pdf(schedule, os.path.join(tmp, "schedule.pdf"))
+            elapsed = time.perf_counter() - start
+            print(f"{employees:>10} {'table':>14} {pages:>7} {elapsed:>8.3f} {pages / elapsed:>9.0f}")
+
+            schedule = solve(roster, SolveConfig(seed=args.seed))
+            for jobs in args.jobs:
+                start = time.perf_counter()
+                pages = export_employee_pdfs(schedule, os.path.join(tmp, "staff.zip"), jobs)
+                elapsed = time.perf_counter() - start
+                label = f"staff x{jobs}"
+                print(f"{employees:>10} {label:>14} {pages:>7} {elapsed:>8.3f} {pages / elapsed:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Candidate schedules scored per second by scheduler.scoring.Scorer, with
+the NumPy path against the pure-Python fallback.
+
+    python benchmarks/bench_scoring.py --sizes 1000 10000 --candidates 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+from scheduler import Calendar, SolveConfig, read_roster, solve
+from scheduler.scoring import Scorer, np
+
+from synth import write_roster
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--distinct", type=int, default=8, help="schedules actually solved; the batch repeats them")
+    parser.add_argument("--python-candidates", type=int, default=100,
+                        help="candidates scored by the slower fallback")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if np is None:
+        print("NumPy is not installed; only the fallback is timed", file=sys.stderr)
+
+    print(f"{'employees':>10} {'path':>8} {'candidates':>11} {'seconds':>8} {'cand/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for employees in args.sizes:
+            roster_path = os.path.join(tmp, f"roster_{employees}.csv")
+            with open(roster_path, 'w', newline='') as f:
+                write_roster(f, employees, True, "", args.seed)
+            # Enough seats that most of the roster works, as in a real site
+            calendar = Calendar(capacity=max(2, employees // 20))
+            roster = read_roster(roster_path, calendar)
+            schedules = [solve(roster, SolveConfig(calendar=calendar, seed=args.seed + i)) for i in range(args.distinct)]
+
+            for use_numpy, count in ((True, args.candidates), (False, args.python_candidates)):
+                if use_numpy and np is None:
+                    continue
+                scorer = Scorer(roster, calendar, use_numpy=use_numpy)
+                assignments = [scorer.assignment(s) for s in schedules]
+                batch = scorer.stack((assignments * (count // len(assignments) + 1))[:count])
+                start = time.perf_counter()
+                scorer.score(batch)
+                elapsed = time.perf_counter() - start
+                label = "numpy" if use_numpy else "python"
+                print(f"{employees:>10} {label:>8} {count:>11} {elapsed:>8.3f} {count / elapsed:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare the greedy and min-cost solvers on solution quality and runtime.
+
+Quality is reported as how many seats went to first, second and third
+choices, how many went to unlisted shifts, and the total rank cost
+(0 per first choice, 1 per second, 2 per third, 3 per unlisted shift).
+The "greedy+ls" row is the greedy schedule after --improve-ms of local
+search (scheduler.improve).
+
+    python benchmarks/bench_solvers.py
+    python benchmarks/bench_solvers.py --sizes 100 10000 --capacity 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from scheduler import DAYS, SHIFTS, Roster, SolveConfig, solve
+from scheduler.improve import improve
+
+def make_roster(n, seed):
+    """Skewed preferences so first choices are genuinely contested."""
+    rng = random.Random(seed)
+    roster = Roster()
+    for i in range(n):
+        preferences = {}
+        for day in DAYS:
+            first = rng.choices(SHIFTS, weights=[6, 3, 1])[0]
+            rest = [s for s in SHIFTS if s != first]
+            rng.shuffle(rest)
+            preferences[day] = [first] + rest
+        roster.add(f"emp{i}", preferences)
+    return roster
+
+def quality(roster, schedule):
+    hits = [0] * (roster.ranks + 1)
+    n_shifts = len(roster.shifts)
+    for d in range(len(roster.days)):
+        for s in range(n_shifts):
+            for emp in schedule.slot_ids(d * n_shifts + s):
+                ranked = roster.ranked(emp, d)
+                hits[ranked.index(s) if s in ranked else roster.ranks] += 1
+    return hits, sum(rank * count for rank, count in enumerate(hits))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--improve-ms", type=int, default=200, help="local search budget for the greedy+ls row")
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'solver':>10} {'time (s)':>9} {'1st':>6} {'2nd':>6} {'3rd':>6} {'other':>6} {'cost':>6}")
+    for n in args.sizes:
+        roster = make_roster(n, args.seed)
+        for solver in ("greedy", "greedy+ls", "mincost"):
+            config = SolveConfig(capacity=args.capacity, rng=random.Random(args.seed), solver=solver.split("+")[0])
+            start = time.perf_counter()
+            schedule = solve(roster, config)
+            if solver.endswith("+ls"):
+                schedule, _ = improve(schedule, args.improve_ms)
+            elapsed = time.perf_counter() - start
+            hits, cost = quality(roster, schedule)
+            print(f"{n:>10} {solver:>10} {elapsed:>9.4f} " + " ".join(f"{h:>6}" for h in hits) + f" {cost:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Cold-start time of the headless entry points on a small roster, with an
+`-X importtime` breakdown and a budget check for cron use.
+
+Each command is run in a fresh interpreter several times. The median wall
+time minus that of a bare `python -c pass` is the cost of our imports and
+the solve; it must stay under --budget-ms, and none of the GUI, PDF or
+table modules may be imported. Exits 1 when either check fails.
+
+    python benchmarks/bench_startup.py --budget-ms 60 --runs 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from synth import write_roster
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.normpath(os.path.join(HERE, "..", "src"))
+# Modules a headless run must never load
+HEAVY = ("tkinter", "fpdf", "tabulate")
+
+def wall_ms(cmd, cwd, runs):
+    """Median wall time of `runs` fresh runs, in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def import_times(cmd, cwd):
+    """
+    From one `-X importtime` run: {top-level module: cumulative microseconds}
+    and the set of every module imported at any depth.
+    """
+    result = subprocess.run([cmd[0], "-X", "importtime"] + cmd[1:], cwd=cwd, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    times = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip())
+        # Only top-level imports; nested ones are already in their parent's total
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="most milliseconds a run may add on top of a bare interpreter")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports listed per command")
+    args = parser.parse_args()
+
+    python = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, ranked in (("employee_shifts.csv", False), ("employee_shifts_bonus.csv", True)):
+            with open(os.path.join(tmp, name), 'w', newline='') as f:
+                write_roster(f, args.employees, ranked, "", 0)
+        out = os.path.join(tmp, "out.csv")
+        commands = {
+            "bare interpreter": ([python, "-c", "pass"], tmp),
+            "scheduler.cli": ([python, "-m", "scheduler.cli", os.path.join(tmp, "employee_shifts_bonus.csv"),
+                               "--seed", "0", "--quiet", "--export", out], SRC),
+            "src/4 headless": ([python, os.path.join(SRC, "4", "schedule.py"),
+                                os.path.join(tmp, "employee_shifts_bonus.csv"), "--seed", "0", "--quiet",
+                                "--export", out], tmp),
+            "src/1 --quiet": ([python, os.path.join(SRC, "1", "schedule.py"), "--seed", "0", "--quiet",
+                               "--export", out], tmp),
+            "src/2 --quiet": ([python, os.path.join(SRC, "2", "employee.py"), "--seed", "0", "--quiet",
+                               "--export", out], tmp),
+        }
+
+        failed = False
+        baseline = None
+        print(f"{'command':<18} {'wall ms':>8} {'+ms':>7} {'imports ms':>11}   slowest imports")
+        for label, (cmd, cwd) in commands.items():
+            wall = wall_ms(cmd, cwd, args.runs)
+            imports, loaded = import_times(cmd, cwd)
+            if baseline is None:
+                baseline = (wall, set(imports))
+            extra = wall - baseline[0]
+            # Imports the interpreter makes on its own are not ours to budget
+            ours = {module: us for module, us in imports.items() if module not in baseline[1]}
+            slowest = sorted(ours.items(), key=lambda item: -item[1])[:args.top]
+            print(f"{label:<18} {wall:>8.1f} {extra:>7.1f} {sum(ours.values()) / 1000:>11.1f}   "
+                  + ", ".join(f"{module} {us / 1000:.1f}" for module, us in slowest))
+            heavy = sorted(module for module in loaded if module.split(".")[0] in HEAVY)
+            if heavy:
+                print(f"  FAIL: imported {', '.join(heavy)}", file=sys.stderr)
+                failed = True
+            if extra > args.budget_ms:
+                print(f"  FAIL: {extra:.1f} ms over the bare interpreter, budget {args.budget_ms:.0f} ms",
+                      file=sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
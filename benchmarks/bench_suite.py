@@ -0,0 +1,127 @@
+"""
+Benchmark suite: parse, solve and render timed separately on synthetic
+rosters of increasing size in both CSV layouts, with peak memory per phase.
+
+Results are written as JSON so runs from different commits can be diffed;
+pass --baseline to print the ratio against an earlier results file.
+
+    python benchmarks/bench_suite.py --output bench_results.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 --baseline old.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+from scheduler import SolveConfig, read_roster, solve
+
+from synth import write_roster
+
+def render(schedule):
+    """Build the text table the CLI scripts print (tabulate when installed)."""
+    headers = ["Day"] + [shift.capitalize() for shift in schedule.shifts]
+    try:
+        from tabulate import tabulate
+    except ImportError:
+        return "\n".join(" | ".join(row) for row in [headers] + schedule.rows())
+    return tabulate(schedule.rows(), headers=headers, tablefmt="grid")
+
+def measure(fn, repeat):
+    """Best wall time over `repeat` runs, then peak traced memory of one more run."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_case(employees, ranked, skew, seed, repeat, solver):
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False) as f:
+        write_roster(f, employees, ranked, skew, seed)
+        path = f.name
+    try:
+        roster, parse_s, parse_peak = measure(lambda: read_roster(path), repeat)
+        schedule, solve_s, solve_peak = measure(lambda: solve(roster, SolveConfig(solver=solver, seed=seed)), repeat)
+        _, render_s, render_peak = measure(lambda: render(schedule), repeat)
+    finally:
+        os.unlink(path)
+    return {
+        "employees": employees,
+        "format": "ranked" if ranked else "simple",
+        "solver": solver,
+        "parse_s": parse_s,
+        "solve_s": solve_s,
+        "render_s": render_s,
+        "parse_peak_kib": parse_peak / 1024,
+        "solve_peak_kib": solve_peak / 1024,
+        "render_peak_kib": render_peak / 1024,
+    }
+
+def case_key(case):
+    return (case["employees"], case["format"], case["solver"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--formats", nargs="+", choices=["simple", "ranked"], default=["simple", "ranked"])
+    parser.add_argument("--solver", default="greedy")
+    parser.add_argument("--skew", default="morning=0.8")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {case_key(case): case for case in json.load(f)["cases"]}
+
+    cases = []
+    print(f"{'employees':>10} {'format':>7} {'parse s':>9} {'solve s':>9} {'render s':>9} {'peak MiB':>9}")
+    for employees in args.sizes:
+        for fmt in args.formats:
+            case = run_case(employees, fmt == "ranked", args.skew, args.seed, args.repeat, args.solver)
+            cases.append(case)
+            peak = max(case["parse_peak_kib"], case["solve_peak_kib"], case["render_peak_kib"]) / 1024
+            line = (f"{employees:>10} {fmt:>7} {case['parse_s']:>9.4f} {case['solve_s']:>9.4f} "
+                    f"{case['render_s']:>9.4f} {peak:>9.2f}")
+            old = baseline.get(case_key(case))
+            if old:
+                line += "  vs baseline: " + " ".join(
+                    f"{phase} x{case[phase + '_s'] / old[phase + '_s']:.2f}"
+                    for phase in ("parse", "solve", "render") if old[phase + "_s"])
+            print(line)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "skew": args.skew,
+        "seed": args.seed,
+        "cases": cases,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Scaling benchmark for the vacancy fill.
+
+Shift capacity is set to the roster size so every day still has open
+seats after the preference passes, which forces the random fill to run.
+The engine is timed from 10 up to 100k employees; the pre-engine dict/list
+loop is timed alongside it up to --legacy-max employees.
+
+    python benchmarks/bench_vacancy_fill.py
+    python benchmarks/bench_vacancy_fill.py --sizes 10 1000 100000 --legacy-max 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from scheduler import DAYS, SHIFTS, Roster, SolveConfig, solve
+
+def make_roster(n, seed):
+    rng = random.Random(seed)
+    roster = Roster()
+    for i in range(n):
+        roster.add(f"emp{i}", {day: rng.sample(SHIFTS, 3) for day in DAYS})
+    return roster
+
+def legacy_solve(roster, capacity, rng):
+    """The nested dict-of-lists loop every script used before the engine."""
+    employees = {}
+    for emp, name in enumerate(roster.names):
+        preferences = {day: [SHIFTS[s] for s in roster.ranked(emp, d)] for d, day in enumerate(DAYS)}
+        employees[name] = {"preferences": preferences, "days_worked": 0}
+    schedule = {day: {shift: [] for shift in SHIFTS} for day in DAYS}
+    for day in DAYS:
+        unassigned = []
+        for emp, details in employees.items():
+            for pref in details["preferences"][day]:
+                if len(schedule[day][pref]) < capacity:
+                    schedule[day][pref].append(emp)
+                    details["days_worked"] += 1
+                    break
+            else:
+                unassigned.append(emp)
+        for emp in unassigned:
+            for shift in SHIFTS:
+                if len(schedule[day][shift]) < capacity:
+                    schedule[day][shift].append(emp)
+                    employees[emp]["days_worked"] += 1
+                    break
+        for shift in SHIFTS:
+            while len(schedule[day][shift]) < capacity:
+                available = [emp for emp in employees if emp not in sum(schedule[day].values(), [])]
+                if not available:
+                    break
+                chosen = rng.choice(available)
+                schedule[day][shift].append(chosen)
+                employees[chosen]["days_worked"] += 1
+    return schedule
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=2000,
+                        help="largest roster to run the quadratic legacy loop on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'engine (s)':>12} {'legacy (s)':>12} {'speedup':>9}")
+    for n in args.sizes:
+        roster = make_roster(n, args.seed)
+        engine = timed(lambda: solve(roster, SolveConfig(capacity=n, rng=random.Random(args.seed))))
+        if n <= args.legacy_max:
+            legacy = timed(lambda: legacy_solve(roster, n, random.Random(args.seed)))
+            print(f"{n:>10} {engine:>12.4f} {legacy:>12.4f} {legacy / engine:>8.1f}x")
+        else:
+            print(f"{n:>10} {engine:>12.4f} {'-':>12} {'-':>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Load test for the scheduling service (scheduler.service) on localhost.
+
+Starts the service on a free port (or uses --port of one already running),
+then keeps --concurrency keep-alive connections busy with /solve requests.
+Requests cycle through --rosters distinct synthetic rosters and --seeds
+seeds, so repeats hit the warm roster cache and identical concurrent
+requests are coalesced. Prints throughput, client-side latency
+percentiles and the service's own /metrics at the end.
+
+    python benchmarks/load_service.py --requests 2000 --concurrency 32 --jobs 4
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+from synth import write_roster
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.normpath(os.path.join(HERE, "..", "src"))
+sys.path.insert(0, SRC)
+from scheduler.batch import percentile
+
+async def call(reader, writer, method, path, body=b""):
+    """One request on an open keep-alive connection; returns (status, JSON payload)."""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(port, bodies, counter, results):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            n = next(counter, None)
+            if n is None:
+                return
+            start = time.perf_counter()
+            status, payload = await call(reader, writer, "POST", "/solve", bodies[n % len(bodies)])
+            results.append((status, (time.perf_counter() - start) * 1000, payload.get("coalesced", False)))
+    finally:
+        writer.close()
+
+async def run(port, bodies, total, concurrency):
+    counter = iter(range(total))
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, bodies, counter, results) for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, metrics = await call(reader, writer, "GET", "/metrics")
+    writer.close()
+    return results, wall, metrics
+
+def start_service(jobs, max_queue):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "scheduler.service", "--port", "0", "--jobs", str(jobs), "--max-queue", str(max_queue)],
+        cwd=SRC, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("listening on"):
+        process.kill()
+        raise RuntimeError(f"Service did not start: {line!r}")
+    return process, int(line.split()[2].rsplit(":", 1)[1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rosters", type=int, default=8, help="distinct rosters the requests cycle through")
+    parser.add_argument("--seeds", type=int, default=4, help="distinct seeds per roster")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--port", type=int, help="use a service already listening on this port")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="workers when starting the service")
+    parser.add_argument("--max-queue", type=int, default=256)
+    args = parser.parse_args()
+
+    bodies = []
+    for seed in range(args.seeds):
+        for r in range(args.rosters):
+            csv_text = io.StringIO()
+            write_roster(csv_text, args.employees, True, "", r)
+            bodies.append(json.dumps({"roster": csv_text.getvalue(), "seed": seed}).encode())
+
+    process = None
+    port = args.port
+    if port is None:
+        process, port = start_service(args.jobs, args.max_queue)
+    try:
+        results, wall, metrics = asyncio.run(run(port, bodies, args.requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    ok = [ms for status, ms, _ in results if status == 200]
+    statuses = {}
+    for status, _, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    print(f"{len(results)} requests in {wall:.2f}s ({len(results) / wall:.0f} req/s), "
+          f"concurrency {args.concurrency}, statuses {statuses}")
+    if ok:
+        print("client latency ms: " + ", ".join(
+            f"p{round(q * 100)} {percentile(ok, q):.1f}" for q in (0.5, 0.95, 0.99)) + f", max {max(ok):.1f}")
+    print(f"coalesced {sum(1 for *_, c in results if c)}, "
+          f"roster hits {metrics['roster_hits']}, parses {metrics['parses']}, solves {metrics['solves']}, "
+          f"peak pool tasks {metrics['peak_pool_tasks']}")
+    print(json.dumps(metrics, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Synthetic roster generator for benchmarks.
+
+Writes rosters in either the simple layout (`name,Monday,...`) used by
+src/1 or the ranked layout (`name,Monday_1,Monday_2,Monday_3,...`) used by
+src/2-4, with the same human-friendly cell strings as the sample CSVs.
+
+    python benchmarks/synth.py roster.csv -n 10000 --format ranked --skew morning=0.8 --seed 1
+"""
+import argparse
+import csv
+import random
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SHIFT_LABELS = {
+    "morning": "Morning (8:00 AM - 12:00 PM)",
+    "afternoon": "Afternoon (12:00 PM - 4:00 PM)",
+    "evening": "Evening (4:00 PM - 8:00 PM)",
+}
+
+def parse_skew(text):
+    """
+    Turn "morning=0.8" into first-choice weights for every shift. Shares
+    that are not given split whatever probability is left evenly.
+    """
+    weights = {}
+    if text:
+        for part in text.split(","):
+            shift, _, share = part.partition("=")
+            if shift.strip() not in SHIFT_LABELS:
+                raise ValueError(f"Unknown shift in skew: {shift!r}")
+            weights[shift.strip()] = float(share)
+    rest = [shift for shift in SHIFT_LABELS if shift not in weights]
+    left = max(0.0, 1.0 - sum(weights.values()))
+    for shift in rest:
+        weights[shift] = left / len(rest)
+    return [weights[shift] for shift in SHIFT_LABELS]
+
+def write_roster(csvfile, employees, ranked=True, skew=None, seed=0):
+    """Write a roster with `employees` rows to an open text file."""
+    rng = random.Random(seed)
+    shifts = list(SHIFT_LABELS)
+    weights = parse_skew(skew)
+    writer = csv.writer(csvfile)
+    if ranked:
+        writer.writerow(["name"] + [day + rank for day in DAYS for rank in ["_1", "_2", "_3"]])
+    else:
+        writer.writerow(["name"] + DAYS)
+    for i in range(employees):
+        row = [f"Employee {i:06d}"]
+        for _ in DAYS:
+            first = rng.choices(shifts, weights=weights)[0]
+            if ranked:
+                rest = [shift for shift in shifts if shift != first]
+                rng.shuffle(rest)
+                row.extend(SHIFT_LABELS[shift] for shift in [first] + rest)
+            else:
+                row.append(SHIFT_LABELS[first])
+        writer.writerow(row)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic roster CSV.")
+    parser.add_argument("output")
+    parser.add_argument("-n", "--employees", type=int, default=1000)
+    parser.add_argument("--format", choices=["simple", "ranked"], default="ranked")
+    parser.add_argument("--skew", default="", help='first-choice shares, e.g. "morning=0.8"')
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with open(args.output, 'w', newline='') as csvfile:
+        write_roster(csvfile, args.employees, args.format == "ranked", args.skew, args.seed)
+
+if __name__ == "__main__":
+    main()
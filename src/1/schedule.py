@@ -1,99 +1,74 @@
 #pip install tabular
-import csv
-import random
-from tabulate import tabulate
+import argparse
+import os
+import sys
 
-# Define days and shifts
-days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-shifts = ["morning", "afternoon", "evening"]
+# Make the shared scheduling engine in src/scheduler importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from scheduler import SOLVERS, Calendar, SolveConfig, read_roster, solve
 
-def extract_shift(cell_value):
-    """
-    Extract the primary shift keyword from a human-friendly cell value.
-    For example, "Morning (8:00 AM - 12:00 PM)" returns "morning".
-    """
-    value = cell_value.strip().lower()
-    if "morning" in value:
-        return "morning"
-    elif "afternoon" in value:
-        return "afternoon"
-    elif "evening" in value:
-        return "evening"
-    else:
-        return value  # fallback
+parser = argparse.ArgumentParser(description="Print the weekly employee schedule.")
+parser.add_argument("--solver", choices=SOLVERS, default="greedy",
+                    help="greedy: first-come passes in CSV order; mincost: optimal per-day assignment")
+parser.add_argument("--max-days", type=int, default=5, help="most days any employee may work in the week")
+parser.add_argument("--min-days", type=int, default=0, help="fairness target: days every employee should get")
+parser.add_argument("--seed", type=int, help="seed for the random vacancy fill; the same seed gives the same schedule")
+parser.add_argument("--improve-ms", type=int, default=0, metavar="MS",
+                    help="spend up to MS milliseconds improving preference ranks with local search")
+parser.add_argument("--calendar", help="JSON calendar with the days, shift catalog and capacities to schedule")
+parser.add_argument("--quiet", action="store_true", help="do not print the schedule table (e.g. with --export)")
+parser.add_argument("--export", metavar="PATH", help="also write one row per assignment to PATH")
+parser.add_argument("--format", help="export format: csv, ndjson or columnar (default: from the PATH extension)")
+parser.add_argument("--profile", nargs="?", const="", metavar="TRACE",
+                    help="print per-phase timings to stderr; with TRACE also write a Chrome trace (.json) or folded stacks")
+args = parser.parse_args()
+if args.min_days < 0 or args.max_days < 0:
+    parser.error("--max-days and --min-days cannot be negative")
+if args.min_days > args.max_days:
+    parser.error(f"--min-days ({args.min_days}) cannot exceed --max-days ({args.max_days})")
 
-# Read employee data from CSV file
-employees = {}
-with open('employee_shifts.csv', 'r', newline='') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        name = row['name']
-        # Build the preferences dictionary for each day
-        preferences = {day: extract_shift(row[day]) for day in days}
-        employees[name] = {"preferences": preferences, "days_worked": 0}
+calendar = Calendar.load(args.calendar) if args.calendar else None
 
-# Initialize the schedule: a dictionary where each day maps to a dictionary of shifts (each with an employee list)
-schedule = {day: {shift: [] for shift in shifts} for day in days}
+# Export, local search and profiling are only imported when asked for, to keep cron runs quick
+profiler = None
+if args.profile is not None:
+    from scheduler.profiling import Profiler
+    profiler = Profiler()
+# Read employee data from CSV file (one preferred shift per day)
+roster = read_roster('employee_shifts.csv', calendar)
 
-# Process each day: Assign shifts based on preferences and apply scheduling logic
-for day in days:
-    # First pass: assign employees to their preferred shift if available
-    unassigned = []  # Employees who didn't get their preferred shift
-    for emp, details in employees.items():
-        # Remove the weekly limit check if everyone is meant to work all 7 days
-        preferred = details["preferences"][day]
-        if len(schedule[day][preferred]) < 2:
-            schedule[day][preferred].append(emp)
-            employees[emp]["days_worked"] += 1
-        else:
-            unassigned.append(emp)
+# Assign shifts based on preferences and apply scheduling logic
+schedule = solve(roster, SolveConfig(solver=args.solver, max_days=args.max_days, min_days=args.min_days,
+                                     seed=args.seed, calendar=calendar, profiler=profiler))
 
-    # Second pass: assign unassigned employees to any available shift on the same day
-    for emp in unassigned:
-        assigned = False
-        for shift in shifts:
-            if len(schedule[day][shift]) < 2:
-                schedule[day][shift].append(emp)
-                employees[emp]["days_worked"] += 1
-                assigned = True
-                break
-        # If still not assigned, attempt to assign on the next day (if available)
-        if not assigned:
-            next_day_index = days.index(day) + 1
-            if next_day_index < len(days):
-                next_day = days[next_day_index]
-                for shift in shifts:
-                    if len(schedule[next_day][shift]) < 2:
-                        schedule[next_day][shift].append(emp)
-                        employees[emp]["days_worked"] += 1
-                        break
+# Optionally revisit the greedy decisions with swaps and moves
+if args.improve_ms > 0:
+    from scheduler.improve import format_report, improve
+    schedule, report = improve(schedule, args.improve_ms)
+    print(format_report(report), file=sys.stderr)
 
-    # Fill any remaining vacancies on the day by randomly selecting eligible employees
-    for shift in shifts:
-        while len(schedule[day][shift]) < 2:
-            # Select employees not already scheduled on this day
-            available = [
-                emp for emp in employees 
-                if emp not in sum(schedule[day].values(), [])  # flatten assigned names list
-            ]
-            if available:
-                chosen = random.choice(available)
-                schedule[day][shift].append(chosen)
-                employees[chosen]["days_worked"] += 1
-            else:
-                break
+# Output the final schedule as a table (tabulate is only loaded when printing)
+if not args.quiet:
+    from tabulate import tabulate
 
-# Create table data: each row represents a day and its shifts
-table_data = []
-for day in days:
-    row = [day]
-    for shift in shifts:
-        # Combine employee names for each shift in the day
-        row.append(", ".join(schedule[day][shift]))
-    table_data.append(row)
+    # Create table data: each row represents a day and its shifts
+    table_data = schedule.rows()
 
-# Define table headers
-headers = ["Day", "Morning", "Afternoon", "Evening"]
+    # Define table headers
+    headers = ["Day"] + [shift.capitalize() for shift in schedule.shifts]
 
-# Output the final schedule as a table
-print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+# Machine-readable assignment rows for downstream jobs
+if args.export:
+    from scheduler.export import export
+    try:
+        export(schedule, args.export, args.format)
+    except ValueError as e:   # an unknown --format
+        parser.error(str(e))
+
+# Where the solve spent its time, phase by phase
+if profiler is not None:
+    print(profiler.report(), file=sys.stderr)
+    if args.profile:
+        profiler.write(args.profile)
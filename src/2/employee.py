@@ -1,103 +1,70 @@
-import csv
-import random
-from tabulate import tabulate
+import argparse
+import os
+import sys
 
-# Define days and shifts
-days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-shifts = ["morning", "afternoon", "evening"]
+# Make the shared scheduling engine in src/scheduler importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from scheduler import SOLVERS, Calendar, SolveConfig, read_roster, solve
 
-def extract_shift(cell_value):
-    """
-    Extract the primary shift keyword from a human-friendly string.
-    For example, "Morning (8:00 AM - 12:00 PM)" returns "morning".
-    """
-    value = cell_value.strip().lower()
-    if "morning" in value:
-        return "morning"
-    elif "afternoon" in value:
-        return "afternoon"
-    elif "evening" in value:
-        return "evening"
-    else:
-        return ""
+parser = argparse.ArgumentParser(description="Print the weekly employee schedule.")
+parser.add_argument("--solver", choices=SOLVERS, default="greedy",
+                    help="greedy: first-come passes in CSV order; mincost: optimal per-day assignment")
+parser.add_argument("--max-days", type=int, default=5, help="most days any employee may work in the week")
+parser.add_argument("--min-days", type=int, default=0, help="fairness target: days every employee should get")
+parser.add_argument("--seed", type=int, help="seed for the random vacancy fill; the same seed gives the same schedule")
+parser.add_argument("--improve-ms", type=int, default=0, metavar="MS",
+                    help="spend up to MS milliseconds improving preference ranks with local search")
+parser.add_argument("--calendar", help="JSON calendar with the days, shift catalog and capacities to schedule")
+parser.add_argument("--quiet", action="store_true", help="do not print the schedule table (e.g. with --export)")
+parser.add_argument("--export", metavar="PATH", help="also write one row per assignment to PATH")
+parser.add_argument("--format", help="export format: csv, ndjson or columnar (default: from the PATH extension)")
+parser.add_argument("--profile", nargs="?", const="", metavar="TRACE",
+                    help="print per-phase timings to stderr; with TRACE also write a Chrome trace (.json) or folded stacks")
+args = parser.parse_args()
+if args.min_days < 0 or args.max_days < 0:
+    parser.error("--max-days and --min-days cannot be negative")
+if args.min_days > args.max_days:
+    parser.error(f"--min-days ({args.min_days}) cannot exceed --max-days ({args.max_days})")
 
-# Read employee data from CSV file with bonus columns
-employees = {}
-with open('employee_shifts_bonus.csv', 'r', newline='') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        name = row['name']
-        # For each day, create a list of ranked preferences (first, second, third)
-        preferences = {}
-        for day in days:
-            pref_list = []
-            for rank in ['_1', '_2', '_3']:
-                key = day + rank
-                if key in row:
-                    shift = extract_shift(row[key])
-                    if shift:
-                        pref_list.append(shift)
-            preferences[day] = pref_list
-        employees[name] = {"preferences": preferences, "days_worked": 0}
+calendar = Calendar.load(args.calendar) if args.calendar else None
 
-# Initialize the schedule: for each day, each shift starts empty
-schedule = {day: {shift: [] for shift in shifts} for day in days}
+# Export, local search and profiling are only imported when asked for, to keep cron runs quick
+profiler = None
+if args.profile is not None:
+    from scheduler.profiling import Profiler
+    profiler = Profiler()
+# Read employee data from CSV file with bonus columns (Monday_1, Monday_2, Monday_3, ...)
+roster = read_roster('employee_shifts_bonus.csv', calendar)
 
-# Process scheduling for each day
-for day in days:
-    unassigned = []  # Employees who cannot get any of their ranked preferences
-    
-    # First pass: try to assign based on ranked preferences (in order)
-    for emp, details in employees.items():
-        assigned = False
-        for pref in details["preferences"][day]:
-            if len(schedule[day][pref]) < 2:
-                schedule[day][pref].append(emp)
-                employees[emp]["days_worked"] += 1
-                assigned = True
-                break
-        if not assigned:
-            unassigned.append(emp)
-    
-    # Second pass: assign unassigned employees to any available shift on the same day
-    for emp in unassigned:
-        assigned = False
-        for shift in shifts:
-            if len(schedule[day][shift]) < 2:
-                schedule[day][shift].append(emp)
-                employees[emp]["days_worked"] += 1
-                assigned = True
-                break
-        # If still not assigned, try to assign on the next day if available
-        if not assigned:
-            next_day_index = days.index(day) + 1
-            if next_day_index < len(days):
-                next_day = days[next_day_index]
-                for shift in shifts:
-                    if len(schedule[next_day][shift]) < 2:
-                        schedule[next_day][shift].append(emp)
-                        employees[emp]["days_worked"] += 1
-                        break
-    
-    # Finally, fill any remaining vacancies on the day by randomly selecting eligible employees
-    for shift in shifts:
-        while len(schedule[day][shift]) < 2:
-            # Find employees not already scheduled on this day
-            available = [emp for emp in employees if emp not in sum(schedule[day].values(), [])]
-            if available:
-                chosen = random.choice(available)
-                schedule[day][shift].append(chosen)
-                employees[chosen]["days_worked"] += 1
-            else:
-                break
+# Assign shifts based on ranked preferences
+schedule = solve(roster, SolveConfig(solver=args.solver, max_days=args.max_days, min_days=args.min_days,
+                                     seed=args.seed, calendar=calendar, profiler=profiler))
 
-# Build table data for final schedule
-table_data = []
-for day in days:
-    row = [day]
-    for shift in shifts:
-        row.append(", ".join(schedule[day][shift]))
-    table_data.append(row)
+# Optionally revisit the greedy decisions with swaps and moves
+if args.improve_ms > 0:
+    from scheduler.improve import format_report, improve
+    schedule, report = improve(schedule, args.improve_ms)
+    print(format_report(report), file=sys.stderr)
 
-headers = ["Day", "Morning", "Afternoon", "Evening"]
-print(tabulate(table_data, headers=headers, tablefmt="grid"))
+# Build table data for final schedule (tabulate is only loaded when printing)
+if not args.quiet:
+    from tabulate import tabulate
+
+    table_data = schedule.rows()
+
+    headers = ["Day"] + [shift.capitalize() for shift in schedule.shifts]
+    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+# Machine-readable assignment rows for downstream jobs
+if args.export:
+    from scheduler.export import export
+    try:
+        export(schedule, args.export, args.format)
+    except ValueError as e:   # an unknown --format
+        parser.error(str(e))
+
+# Where the solve spent its time, phase by phase
+if profiler is not None:
+    print(profiler.report(), file=sys.stderr)
+    if args.profile:
+        profiler.write(args.profile)
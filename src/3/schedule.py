@@ -1,36 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import csv
-import random
+import os
+import sys
+from concurrent.futures import CancelledError
 
-# Global definitions for days and shifts
-DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-SHIFTS = ["morning", "afternoon", "evening"]
-
-def extract_shift(cell_value):
-    """
-    Extract the primary shift keyword from a human-friendly string.
-    For example, "Morning (8:00 AM - 12:00 PM)" returns "morning".
-    """
-    value = cell_value.strip().lower()
-    if "morning" in value:
-        return "morning"
-    elif "afternoon" in value:
-        return "afternoon"
-    elif "evening" in value:
-        return "evening"
-    else:
-        return ""
+# Make the shared scheduling engine in src/scheduler importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from scheduler import DAYS, SolveCancelled, SolveConfig
+from scheduler.cache import open_cache
+from scheduler.export import FILE_TYPES, export
+from scheduler.jobs import SolveJob
 
 class ScheduleApp:
     def __init__(self, master):
         self.master = master
         master.title("Employee Scheduling App")
-        master.geometry("400x150")
+        master.geometry("400x280")
         
         self.csv_path = None
-        self.employees = {}  # will hold employee data from CSV
+        self.roster = None   # will hold employee data from CSV
         self.schedule = {}   # final schedule data
+        self.solved = None   # Schedule object behind self.schedule, used for exports
+        self.job = None      # background SolveJob while a schedule is being generated
+        self.cache = open_cache()  # parsed rosters and schedules seen before
         
         # Create and pack UI components
         self.label = tk.Label(master, text="Load your employee shift CSV (with ranked preferences)")
@@ -39,8 +31,26 @@ class ScheduleApp:
         self.load_button = tk.Button(master, text="Load CSV", command=self.load_csv)
         self.load_button.pack(pady=5)
         
+        # Seed for the random vacancy fill: the same seed gives the same schedule
+        self.seed_frame = tk.Frame(master)
+        self.seed_frame.pack()
+        tk.Label(self.seed_frame, text="Seed:").pack(side=tk.LEFT)
+        self.seed_var = tk.StringVar(value="0")
+        self.seed_entry = tk.Entry(self.seed_frame, textvariable=self.seed_var, width=12)
+        self.seed_entry.pack(side=tk.LEFT)
+        
         self.generate_button = tk.Button(master, text="Generate Schedule", command=self.generate_schedule, state=tk.DISABLED)
         self.generate_button.pack(pady=5)
+        
+        # Progress of the background solve, with a Cancel button
+        self.progress = ttk.Progressbar(master, length=300, maximum=len(DAYS))
+        self.progress.pack(pady=5)
+        
+        self.status = tk.Label(master, text="")
+        self.status.pack()
+        
+        self.cancel_button = tk.Button(master, text="Cancel", command=self.cancel_schedule, state=tk.DISABLED)
+        self.cancel_button.pack(pady=5)
     
     def load_csv(self):
         # Open file dialog to select CSV file
@@ -55,82 +65,54 @@ class ScheduleApp:
             messagebox.showerror("Error", "No CSV file loaded.")
             return
         
-        # Read employee data from CSV file (expecting bonus columns, e.g., Monday_1, Monday_2, Monday_3, etc.)
-        self.employees = {}
+        if self.job is not None:
+            return
+        
+        # A blank seed gives a different random fill on every run
+        seed = self.seed_var.get().strip()
+        if seed and not seed.lstrip("-").isdigit():
+            messagebox.showerror("Error", "Seed must be a whole number (or blank for random).")
+            return
+        
+        # Read and solve on a worker thread so the window stays responsive;
+        # with a seed an unchanged roster is a cache hit
+        self.job = SolveJob(self.csv_path, SolveConfig(seed=int(seed) if seed else None), cache=self.cache)
+        self.generate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress["value"] = 0
+        self.master.after(100, self.poll_schedule)
+    
+    def cancel_schedule(self):
+        if self.job is not None:
+            self.job.cancel()
+    
+    def poll_schedule(self):
+        job = self.job
+        if job.n_days:
+            self.progress.config(maximum=job.n_days)
+            self.status.config(text=f"{job.days_done} of {job.n_days} days scheduled")
+        self.progress["value"] = job.days_done
+        if not job.done():
+            self.master.after(100, self.poll_schedule)
+            return
+        
+        self.job = None
+        self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
         try:
-            with open(self.csv_path, 'r', newline='') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    name = row['name']
-                    # For each day, create a list of ranked preferences (first, second, third)
-                    preferences = {}
-                    for day in DAYS:
-                        pref_list = []
-                        for rank in ['_1', '_2', '_3']:
-                            key = day + rank
-                            if key in row:
-                                shift = extract_shift(row[key])
-                                if shift:
-                                    pref_list.append(shift)
-                        preferences[day] = pref_list
-                    self.employees[name] = {"preferences": preferences, "days_worked": 0}
+            self.roster, schedule = job.result()
+        except (SolveCancelled, CancelledError):
+            self.progress["value"] = 0
+            self.status.config(text="Cancelled")
+            return
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to read CSV file:\n{e}")
+            self.status.config(text="")
+            messagebox.showerror("Error", f"Failed to generate schedule:\n{e}")
             return
         
-        # Initialize the schedule dictionary for each day and shift
-        self.schedule = {day: {shift: [] for shift in SHIFTS} for day in DAYS}
-        
-        # Process scheduling for each day
-        for day in DAYS:
-            unassigned = []  # Employees who could not get any of their ranked preferences
-            
-            # First pass: assign employees based on their ranked preferences (in order)
-            for emp, details in self.employees.items():
-                assigned = False
-                for pref in details["preferences"][day]:
-                    if len(self.schedule[day][pref]) < 2:
-                        self.schedule[day][pref].append(emp)
-                        self.employees[emp]["days_worked"] += 1
-                        assigned = True
-                        break
-                if not assigned:
-                    unassigned.append(emp)
-            
-            # Second pass: assign unassigned employees to any available shift on the same day
-            for emp in unassigned:
-                assigned = False
-                for shift in SHIFTS:
-                    if len(self.schedule[day][shift]) < 2:
-                        self.schedule[day][shift].append(emp)
-                        self.employees[emp]["days_worked"] += 1
-                        assigned = True
-                        break
-                # If still not assigned, try assigning on the next day (if possible)
-                if not assigned:
-                    day_index = DAYS.index(day)
-                    if day_index < len(DAYS) - 1:
-                        next_day = DAYS[day_index + 1]
-                        for shift in SHIFTS:
-                            if len(self.schedule[next_day][shift]) < 2:
-                                self.schedule[next_day][shift].append(emp)
-                                self.employees[emp]["days_worked"] += 1
-                                break
-            
-            # Finally, fill any remaining vacancies on the day by randomly selecting eligible employees
-            for shift in SHIFTS:
-                while len(self.schedule[day][shift]) < 2:
-                    # Find employees not already scheduled on this day
-                    assigned_today = []
-                    for s in SHIFTS:
-                        assigned_today.extend(self.schedule[day][s])
-                    available = [emp for emp in self.employees if emp not in assigned_today]
-                    if available:
-                        chosen = random.choice(available)
-                        self.schedule[day][shift].append(chosen)
-                        self.employees[chosen]["days_worked"] += 1
-                    else:
-                        break
+        # Keep the familiar day -> shift -> names layout
+        self.solved = schedule
+        self.schedule = schedule.as_dict()
         
         # Once scheduling is complete, display the schedule
         self.display_schedule()
@@ -143,7 +125,8 @@ class ScheduleApp:
         
         # Create a Treeview widget for the table
         tree = ttk.Treeview(win)
-        tree["columns"] = ("Morning", "Afternoon", "Evening")
+        shifts = list(next(iter(self.schedule.values())))
+        tree["columns"] = tuple(shift.capitalize() for shift in shifts)
         tree.heading("#0", text="Day")
         tree.column("#0", width=100)
         for col in tree["columns"]:
@@ -151,17 +134,29 @@ class ScheduleApp:
             tree.column(col, width=150)
         
         # Insert schedule data into the Treeview
-        for day in DAYS:
-            morning = ", ".join(self.schedule[day]["morning"])
-            afternoon = ", ".join(self.schedule[day]["afternoon"])
-            evening = ", ".join(self.schedule[day]["evening"])
-            tree.insert("", "end", text=day, values=(morning, afternoon, evening))
+        for day, assigned in self.schedule.items():
+            tree.insert("", "end", text=day, values=tuple(", ".join(assigned[shift]) for shift in shifts))
         
         tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Add a button to close the schedule window
-        close_btn = tk.Button(win, text="Close", command=win.destroy)
-        close_btn.pack(pady=5)
+        # Buttons to export the assignments and to close the schedule window
+        buttons = tk.Frame(win)
+        buttons.pack(pady=5)
+        export_btn = tk.Button(buttons, text="Export", command=self.export_schedule)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        close_btn = tk.Button(buttons, text="Close", command=win.destroy)
+        close_btn.pack(side=tk.LEFT, padx=5)
+    
+    def export_schedule(self):
+        # Write one row per assignment as CSV, NDJSON or columnar, by extension
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES)
+        if not path:
+            return
+        try:
+            export(self.solved, path)
+            messagebox.showinfo("Exported", f"Schedule exported to:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export schedule:\n{e}")
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,46 +1,53 @@
+import json
+import os
+import sys
+import time
+
+# Make the shared scheduling engine in src/scheduler importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # With arguments the same workflow runs headless (scheduler.cli), so
+    # cron jobs never load Tk or need a display
+    from scheduler.cli import main
+    sys.exit(main())
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import csv
-import random
-from fpdf import FPDF
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 
-# Global definitions for days and shifts
-DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-SHIFTS = ["morning", "afternoon", "evening"]
-
-def extract_shift(cell_value):
-    """Extract the primary shift keyword from a human-friendly string."""
-    value = cell_value.strip().lower()
-    if "morning" in value:
-        return "morning"
-    elif "afternoon" in value:
-        return "afternoon"
-    elif "evening" in value:
-        return "evening"
-    else:
-        return ""
+from scheduler import DAYS, RecordParser, SolveCancelled, SolveConfig, read_roster, repair
+from scheduler.cache import open_cache
+from scheduler.csvindex import CSVIndex
+from scheduler.export import FILE_TYPES, export
+from scheduler.jobs import SolveJob, submit
+from scheduler.profiling import Profiler
+from scheduler.scenarios import Scenario, comparison_rows, run_scenarios
+from scheduler.warmstart import previous_assignments
+from scheduler.watch import FileWatcher, sync_roster
 
 ###############################################################################
-# CSV Editor using Treeview with inline editing
+# CSV Editor using a virtualized Treeview with inline editing
 ###############################################################################
 class CSVEditor:
-    def __init__(self, master, csv_path):
+    VISIBLE_ROWS = 20   # rows shown in the Treeview at once
+    BUFFER_ROWS = 10    # extra rows materialized below the visible window
+    
+    def __init__(self, master, csv_path, on_edit=None):
         self.master = master
         self.csv_path = csv_path
-        self.data = []
+        self.on_edit = on_edit  # called as on_edit(headers, row_values, col_index, old_value)
+        self.index = None    # CSVIndex: row offsets plus a sparse overlay of edits
         self.headers = []
+        self.first = 0       # index of the first materialized row
+        self.entry = None
         self.load_csv()
         self.build_gui()
     
     def load_csv(self):
         try:
-            with open(self.csv_path, 'r', newline='') as csvfile:
-                reader = csv.reader(csvfile)
-                self.data = list(reader)
-            if self.data:
-                self.headers = self.data[0]
-            else:
-                self.headers = []
+            self.index = CSVIndex(self.csv_path)
+            self.headers = self.index.headers
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read CSV file:\n{e}")
     
@@ -49,22 +56,59 @@ class CSVEditor:
         self.top.title("CSV Editor")
         self.top.geometry("900x500")
         
+        # Save button
+        self.save_btn = tk.Button(self.top, text="Save CSV", command=self.save_csv)
+        self.save_btn.pack(side=tk.BOTTOM, pady=10)
+        
+        # Scrollbar drives which window of rows is materialized
+        self.scrollbar = ttk.Scrollbar(self.top, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
         # Create Treeview widget for CSV data
-        self.tree = ttk.Treeview(self.top, columns=self.headers, show="headings")
+        self.tree = ttk.Treeview(self.top, columns=self.headers, show="headings", height=self.VISIBLE_ROWS)
         for header in self.headers:
             self.tree.heading(header, text=header)
             self.tree.column(header, width=150)
         
-        # Insert CSV rows (skip header)
-        for i, row in enumerate(self.data[1:]):
-            self.tree.insert("", "end", iid=str(i), values=row)
-        
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", self.on_double_click)
-        
-        # Save button
-        self.save_btn = tk.Button(self.top, text="Save CSV", command=self.save_csv)
-        self.save_btn.pack(pady=10)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+        self.render()
+    
+    def render(self):
+        # Insert only the visible rows plus a small buffer (skipping the header)
+        self.tree.delete(*self.tree.get_children())
+        if self.index is None:
+            return
+        stop = self.first + self.VISIBLE_ROWS + self.BUFFER_ROWS
+        for i, row in enumerate(self.index.rows(self.first, stop), start=self.first):
+            self.tree.insert("", "end", iid=str(i), values=row)
+        total = max(len(self.index), 1)
+        self.scrollbar.set(self.first / total, min(self.first + self.VISIBLE_ROWS, total) / total)
+    
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self.index) - self.VISIBLE_ROWS))
+        if first != self.first:
+            self.first = first
+            self.render()
+    
+    def on_scroll(self, action, value, unit=None):
+        if self.index is None:
+            return
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.index)))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_to(self.first + int(value) * step)
+    
+    def on_mousewheel(self, event):
+        if self.index is None:
+            return "break"
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.first + (-3 if up else 3))
+        return "break"
     
     def on_double_click(self, event):
         # Identify clicked cell
@@ -88,29 +132,139 @@ class CSVEditor:
         self.entry.bind("<FocusOut>", lambda e: self.on_return(rowid, col_index))
     
     def on_return(self, rowid, col_index):
+        if self.entry is None:
+            return
         new_value = self.entry.get()
-        values = list(self.tree.item(rowid, "values"))
-        values[col_index] = new_value
-        self.tree.item(rowid, values=values)
         self.entry.destroy()
+        self.entry = None
+        old_values = self.index.row(int(rowid))
+        old_value = old_values[col_index] if col_index < len(old_values) else ""
+        if new_value == old_value:
+            return
+        # Record the edit in the overlay and refresh just this row
+        self.index.set(int(rowid), col_index, new_value)
+        values = self.index.row(int(rowid))
+        if self.tree.exists(rowid):
+            self.tree.item(rowid, values=values)
+        if self.on_edit is not None:
+            self.on_edit(self.headers, values, col_index, old_value)
     
     def save_csv(self):
-        # Gather data from Treeview
-        new_data = [self.headers]
-        for rowid in self.tree.get_children():
-            new_data.append(self.tree.item(rowid, "values"))
         save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
         if save_path:
             try:
-                with open(save_path, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(new_data)
+                # Unchanged rows are streamed straight through with edits patched in
+                self.index.save(save_path)
                 messagebox.showinfo("CSV Saved", f"CSV file saved as:\n{save_path}")
                 # Optionally update the CSV path to the new file
                 self.csv_path = save_path
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save CSV:\n{e}")
 
+###############################################################################
+# What-if scenarios solved in parallel and compared side by side
+###############################################################################
+class ScenarioPanel:
+    def __init__(self, master, roster, config):
+        self.roster = roster
+        self.config = config   # called for a fresh SolveConfig on every run
+        self.future = None
+        self.progress = (0, 0)
+        # A thread of its own to wait on the worker processes, so a batch of
+        # variants never holds up Generate on the shared solve thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenarios")
+        
+        self.win = tk.Toplevel(master)
+        self.win.title("What-if Scenarios")
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+        self.win.geometry("860x520")
+        
+        tk.Label(self.win, text="Scenarios (JSON list of capacity, remove, preferences and unavailable patches):",
+                 anchor="w").pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.text = tk.Text(self.win, height=10)
+        self.text.pack(fill=tk.X, padx=10)
+        self.text.insert("1.0", self.example())
+        
+        controls = tk.Frame(self.win)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        self.run_btn = tk.Button(controls, text="Run Scenarios", command=self.run)
+        self.run_btn.pack(side=tk.LEFT)
+        self.status = tk.Label(controls, text="", anchor="w")
+        self.status.pack(side=tk.LEFT, padx=10)
+        
+        self.table = ttk.Treeview(self.win, height=9)
+        self.table.heading("#0", text="Metric")
+        self.table.column("#0", width=120)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+    
+    def example(self):
+        names = self.roster.names
+        weekend = {day: 3 for day in self.roster.days[-2:]}
+        scenarios = [{"name": "weekend x3", "capacity": weekend}]
+        if names:
+            scenarios.append({"name": f"{names[0]} out", "remove": [names[0]]})
+        if len(names) > 1:
+            scenarios.append({"name": f"{names[1]} no evenings", "unavailable": {names[1]: "evening"}})
+        return "[\n" + ",\n".join("  " + json.dumps(spec) for spec in scenarios) + "\n]\n"
+    
+    def run(self):
+        if self.future is not None:
+            return
+        try:
+            specs = json.loads(self.text.get("1.0", tk.END))
+            if not isinstance(specs, list):
+                raise ValueError("Expected a JSON list of scenarios")
+            scenarios = [Scenario.from_spec(spec) for spec in specs]
+        except (ValueError, TypeError, AttributeError) as e:
+            messagebox.showerror("Error", f"Invalid scenarios:\n{e}", parent=self.win)
+            return
+        config = self.config()
+        if config is None:
+            return
+        # Variants are solved in worker processes that share the parsed roster.
+        # They get a copy, since edits in the CSV editor change the roster in place
+        self.run_btn.config(state=tk.DISABLED)
+        self.progress = (0, len(scenarios) + 1)
+        self.future = self.executor.submit(run_scenarios, self.roster.copy(), scenarios, config, None, self.on_progress)
+        self.win.after(100, self.poll)
+    
+    def on_progress(self, done, total):
+        self.progress = (done, total)
+    
+    def close(self):
+        # A run in progress finishes in the background; its result is dropped
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.win.destroy()
+    
+    def poll(self):
+        if not self.win.winfo_exists():
+            return
+        done, total = self.progress
+        self.status.config(text=f"{done} of {total} variants solved")
+        if not self.future.done():
+            self.win.after(100, self.poll)
+            return
+        future = self.future
+        self.future = None
+        self.run_btn.config(state=tk.NORMAL)
+        try:
+            results = future.result()
+        except Exception as e:
+            self.status.config(text="")
+            messagebox.showerror("Error", f"Failed to run scenarios:\n{e}", parent=self.win)
+            return
+        self.show(results)
+    
+    def show(self, results):
+        columns = [f"v{i}" for i in range(len(results))]
+        self.table.delete(*self.table.get_children())
+        self.table["columns"] = columns
+        for col, result in zip(columns, results):
+            self.table.heading(col, text=result["name"])
+            self.table.column(col, width=110, anchor="center")
+        for row in comparison_rows(results):
+            self.table.insert("", "end", text=row[0], values=row[1:])
+
 ###############################################################################
 # Main Scheduling Application with GUI and PDF output
 ###############################################################################
@@ -118,11 +272,25 @@ class ScheduleApp:
     def __init__(self, master):
         self.master = master
         master.title("Employee Scheduling App")
-        master.geometry("800x550")
+        master.geometry("1080x550")
         
         self.csv_path = None
-        self.employees = {}  # Employee data from CSV
+        self.roster = None   # Employee data from CSV
         self.schedule = {}   # Final schedule
+        self.job = None      # Background SolveJob while a schedule is being generated
+        self.roster_version = 0  # Bumped by every edit or load, so results solved from older rosters are dropped
+        self.job_version = 0     # roster_version the running job was started from
+        self.solved = None   # Schedule object behind self.schedule, kept for incremental repairs
+        self.export = None   # Background per-employee PDF export
+        # Its own worker, so a long export never holds up Generate
+        self.export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-export")
+        self.export_progress = (0, 0)
+        self.profiler = None # Per-phase timings of the last generate and the repairs since
+        self.previous = None # Assignments of the last generated schedule, for warm starts
+        self.cache = open_cache()  # Parsed rosters and schedules seen before
+        self.watcher = None  # FileWatcher on the loaded CSV while "Watch" is ticked
+        self.sync = None     # Background re-solve after the watched CSV changed
+        self.sync_version = 0  # roster_version the running re-solve was started from
         
         # Top frame with control buttons
         self.top_frame = tk.Frame(master)
@@ -134,12 +302,53 @@ class ScheduleApp:
         self.edit_btn = tk.Button(self.top_frame, text="Edit CSV", command=self.edit_csv, state=tk.DISABLED)
         self.edit_btn.pack(side=tk.LEFT, padx=5)
         
+        # Seed for the random vacancy fill: the same seed gives the same schedule
+        tk.Label(self.top_frame, text="Seed:").pack(side=tk.LEFT)
+        self.seed_var = tk.StringVar(value="0")
+        self.seed_entry = tk.Entry(self.top_frame, textvariable=self.seed_var, width=8)
+        self.seed_entry.pack(side=tk.LEFT)
+        
+        # Re-solve from the last generated schedule instead of from scratch
+        self.warm_var = tk.BooleanVar(value=False)
+        self.warm_check = tk.Checkbutton(self.top_frame, text="Keep last", variable=self.warm_var)
+        self.warm_check.pack(side=tk.LEFT)
+        
+        # Re-solve whenever the CSV is saved by another program
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watch_check = tk.Checkbutton(self.top_frame, text="Watch", variable=self.watch_var, command=self.toggle_watch)
+        self.watch_check.pack(side=tk.LEFT)
+        
         self.gen_btn = tk.Button(self.top_frame, text="Generate Schedule", command=self.generate_schedule, state=tk.DISABLED)
         self.gen_btn.pack(side=tk.LEFT, padx=5)
         
         self.pdf_btn = tk.Button(self.top_frame, text="Save Schedule as PDF", command=self.save_pdf, state=tk.DISABLED)
         self.pdf_btn.pack(side=tk.LEFT, padx=5)
         
+        self.staff_pdf_btn = tk.Button(self.top_frame, text="Employee PDFs", command=self.export_staff_pdfs, state=tk.DISABLED)
+        self.staff_pdf_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.export_btn = tk.Button(self.top_frame, text="Export", command=self.export_schedule, state=tk.DISABLED)
+        self.export_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.stats_btn = tk.Button(self.top_frame, text="Stats", command=self.show_stats, state=tk.DISABLED)
+        self.stats_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.whatif_btn = tk.Button(self.top_frame, text="What-if", command=self.open_scenarios, state=tk.DISABLED)
+        self.whatif_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Progress of the background solve, with a Cancel button
+        self.progress_frame = tk.Frame(master)
+        self.progress_frame.pack()
+        
+        self.progress = ttk.Progressbar(self.progress_frame, length=300, maximum=len(DAYS))
+        self.progress.pack(side=tk.LEFT, padx=5)
+        
+        self.status = tk.Label(self.progress_frame, text="", width=24, anchor="w")
+        self.status.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = tk.Button(self.progress_frame, text="Cancel", command=self.cancel_schedule, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
         # Treeview to display final schedule
         self.tree = ttk.Treeview(master)
         self.tree["columns"] = ("Morning", "Afternoon", "Evening")
@@ -153,108 +362,253 @@ class ScheduleApp:
     def load_csv(self):
         path = filedialog.askopenfilename(title="Select CSV File", filetypes=(("CSV Files", "*.csv"),))
         if path:
+            # A solve still running for the previous file is dropped when it finishes
+            if self.job is not None:
+                self.job.cancel()
             self.csv_path = path
+            self.roster = None
+            self.roster_version += 1
+            self.solved = None
             messagebox.showinfo("File Loaded", f"Loaded file:\n{path}")
             self.gen_btn.config(state=tk.NORMAL)
             self.edit_btn.config(state=tk.NORMAL)
+            self.whatif_btn.config(state=tk.NORMAL)
+            if self.watcher is not None:
+                self.watcher = FileWatcher(path)
+    
+    def ensure_roster(self):
+        # The editor, the scheduler and the scenarios share one in-memory roster
+        if self.roster is None:
+            try:
+                read = self.cache.read_roster if self.cache is not None else read_roster
+                self.roster = read(self.csv_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read CSV file:\n{e}")
+                return False
+        return True
     
     def edit_csv(self):
         if not self.csv_path:
             messagebox.showerror("Error", "No CSV file loaded to edit.")
             return
+        if not self.ensure_roster():
+            return
         # Open the CSV Editor window
-        CSVEditor(self.master, self.csv_path)
+        CSVEditor(self.master, self.csv_path, on_edit=self.apply_edit)
+    
+    def open_scenarios(self):
+        if not self.csv_path:
+            messagebox.showerror("Error", "No CSV file loaded.")
+            return
+        if not self.ensure_roster():
+            return
+        ScenarioPanel(self.master, self.roster, self.scenario_config)
+    
+    def scenario_config(self):
+        # Every variant uses the seed from the toolbar, so they differ only by their patches
+        seed = self.seed_var.get().strip()
+        if not seed.lstrip("-").isdigit():
+            messagebox.showerror("Error", "Scenarios need a whole-number seed so the variants are comparable.")
+            return None
+        return SolveConfig(seed=int(seed))
+    
+    def apply_edit(self, headers, values, col_index, old_value):
+        # Apply one edited cell to the shared roster, then re-solve only the
+        # affected day (and any later days its changes reach). A solve running
+        # meanwhile works on its own copy and is run again once it finishes
+        self.roster_version += 1
+        parser = RecordParser(headers, self.roster.days, self.roster.shifts, self.roster.ranks)
+        if col_index == parser.name_col:
+            emp = self.roster.index.get(old_value)
+            if emp is None:
+                return
+            self.roster.rename(emp, values[col_index])
+        elif col_index == parser.rules_col:
+            emp = self.roster.index.get(values[parser.name_col])
+            if emp is None:
+                return
+            rules = parser.rules(values)
+            if rules:
+                self.roster.rules[emp] = rules
+            else:
+                self.roster.rules.pop(emp, None)
+            # Availability rules reach every day, so solve the horizon again
+            if self.solved is not None and self.job is None:
+                self.generate_schedule()
+            return
+        else:
+            day_index = parser.day_of(col_index)
+            name, packed = parser.pack(values)
+            emp = self.roster.index.get(name)
+            if day_index is None or emp is None:
+                return
+            ranks = self.roster.ranks
+            self.roster.set_day(emp, day_index, packed[day_index * ranks:(day_index + 1) * ranks])
+            if self.solved is None or self.job is not None:
+                return
+            repair(self.solved, day_index)
+        if self.solved is not None:
+            self.schedule = self.solved.as_dict()
+            self.refresh_schedule()
+    
+    def refresh_schedule(self):
+        # Update only the Treeview rows whose contents changed
+        for day in self.solved.days:
+            values = tuple(", ".join(self.schedule[day][shift]) for shift in self.solved.shifts)
+            if not self.tree.exists(day):
+                self.tree.insert("", "end", iid=day, text=day, values=values)
+            elif tuple(self.tree.item(day, "values")) != values:
+                self.tree.item(day, values=values)
+    
+    def toggle_watch(self):
+        if not self.watch_var.get():
+            self.watcher = None
+            return
+        if not self.csv_path:
+            self.watch_var.set(False)
+            messagebox.showerror("Error", "No CSV file loaded to watch.")
+            return
+        self.watcher = FileWatcher(self.csv_path)
+        self.master.after(int(self.watcher.interval * 1000), self.poll_watch)
+    
+    def poll_watch(self):
+        watcher = self.watcher
+        if watcher is None:
+            return
+        self.master.after(int(watcher.interval * 1000), self.poll_watch)
+        # A change seen while a solve runs waits for it to finish
+        if self.job is not None or self.sync is not None:
+            return
+        seen = watcher.poll()
+        if seen is None:
+            return
+        if self.solved is None:
+            # Nothing solved yet: read the saved file from scratch
+            self.roster = None
+            self.roster_version += 1
+            self.generate_schedule()
+            return
+        self.status.config(text="Roster changed, updating")
+        # The worker re-solves copies, so edits here can still repair self.solved
+        self.sync = submit(self.read_and_sync, self.solved.copy(self.solved.roster.copy()), watcher.path)
+        self.sync_version = self.roster_version
+        self.master.after(50, self.poll_sync, seen)
+    
+    @staticmethod
+    def read_and_sync(schedule, path):
+        # Runs on the worker thread: re-read the CSV and re-solve only what changed
+        return sync_roster(schedule, read_roster(path, schedule.calendar))
+    
+    def poll_sync(self, seen):
+        if not self.sync.done():
+            self.master.after(50, self.poll_sync, seen)
+            return
+        future, self.sync = self.sync, None
+        try:
+            schedule, report = future.result()
+        except Exception as e:
+            # Usually a save caught half-written; the next save gets another try,
+            # so no dialog for every keystroke of a slow editor
+            self.status.config(text=f"Update failed: {e}")
+            return
+        if self.sync_version != self.roster_version:
+            # Edited here (or another file loaded) while the file was being
+            # read: keep what is on screen rather than the older file contents
+            self.status.config(text="File change skipped")
+            messagebox.showwarning("Roster Changed", "The roster file changed while it was being edited here.\n"
+                                   "The schedule keeps the edits made here; save the CSV to replace the file.")
+            return
+        self.solved = schedule
+        self.roster = schedule.roster
+        self.schedule = schedule.as_dict()
+        self.previous = previous_assignments(schedule)
+        self.refresh_schedule()
+        latency = (time.perf_counter() - seen) * 1000
+        self.status.config(text=f"{len(report['resolved'])} days updated in {latency:.0f} ms")
     
     def generate_schedule(self):
         if not self.csv_path:
             messagebox.showerror("Error", "No CSV file loaded.")
             return
         
-        # Clear previous data and Treeview contents
-        self.employees = {}
-        self.schedule = {}
-        self.tree.delete(*self.tree.get_children())
+        if self.job is not None:
+            return
+        
+        # A blank seed gives a different random fill on every run
+        seed = self.seed_var.get().strip()
+        if seed and not seed.lstrip("-").isdigit():
+            messagebox.showerror("Error", "Seed must be a whole number (or blank for random).")
+            return
         
+        # Read and solve a copy of the roster on a worker thread, so loading and
+        # editing stay usable meanwhile. With a seed an unchanged roster comes
+        # straight from the cache
+        self.profiler = Profiler()
+        config = SolveConfig(seed=int(seed) if seed else None, profiler=self.profiler)
+        previous = self.previous if self.warm_var.get() else None
+        roster = self.roster.copy() if self.roster is not None else None
+        self.job = SolveJob(self.csv_path, config, roster=roster, cache=self.cache, previous=previous)
+        self.job_version = self.roster_version
+        self.gen_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress["value"] = 0
+        self.master.after(100, self.poll_schedule)
+    
+    def cancel_schedule(self):
+        if self.job is not None:
+            self.job.cancel()
+    
+    def poll_schedule(self):
+        job = self.job
+        if job.n_days:
+            self.progress.config(maximum=job.n_days)
+            self.status.config(text=f"{job.days_done} of {job.n_days} days scheduled")
+        self.progress["value"] = job.days_done
+        if not job.done():
+            self.master.after(100, self.poll_schedule)
+            return
+        
+        self.job = None
+        self.gen_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
         try:
-            with open(self.csv_path, 'r', newline='') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    name = row['name']
-                    preferences = {}
-                    for day in DAYS:
-                        pref_list = []
-                        for rank in ['_1', '_2', '_3']:
-                            key = day + rank
-                            if key in row:
-                                shift = extract_shift(row[key])
-                                if shift:
-                                    pref_list.append(shift)
-                        preferences[day] = pref_list
-                    self.employees[name] = {"preferences": preferences, "days_worked": 0}
+            roster, schedule = job.result()
+        except (SolveCancelled, CancelledError):
+            self.progress["value"] = 0
+            self.status.config(text="Cancelled")
+            return
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to read CSV file:\n{e}")
+            self.status.config(text="")
+            messagebox.showerror("Error", f"Failed to generate schedule:\n{e}")
+            return
+        if self.job_version != self.roster_version:
+            # Solved from a roster edited or replaced since: edits are solved
+            # again, while a newly loaded file waits for Generate
+            if self.roster is not None:
+                self.status.config(text="Roster edited meanwhile, solving again")
+                self.generate_schedule()
+            else:
+                self.progress["value"] = 0
+                self.status.config(text="")
             return
         
-        # Initialize schedule for each day
-        for day in DAYS:
-            self.schedule[day] = {shift: [] for shift in SHIFTS}
-        
-        # Scheduling logic with ranked preferences
-        for day in DAYS:
-            unassigned = []
-            # First pass: assign based on ranked preferences
-            for emp, details in self.employees.items():
-                assigned = False
-                for pref in details["preferences"].get(day, []):
-                    if len(self.schedule[day][pref]) < 2:
-                        self.schedule[day][pref].append(emp)
-                        self.employees[emp]["days_worked"] += 1
-                        assigned = True
-                        break
-                if not assigned:
-                    unassigned.append(emp)
-            
-            # Second pass: assign unassigned employees to any available shift on the same day
-            for emp in unassigned:
-                assigned = False
-                for shift in SHIFTS:
-                    if len(self.schedule[day][shift]) < 2:
-                        self.schedule[day][shift].append(emp)
-                        self.employees[emp]["days_worked"] += 1
-                        assigned = True
-                        break
-                if not assigned:
-                    day_index = DAYS.index(day)
-                    if day_index < len(DAYS) - 1:
-                        next_day = DAYS[day_index + 1]
-                        for shift in SHIFTS:
-                            if len(self.schedule[next_day][shift]) < 2:
-                                self.schedule[next_day][shift].append(emp)
-                                self.employees[emp]["days_worked"] += 1
-                                break
-            
-            # Finally, fill remaining vacancies randomly
-            for shift in SHIFTS:
-                while len(self.schedule[day][shift]) < 2:
-                    assigned_today = []
-                    for s in SHIFTS:
-                        assigned_today.extend(self.schedule[day][s])
-                    available = [emp for emp in self.employees if emp not in assigned_today]
-                    if available:
-                        chosen = random.choice(available)
-                        self.schedule[day][shift].append(chosen)
-                        self.employees[chosen]["days_worked"] += 1
-                    else:
-                        break
+        # Clear previous data and Treeview contents
+        self.roster = roster
+        self.solved = schedule
+        self.schedule = schedule.as_dict()
+        # Snapshot with the ranks as of now, so a later warm start can tell which seats got worse
+        self.previous = previous_assignments(schedule)
+        if job.report is not None:
+            self.status.config(text=f"{job.report['changed']} assignments changed")
+        self.tree.delete(*self.tree.get_children())
         
         # Display final schedule in the Treeview
-        for day in DAYS:
-            morning = ", ".join(self.schedule[day]["morning"])
-            afternoon = ", ".join(self.schedule[day]["afternoon"])
-            evening = ", ".join(self.schedule[day]["evening"])
-            self.tree.insert("", "end", text=day, values=(morning, afternoon, evening))
+        self.refresh_schedule()
         
         self.pdf_btn.config(state=tk.NORMAL)
+        self.export_btn.config(state=tk.NORMAL)
+        self.stats_btn.config(state=tk.NORMAL)
+        self.staff_pdf_btn.config(state=tk.NORMAL if self.export is None else tk.DISABLED)
     
     def save_pdf(self):
         if not self.schedule:
@@ -265,35 +619,121 @@ class ScheduleApp:
         if not pdf_path:
             return
         
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, "Final Weekly Schedule", ln=True, align='C')
-        pdf.ln(10)
-        
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(30, 10, "Day", border=1, align='C')
-        pdf.cell(60, 10, "Morning", border=1, align='C')
-        pdf.cell(60, 10, "Afternoon", border=1, align='C')
-        pdf.cell(60, 10, "Evening", border=1, align='C')
-        pdf.ln()
-        
-        pdf.set_font("Arial", '', 12)
-        for day in DAYS:
-            pdf.cell(30, 10, day, border=1)
-            morning = ", ".join(self.schedule[day]["morning"])
-            afternoon = ", ".join(self.schedule[day]["afternoon"])
-            evening = ", ".join(self.schedule[day]["evening"])
-            pdf.cell(60, 10, morning, border=1)
-            pdf.cell(60, 10, afternoon, border=1)
-            pdf.cell(60, 10, evening, border=1)
-            pdf.ln()
-        
         try:
-            pdf.output(pdf_path)
-            messagebox.showinfo("PDF Saved", f"Schedule saved as PDF:\n{pdf_path}")
+            # fpdf is only loaded once a PDF is actually wanted
+            from scheduler.pdfexport import write_schedule_pdf
+            pages = write_schedule_pdf(self.solved, pdf_path)
+            messagebox.showinfo("PDF Saved", f"Schedule saved as PDF ({pages} pages):\n{pdf_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save PDF:\n{e}")
+    
+    def show_stats(self):
+        # Per-day and per-phase timings and counters of the solve (and any repairs since)
+        win = tk.Toplevel(self.master)
+        win.title("Solve Statistics")
+        win.geometry("760x360")
+        
+        profiler = self.profiler
+        if profiler is None or not profiler.days:
+            tk.Label(win, text="This schedule was loaded from the cache, so there are no solve timings.").pack(pady=20)
+            return
+        
+        phases = list(profiler.phases())
+        columns = ("ms",) + tuple(phases) + ("spilled", "ranks")
+        days = ttk.Treeview(win, columns=columns, height=8)
+        days.heading("#0", text="Day")
+        days.column("#0", width=140)
+        for col in columns:
+            days.heading(col, text=col.replace("_", " "))
+            days.column(col, width=80, anchor="center")
+        for day in profiler.days:
+            values = (f"{day['seconds'] * 1000:.2f}",) + tuple(day["phase_seats"].get(p, 0) for p in phases)
+            values += (day.get("spilled", 0), "/".join(str(n) for n in day["ranks"]))
+            days.insert("", "end", text=day["day"], values=values)
+        days.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        totals = ttk.Treeview(win, columns=("ms", "seats", "spilled"), height=len(phases))
+        totals.heading("#0", text="Phase")
+        for col in ("ms", "seats", "spilled"):
+            totals.heading(col, text=col)
+            totals.column(col, width=100, anchor="center")
+        for phase, total in profiler.phases().items():
+            totals.insert("", "end", text=phase.replace("_", " "),
+                          values=(f"{total['seconds'] * 1000:.2f}", total["seats"], total.get("spilled", 0)))
+        totals.pack(fill=tk.X, padx=10, pady=5)
+        
+        trace_btn = tk.Button(win, text="Save Trace", command=lambda: self.save_trace(profiler))
+        trace_btn.pack(pady=5)
+    
+    def save_trace(self, profiler):
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("Chrome Trace", "*.json"), ("Folded Stacks", "*.folded")])
+        if not path:
+            return
+        try:
+            profiler.write(path)
+            messagebox.showinfo("Trace Saved", f"Open it in chrome://tracing or a flamegraph tool:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save trace:\n{e}")
+    
+    def export_schedule(self):
+        if self.solved is None:
+            messagebox.showerror("Error", "No schedule available to export.")
+            return
+        
+        # One row per assignment as CSV, NDJSON or columnar, by extension
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES)
+        if not path:
+            return
+        try:
+            export(self.solved, path)
+            messagebox.showinfo("Exported", f"Schedule exported to:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export schedule:\n{e}")
+    
+    def export_staff_pdfs(self):
+        if self.solved is None:
+            messagebox.showerror("Error", "No schedule available to export.")
+            return
+        
+        zip_path = filedialog.asksaveasfilename(defaultextension=".zip", filetypes=[("Zip Archives", "*.zip")])
+        if not zip_path:
+            return
+        
+        try:
+            from scheduler.pdfexport import employee_rows, write_employee_pdfs
+        except ImportError as e:
+            messagebox.showerror("Error", f"PDF export is unavailable:\n{e}")
+            return
+        
+        # Render in worker processes, driven from the export thread. The rows
+        # are taken here, so edits repaired meanwhile do not reach the export
+        rows = employee_rows(self.solved)
+        self.staff_pdf_btn.config(state=tk.DISABLED)
+        self.export_progress = (0, len(rows))
+        self.export = self.export_pool.submit(write_employee_pdfs, rows, zip_path, None, self.on_export_progress)
+        self.master.after(100, self.poll_export)
+    
+    def on_export_progress(self, done, total):
+        self.export_progress = (done, total)
+    
+    def poll_export(self):
+        done, total = self.export_progress
+        self.status.config(text=f"{done} of {total} employee PDFs")
+        if not self.export.done():
+            self.master.after(100, self.poll_export)
+            return
+        
+        export = self.export
+        self.export = None
+        self.staff_pdf_btn.config(state=tk.NORMAL)
+        try:
+            pages = export.result()
+        except Exception as e:
+            self.status.config(text="")
+            messagebox.showerror("Error", f"Failed to export employee PDFs:\n{e}")
+            return
+        self.status.config(text=f"Exported {total} employee PDFs ({pages} pages)")
 
 if __name__ == "__main__":
     root = tk.Tk()
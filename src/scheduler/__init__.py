@@ -0,0 +1,11 @@
+"""
+Shared scheduling engine used by every front-end under src/.
+
+    from scheduler import read_roster, solve
+    schedule = solve(read_roster("employee_shifts_bonus.csv"))
+"""
+from .catalog import Calendar, Shift
+from .constraints import Availability, read_constraints
+from .engine import SOLVERS, Schedule, SolveCancelled, SolveConfig, repair, solve
+from .loader import RecordParser, ShiftParser, extract_shift, iter_records, parse_roster, read_roster, resolve_layout
+from .roster import DAYS, SHIFTS, Employee, Roster
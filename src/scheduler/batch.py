@@ -0,0 +1,135 @@
+"""
+Headless batch scheduling across many roster CSVs.
+
+Every roster (and every week ahead, with --weeks) is an independent job
+solved in a ProcessPoolExecutor. Each schedule is written next to its input
+as `<name>.schedule.csv` (or `<name>.week<N>.schedule.csv`), and a
+throughput summary is printed at the end.
+
+    cd src
+    python -m scheduler.batch ../rosters/ --weeks 4 --jobs 8 --seed 42
+    python -m scheduler.batch "sites/*/employee_shifts*.csv" --solver mincost
+    python -m scheduler.batch ../rosters/ --calendar ../calendars/24x7.json
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .catalog import Calendar
+from .engine import SOLVERS, SolveConfig, solve
+from .loader import read_roster
+from .rng import derive_seed
+
+OUTPUT_SUFFIX = ".schedule.csv"
+
+def find_rosters(patterns):
+    """Expand directories and glob patterns into a sorted list of roster CSVs."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.csv"))
+        else:
+            matches = glob.glob(pattern)
+        paths.update(p for p in matches if not p.endswith(OUTPUT_SUFFIX))
+    return sorted(paths)
+
+def job_seed(base_seed, path, week):
+    """
+    Stable per-job seed, so a job's output does not depend on scheduling
+    order. It is keyed by the roster's path relative to the working
+    directory, so `sites/a/roster.csv` and `sites/b/roster.csv` differ, and
+    a roster keeps its seed whichever other rosters share the batch.
+    """
+    path = os.path.abspath(path)
+    try:
+        key = os.path.relpath(path)
+    except ValueError:   # on another drive than the working directory
+        key = path
+    return derive_seed(base_seed, key.replace(os.sep, "/"), week)
+
+def output_path(path, week, weeks):
+    stem = path[:-4] if path.lower().endswith(".csv") else path
+    return f"{stem}.week{week + 1}{OUTPUT_SUFFIX}" if weeks > 1 else stem + OUTPUT_SUFFIX
+
+def write_schedule(schedule, path):
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Day"] + [shift.capitalize() for shift in schedule.shifts])
+        writer.writerows(schedule.rows())
+
+def run_job(job):
+    """Worker entry point: solve one roster for one week and write it out."""
+    path, out_path, seed, options = job
+    start = time.perf_counter()
+    roster = read_roster(path, options.get("calendar"))
+    config = SolveConfig(seed=seed, **options)
+    write_schedule(solve(roster, config), out_path)
+    return time.perf_counter() - start
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many roster CSVs in parallel.")
+    parser.add_argument("inputs", nargs="+", help="roster CSV files, directories or glob patterns")
+    parser.add_argument("--weeks", type=int, default=1, help="weeks ahead to schedule per roster")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; per-job seeds are derived from it")
+    parser.add_argument("--solver", choices=SOLVERS, default="greedy")
+    parser.add_argument("--capacity", type=int, default=2, help="seats per shift when no --calendar is given")
+    parser.add_argument("--calendar", help="JSON calendar with the days, shift catalog and capacities")
+    parser.add_argument("--max-days", type=int, default=5)
+    parser.add_argument("--min-days", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.min_days < 0 or args.max_days < 0:
+        parser.error("--max-days and --min-days cannot be negative")
+    if args.min_days > args.max_days:
+        parser.error(f"--min-days ({args.min_days}) cannot exceed --max-days ({args.max_days})")
+
+    paths = find_rosters(args.inputs)
+    if not paths:
+        print("No roster CSVs matched.", file=sys.stderr)
+        return 1
+    try:
+        calendar = Calendar.load(args.calendar) if args.calendar else None
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"argument --calendar: {e}")
+    options = {"capacity": args.capacity, "solver": args.solver,
+               "max_days": args.max_days, "min_days": args.min_days, "calendar": calendar}
+    jobs = [
+        (path, output_path(path, week, args.weeks), job_seed(args.seed, path, week), options)
+        for path in paths
+        for week in range(args.weeks)
+    ]
+
+    timings = []
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            path, out_path = futures[future][:2]
+            try:
+                timings.append(future.result())
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {path}: {e}", file=sys.stderr)
+            else:
+                print(f"wrote {out_path}")
+    wall = time.perf_counter() - start
+
+    print(f"\n{len(timings)} of {len(jobs)} rosters solved in {wall:.2f}s "
+          f"({len(timings) / wall:.1f} rosters/s, {args.jobs} workers)")
+    if timings:
+        print(f"solve time p50 {percentile(timings, 0.50) * 1000:.1f} ms, "
+              f"p95 {percentile(timings, 0.95) * 1000:.1f} ms")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
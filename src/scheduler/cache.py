@@ -0,0 +1,237 @@
+"""
+On-disk cache of parsed rosters and solved schedules.
+
+Rosters are keyed by a SHA-256 of the CSV bytes plus the calendar they were
+read with, and stored in a compact binary file whose packed preference
+bytes are memory-mapped on load, so a roster seen before is opened without
+parsing. Schedules are keyed by the roster's contents plus the solve
+options and seed; solves without a seed are random and never cached.
+Entries are evicted least-recently-used once the cache passes `max_bytes`.
+
+    cache = ScheduleCache()
+    roster = cache.read_roster("employee_shifts_bonus.csv")
+    schedule = cache.solve(roster, SolveConfig(seed=0))
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+from .catalog import Calendar
+from .engine import Schedule, solve
+from .loader import read_roster
+from .roster import Roster
+
+ROSTER_MAGIC = b"SCHR\x02"
+SCHEDULE_MAGIC = b"SCHS\x04"
+_HEADER = struct.Struct("<5sI")
+
+def default_root():
+    """`$SCHEDULER_CACHE_DIR`, or ~/.cache/scheduler."""
+    return os.environ.get("SCHEDULER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "scheduler")
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def calendar_key(calendar):
+    """Everything about a calendar that changes how rosters parse or schedules solve."""
+    return json.dumps({
+        "days": calendar.days,
+        "pref_days": calendar.pref_days,
+        "shifts": [[s.name, s.keywords] for s in calendar.shifts],
+        "capacity": calendar.slot_capacity.tolist(),
+    })
+
+def roster_digest(roster):
+    """SHA-256 of a roster's names, packed preferences and availability rules."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([roster.days, roster.shifts, roster.ranks]).encode())
+    digest.update("\0".join(roster.names).encode())
+    digest.update(roster.prefs)
+    if roster.rules:
+        digest.update(json.dumps(sorted(roster.rules.items())).encode())
+    return digest.hexdigest()
+
+def open_cache(root=None):
+    """A ScheduleCache, or None when the cache directory cannot be created."""
+    try:
+        return ScheduleCache(root)
+    except OSError:
+        return None
+
+class ScheduleCache:
+    """
+    Directory of `roster-<key>.bin` and `schedule-<key>.bin` entries.
+    A hit touches the entry's mtime, which is what LRU eviction goes by.
+    Unreadable entries are treated as misses and dropped.
+    """
+
+    def __init__(self, root=None, max_bytes=256 * 1024 * 1024):
+        self.root = root or default_root()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def read_roster(self, path, calendar=None):
+        """read_roster() through the cache."""
+        calendar = calendar or Calendar()
+        key = hashlib.sha256((file_digest(path) + calendar_key(calendar)).encode()).hexdigest()
+        entry = self._path("roster", key)
+        roster = self._load(entry, load_roster)
+        if roster is None:
+            roster = read_roster(path, calendar)
+            self._store(entry, dump_roster(roster))
+        return roster
+
+    def solve(self, roster, config):
+        """solve() through the cache; `config.seed` must be set for a hit."""
+        if config.seed is None:
+            return solve(roster, config)
+        calendar = config.calendar_for(roster)
+        options = json.dumps([config.solver, config.max_days, config.min_days, config.seed])
+        key = hashlib.sha256((roster_digest(roster) + calendar_key(calendar) + options).encode()).hexdigest()
+        entry = self._path("schedule", key)
+        schedule = self._load(entry, lambda data: load_schedule(data, roster, calendar))
+        if schedule is None:
+            schedule = solve(roster, config)
+            self._store(entry, dump_schedule(schedule))
+        schedule.config = config
+        return schedule
+
+    def _path(self, kind, key):
+        return os.path.join(self.root, f"{kind}-{key}.bin")
+
+    def _load(self, entry, loader):
+        try:
+            with open(entry, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            value = loader(data)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, struct.error):
+            self.misses += 1
+            self._discard(entry)
+            return None
+        os.utime(entry)
+        self.hits += 1
+        return value
+
+    def _store(self, entry, payload):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".bin.tmp")
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for part in payload:
+                    out.write(part)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def _discard(self, entry):
+        try:
+            os.unlink(entry)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits `max_bytes`."""
+        entries = []
+        total = 0
+        for item in os.scandir(self.root):
+            if item.name.endswith(".bin") and item.is_file():
+                stat = item.stat()
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    def clear(self):
+        for item in os.scandir(self.root):
+            if item.name.endswith(".bin"):
+                self._discard(item.path)
+
+def _pack(magic, header, *arrays):
+    """Magic, JSON header, then each buffer 8-byte aligned."""
+    meta = json.dumps(header).encode()
+    parts = [_HEADER.pack(magic, len(meta)), meta]
+    offset = _HEADER.size + len(meta)
+    for buffer in arrays:
+        pad = -offset % 8
+        parts.append(bytes(pad))
+        parts.append(buffer)
+        offset += pad + len(buffer)
+    return parts
+
+def _unpack(data, magic):
+    found, length = _HEADER.unpack_from(data)
+    if found != magic:
+        raise ValueError("Not a scheduler cache entry")
+    start = _HEADER.size + length
+    return json.loads(bytes(data[_HEADER.size:start])), start
+
+def _aligned(offset):
+    return offset + (-offset % 8)
+
+def dump_roster(roster):
+    """Binary form of a roster: names and rules in the header, preferences as raw bytes."""
+    header = {"days": roster.days, "shifts": roster.shifts, "ranks": roster.ranks, "names": roster.names,
+              "rules": sorted(roster.rules.items())}
+    return _pack(ROSTER_MAGIC, header, roster.prefs)
+
+def load_roster(data):
+    """
+    Rebuild a roster from `dump_roster` output. When `data` is a mapped
+    file the preferences stay a copy-on-write view of it, so only the pages
+    that are read get loaded and edits never reach the cache.
+    """
+    header, offset = _unpack(data, ROSTER_MAGIC)
+    roster = Roster(header["days"], header["shifts"], header["ranks"])
+    roster.names = header["names"]
+    roster.index = {name: emp for emp, name in enumerate(roster.names)}
+    roster.rules = {emp: rules for emp, rules in header["rules"]}
+    start = _aligned(offset)
+    size = len(roster.names) * len(roster.days) * roster.ranks
+    if len(data) < start + size:
+        raise ValueError("Truncated roster cache entry")
+    roster.prefs = memoryview(data)[start:start + size]
+    return roster
+
+def dump_schedule(schedule):
+    """Binary form of a schedule: seats and occupancy, plus the spillover record."""
+    header = {"n_seats": len(schedule.seats), "n_slots": len(schedule.occupancy), "spilled": schedule.spilled}
+    return _pack(SCHEDULE_MAGIC, header, schedule.seats.tobytes(), schedule.occupancy.tobytes())
+
+def load_schedule(data, roster, calendar):
+    """Rebuild a schedule for `roster` by replaying the stored seats."""
+    header, offset = _unpack(data, SCHEDULE_MAGIC)
+    schedule = Schedule(roster, calendar)
+    if header["n_seats"] != len(schedule.seats) or header["n_slots"] != len(schedule.occupancy):
+        raise ValueError("Schedule cache entry does not match the calendar")
+    start = _aligned(offset)
+    seats = array('i')
+    seats.frombytes(data[start:start + 4 * header["n_seats"]])
+    start = _aligned(start + 4 * header["n_seats"])
+    occupancy = array('H')
+    occupancy.frombytes(data[start:start + 2 * header["n_slots"]])
+    if len(seats) != header["n_seats"] or len(occupancy) != header["n_slots"]:
+        raise ValueError("Truncated schedule cache entry")
+    for slot, filled in enumerate(occupancy):
+        first = schedule.slot_start[slot]
+        for emp in seats[first:first + filled]:
+            schedule.assign(slot, emp)
+    schedule.spilled = [[tuple(seat) for seat in day] for day in header["spilled"]]
+    return schedule
@@ -0,0 +1,193 @@
+"""
+Calendar model: the scheduling horizon, the shift catalog and per-slot
+capacity, indexed once into integer slot ids so the engine only ever deals
+with flat arrays.
+
+A calendar can be built in code or loaded from JSON, e.g. four weeks of
+24/7 operations with six shifts and heavier weekend staffing:
+
+    {
+      "weeks": 4,
+      "shifts": [
+        {"name": "night",     "start": "00:00", "end": "04:00", "capacity": 1},
+        {"name": "dawn",      "start": "04:00", "end": "08:00"},
+        {"name": "morning",   "start": "08:00", "end": "12:00", "capacity": 3},
+        {"name": "afternoon", "start": "12:00", "end": "16:00", "capacity": 3},
+        {"name": "evening",   "start": "16:00", "end": "20:00"},
+        {"name": "late",      "start": "20:00", "end": "24:00", "keywords": ["late", "graveyard"]}
+      ],
+      "capacity": {"default": 2, "Saturday": {"morning": 4}, "Sunday": 1}
+    }
+"""
+import copy
+import json
+from array import array
+
+from .roster import DAYS
+
+class Shift:
+    """
+    One entry of the shift catalog. `keywords` are matched case-insensitively
+    against roster cells; they default to the shift's name.
+    """
+
+    def __init__(self, name, start=None, end=None, capacity=None, keywords=None):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.capacity = capacity
+        self.keywords = [k.lower() for k in (keywords or [name])]
+
+    @property
+    def label(self):
+        """Human-friendly label such as "Morning (8:00 AM - 12:00 PM)"."""
+        if not self.start or not self.end:
+            return self.name.capitalize()
+        return f"{self.name.capitalize()} ({_clock(self.start)} - {_clock(self.end)})"
+
+def _clock(hhmm):
+    hours, minutes = (int(part) for part in hhmm.split(":"))
+    suffix = "AM" if hours % 24 < 12 else "PM"
+    return f"{(hours % 12) or 12}:{minutes:02d} {suffix}"
+
+DEFAULT_SHIFTS = [
+    Shift("morning", "08:00", "12:00"),
+    Shift("afternoon", "12:00", "16:00"),
+    Shift("evening", "16:00", "20:00"),
+]
+
+class Calendar:
+    """
+    The days being scheduled and the shifts on each of them.
+
+    `days` are the horizon's day labels. `pref_days` names, for each of
+    them, the roster column holding employees' preferences (so a 4-week
+    horizon reuses the `Monday` .. `Sunday` columns); it defaults to `days`.
+    `capacity` is an int, or a dict keyed by day label, preference day or
+    shift name (a day's entry may itself be an int or a {shift: n} dict),
+    with "default" as the fallback; a shift's own `capacity` beats the
+    default but not a day-specific entry.
+
+    Slot ids are `day * len(shifts) + shift`; `slot_capacity[slot]` is the
+    headcount for a slot and `slot_start[slot]` its first seat in the
+    schedule's flat seat array.
+
+    The horizon is split into weeks, the periods the engine's max_days and
+    min_days apply to: a new week starts at the first day whose preference
+    column already appeared in the current one. `week_of[day]` is a day's
+    week and `week_start[week]` its first day, with the horizon length at
+    the end.
+    """
+
+    def __init__(self, days=DAYS, shifts=DEFAULT_SHIFTS, capacity=2, pref_days=None):
+        self.days = list(days)
+        self.shifts = [s if isinstance(s, Shift) else Shift(s) for s in shifts]
+        self.shift_names = [s.name for s in self.shifts]
+        self.pref_days = list(pref_days) if pref_days else list(self.days)
+        if len(self.pref_days) != len(self.days):
+            raise ValueError("pref_days must name one preference column per day")
+        # Distinct preference columns in first-seen order, and each day's index into them
+        self.roster_days = list(dict.fromkeys(self.pref_days))
+        self.pref_index = [self.roster_days.index(p) for p in self.pref_days]
+        self.week_of = []
+        self.week_start = [0]
+        seen = set()
+        for d, pref_day in enumerate(self.pref_days):
+            if pref_day in seen:
+                self.week_start.append(d)
+                seen.clear()
+            seen.add(pref_day)
+            self.week_of.append(len(self.week_start) - 1)
+        self.week_start.append(len(self.days))
+
+        self._set_capacity([
+            _resolve_capacity(capacity, day, pref_day, shift)
+            for day, pref_day in zip(self.days, self.pref_days)
+            for shift in self.shifts
+        ])
+
+    @property
+    def n_seats(self):
+        return self.slot_start[-1]
+
+    def slot(self, day_index, shift_index):
+        return day_index * len(self.shifts) + shift_index
+
+    @property
+    def n_weeks(self):
+        return len(self.week_start) - 1
+
+    def week_end(self, day_index):
+        """The day after the last one in `day_index`'s week."""
+        return self.week_start[self.week_of[day_index] + 1]
+
+    def day_capacity(self, day_index):
+        """Total seats on a day."""
+        n_shifts = len(self.shifts)
+        return self.slot_start[(day_index + 1) * n_shifts] - self.slot_start[day_index * n_shifts]
+
+    def with_capacity(self, capacity):
+        """
+        A copy whose slots named by `capacity` (the constructor's spec) get
+        the headcount it gives; every other slot keeps its own.
+        """
+        slots = [(day, pref_day, shift) for day, pref_day in zip(self.days, self.pref_days) for shift in self.shifts]
+        calendar = copy.copy(self)
+        calendar._set_capacity([
+            _override_capacity(capacity, *slot, self.slot_capacity[i]) for i, slot in enumerate(slots)
+        ])
+        return calendar
+
+    def _set_capacity(self, counts):
+        self.slot_capacity = array('H', counts)
+        self.slot_start = array('I', [0])
+        for cap in self.slot_capacity:
+            self.slot_start.append(self.slot_start[-1] + cap)
+
+    @classmethod
+    def weeks(cls, count, shifts=DEFAULT_SHIFTS, capacity=2, days=DAYS):
+        """A horizon of `count` weeks that reuses the weekly preference columns."""
+        labels = [day if count == 1 else f"{day} (week {week + 1})" for week in range(count) for day in days]
+        return cls(labels, shifts, capacity, pref_days=list(days) * count)
+
+    @classmethod
+    def load(cls, path):
+        """Build a calendar from a JSON file (see the module docstring)."""
+        with open(path) as f:
+            return cls.from_spec(json.load(f))
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Build a calendar from an already parsed JSON spec."""
+        shifts = [Shift(**entry) for entry in spec["shifts"]] if "shifts" in spec else DEFAULT_SHIFTS
+        capacity = spec.get("capacity", 2)
+        days = spec.get("days", DAYS)
+        if "weeks" in spec:
+            return cls.weeks(spec["weeks"], shifts, capacity, days)
+        return cls(days, shifts, capacity, spec.get("pref_days"))
+
+def _resolve_capacity(capacity, day, pref_day, shift):
+    if isinstance(capacity, int):
+        return capacity
+    for key in (day, pref_day):
+        if key in capacity:
+            entry = capacity[key]
+            if isinstance(entry, int):
+                return entry
+            if shift.name in entry:
+                return entry[shift.name]
+    if shift.capacity is not None:
+        return shift.capacity
+    return capacity.get(shift.name, capacity.get("default", 2))
+
+def _override_capacity(capacity, day, pref_day, shift, current):
+    if isinstance(capacity, int):
+        return capacity
+    for key in (day, pref_day):
+        if key in capacity:
+            entry = capacity[key]
+            if isinstance(entry, int):
+                return entry
+            if shift.name in entry:
+                return entry[shift.name]
+    return capacity.get(shift.name, capacity.get("default", current))
@@ -0,0 +1,185 @@
+"""
+Headless counterpart of the src/4 scheduling app.
+
+Loads a roster, generates the schedule and writes the same outputs as the
+GUI's buttons (PDF, per-employee PDFs, assignment export, solve stats)
+without a display. Only the engine is imported up front: tabulate is
+loaded to print the table, and fpdf only when a PDF is requested, so
+cron jobs that just export start in a few tens of milliseconds.
+
+    cd src
+    python -m scheduler.cli ../rosters/site.csv --seed 0 --quiet --export site.ndjson
+    python -m scheduler.cli ../rosters/site.csv --pdf site.pdf --per-employee staff.zip --jobs 8
+    python -m scheduler.cli ../rosters/site.csv --previous last_week.csv --export this_week.csv
+    python -m scheduler.cli ../rosters/site.csv --constraints ../rosters/unavailable.csv
+    python -m scheduler.cli ../rosters/site.csv --seed 0 --watch --export site.csv --pdf site.pdf
+    python 4/schedule.py ../rosters/site.csv --seed 0      # same, through the GUI script
+"""
+import argparse
+import os
+import sys
+
+from .catalog import Calendar
+from .constraints import read_constraints
+from .engine import SOLVERS, SolveConfig, solve
+from .loader import read_roster
+
+# ANSI: home the cursor and clear the screen, so a watched table redraws in place
+CLEAR = "\x1b[H\x1b[2J"
+
+def print_table(schedule, file=None):
+    """Print the day x shift grid the GUI shows in its Treeview."""
+    from tabulate import tabulate
+    headers = ["Day"] + [shift.capitalize() for shift in schedule.shifts]
+    print(tabulate(schedule.rows(), headers=headers, tablefmt="grid"), file=file)
+
+def _replace(path, write):
+    """Call write(temporary path), then move the result over `path` in one step."""
+    tmp = f"{path}.tmp"
+    try:
+        result = write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return result
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate a schedule from a roster CSV without the GUI.")
+    parser.add_argument("roster", help="roster CSV (simple or ranked layout)")
+    parser.add_argument("--seed", type=int, help="seed for the random vacancy fill; the same seed gives the same schedule")
+    parser.add_argument("--solver", choices=SOLVERS, default="greedy")
+    parser.add_argument("--max-days", type=int, default=5, help="most days any employee may work in the week")
+    parser.add_argument("--min-days", type=int, default=0, help="fairness target: days every employee should get")
+    parser.add_argument("--previous", metavar="EXPORT",
+                        help="start from an earlier run's --export file and only re-decide seats it can no longer hold")
+    parser.add_argument("--improve-ms", type=int, default=0, metavar="MS",
+                        help="spend up to MS milliseconds improving preference ranks with local search")
+    parser.add_argument("--calendar", help="JSON calendar with the days, shift catalog and capacities to schedule")
+    parser.add_argument("--constraints", metavar="CSV",
+                        help="availability rules by employee (name,unavailable columns), on top of the roster's own")
+    parser.add_argument("--cache", action="store_true",
+                        help="read and solve through the on-disk cache the GUIs use")
+    parser.add_argument("--quiet", action="store_true", help="do not print the schedule table")
+    parser.add_argument("--pdf", metavar="PATH", help="save the schedule table as a PDF")
+    parser.add_argument("--per-employee", metavar="ZIP", help="save a zip of one PDF per employee")
+    parser.add_argument("--jobs", type=int, help="worker processes for --per-employee (default: all cores)")
+    parser.add_argument("--export", metavar="PATH", help="write one row per assignment to PATH")
+    parser.add_argument("--format", help="export format: csv, ndjson or columnar (default: from the PATH extension)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running, re-solving and rewriting the outputs whenever the roster file changes")
+    parser.add_argument("--debounce-ms", type=int, default=300, metavar="MS",
+                        help="with --watch, wait until the file has been quiet for MS milliseconds")
+    parser.add_argument("--profile", nargs="?", const="", metavar="TRACE",
+                        help="print per-phase timings to stderr; with TRACE also write a Chrome trace (.json) or folded stacks")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.min_days < 0 or args.max_days < 0:
+        parser.error("--max-days and --min-days cannot be negative")
+    if args.min_days > args.max_days:
+        parser.error(f"--min-days ({args.min_days}) cannot exceed --max-days ({args.max_days})")
+    # Everything beyond the engine is imported only for the options that need it
+    if args.format is not None:
+        from .export import FORMATS
+        if args.format not in FORMATS:
+            parser.error(f"argument --format: invalid choice {args.format!r} (choose from {', '.join(FORMATS)})")
+    try:
+        calendar = Calendar.load(args.calendar) if args.calendar else None
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"argument --calendar: {e}")
+    profiler = None
+    if args.profile is not None:
+        from .profiling import Profiler
+        profiler = Profiler()
+    config = SolveConfig(solver=args.solver, max_days=args.max_days, min_days=args.min_days,
+                         seed=args.seed, calendar=calendar, profiler=profiler)
+
+    cache = None
+    if args.cache:
+        from .cache import open_cache
+        cache = open_cache()
+    try:
+        roster = (cache.read_roster if cache is not None else read_roster)(args.roster, calendar)
+        if args.constraints:
+            read_constraints(args.constraints, roster)
+        if args.previous:
+            from .export import read_assignments
+            from .warmstart import format_report as warm_start_report, warm_start
+            schedule, report = warm_start(roster, read_assignments(args.previous), config)
+            print(warm_start_report(report), file=sys.stderr)
+        elif cache is not None:
+            schedule = cache.solve(roster, config)
+        else:
+            schedule = solve(roster, config)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Failed to generate schedule: {e}", file=sys.stderr)
+        return 1
+    write_outputs(schedule, args)
+    if profiler is not None:
+        if profiler.days:
+            print(profiler.report(), file=sys.stderr)
+        else:
+            print("Schedule came from the cache, so there are no solve timings.", file=sys.stderr)
+        if args.profile:
+            profiler.write(args.profile)
+    if args.watch:
+        watch(schedule, args, config)
+    return 0
+
+def write_outputs(schedule, args, clear=False):
+    """Print and save everything the arguments ask for; files are replaced whole, so readers never see half of one."""
+    if args.improve_ms > 0:
+        from .improve import format_report, improve
+        schedule, report = improve(schedule, args.improve_ms)
+        print(format_report(report), file=sys.stderr)
+
+    if not args.quiet:
+        if clear:
+            print(CLEAR, end="")
+        print_table(schedule)
+    if args.export:
+        from .export import export, format_for
+        _replace(args.export, lambda tmp: export(schedule, tmp, args.format or format_for(args.export)))
+    if args.pdf or args.per_employee:
+        from .pdfexport import export_employee_pdfs, write_schedule_pdf
+        if args.pdf:
+            pages = _replace(args.pdf, lambda tmp: write_schedule_pdf(schedule, tmp))
+            print(f"wrote {args.pdf} ({pages} pages)", file=sys.stderr)
+        if args.per_employee:
+            pages = _replace(args.per_employee, lambda tmp: export_employee_pdfs(schedule, tmp, args.jobs))
+            print(f"wrote {args.per_employee} ({len(schedule.roster)} documents, {pages} pages)", file=sys.stderr)
+
+def watch(schedule, args, config):
+    """
+    Re-solve whenever the roster file changes until interrupted. Only the
+    changed rows are re-solved (scheduler.watch); the unimproved schedule
+    is kept as the base for the next update, so --improve-ms results never
+    feed back into it.
+    """
+    from .watch import FileWatcher, format_report as watch_report, sync_roster
+    watcher = FileWatcher(args.roster, args.debounce_ms / 1000)
+    clear = not args.quiet and sys.stdout.isatty()
+    print(f"watching {args.roster} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            seen = watcher.wait()
+            try:
+                roster = read_roster(args.roster, config.calendar)
+                if args.constraints:
+                    read_constraints(args.constraints, roster)
+                schedule, report = sync_roster(schedule, roster, config)
+                write_outputs(schedule, args, clear)
+            except (OSError, ValueError, KeyError) as e:
+                # Usually a file saved mid-edit; the next save gets another try
+                print(f"Failed to update schedule: {e}", file=sys.stderr)
+                continue
+            print(watch_report(report, seen), file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
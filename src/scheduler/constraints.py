@@ -0,0 +1,148 @@
+"""
+Availability and hard constraints, compiled to per-employee bitsets.
+
+Preferences say which shifts someone would like; rules say which they
+cannot work at all. Each rule is a short phrase:
+
+    Tuesday                 unavailable all day (every Tuesday of the horizon)
+    evening                 never the evening shift
+    Friday morning          unavailable for one shift
+    Monday (week 2) late    a single horizon day, by its calendar label
+    evening then morning    no morning shift the day after an evening one
+
+Rules come from an `unavailable` column in the roster, several to a cell
+separated by ";", or from a side file with `name` and `unavailable`
+columns read by `read_constraints`, where a `*` name applies the row to
+everyone:
+
+    name,unavailable
+    Alice,Tuesday; evening
+    *,evening then morning
+
+`Availability` compiles a roster's rules once per calendar into one int
+per employee with a bit set for every slot id (`day * len(shifts) +
+shift`) they may not take, so each pass of a solve checks eligibility
+with a single `blocked[emp] >> slot & 1`. Rest rules ("then") depend on
+the seats already held, so the Schedule ORs in their bits as it assigns.
+"""
+import csv
+
+COLUMN = "unavailable"
+
+def split_rules(cell):
+    """The rules in one `unavailable` cell."""
+    return [rule.strip() for rule in cell.split(";") if rule.strip()]
+
+def read_constraints(path, roster):
+    """
+    Add the rules of a side file (see the module docstring) to `roster`'s
+    employees. Returns the number of rules read.
+    """
+    count = 0
+    with open(path, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if not reader.fieldnames or "name" not in reader.fieldnames or COLUMN not in reader.fieldnames:
+            raise ValueError(f"Constraints file needs 'name' and '{COLUMN}' columns")
+        for row in reader:
+            rules = split_rules(row[COLUMN] or "")
+            name = row["name"]
+            if name == "*":
+                employees = range(len(roster))
+            elif name in roster.index:
+                employees = [roster.index[name]]
+            else:
+                raise ValueError(f"Constraints file names {name!r}, who is not on the roster")
+            for emp in employees:
+                roster.rules.setdefault(emp, []).extend(rules)
+            count += len(rules)
+    return count
+
+class Availability:
+    """
+    A roster's rules compiled for one calendar. `static[emp]` has a bit set
+    for every slot the employee can never take, and `rest[emp]` lists the
+    (shift, next day's shift) pairs they cannot work back to back.
+    Employees without rules get 0 and no `rest` entry.
+    """
+
+    def __init__(self, roster, calendar):
+        self.n_days = len(calendar.days)
+        self.n_shifts = len(calendar.shifts)
+        self.static = [0] * len(roster)
+        self.rest = {}
+        days = [(label.lower(), pref.lower()) for label, pref in zip(calendar.days, calendar.pref_days)]
+        shifts = [{shift.name.lower(), *shift.keywords} for shift in calendar.shifts]
+        compiled = {}
+        for emp, rules in roster.rules.items():
+            mask = 0
+            rest = []
+            for rule in rules:
+                entry = compiled.get(rule)
+                if entry is None:
+                    entry = compiled[rule] = self._compile(rule, days, shifts)
+                if entry is None:
+                    raise ValueError(f"{roster.names[emp]}: unknown day or shift in rule {rule!r}")
+                if isinstance(entry, tuple):
+                    rest.append(entry)
+                else:
+                    mask |= entry
+            self.static[emp] = mask
+            if rest:
+                self.rest[emp] = tuple(rest)
+
+    def _compile(self, rule, days, shifts):
+        """A slot mask, a (shift, next shift) rest pair, or None if the rule names nothing."""
+        text = " ".join(rule.lower().split())
+        before, then, after = text.partition(" then ")
+        if then:
+            first, second = _shift(before, shifts), _shift(after, shifts)
+            return None if first is None or second is None else (first, second)
+        every_shift = (1 << self.n_shifts) - 1
+        day_mask = _days(text, days)
+        if day_mask:
+            return self._spread(day_mask, every_shift)
+        shift = _shift(text, shifts)
+        if shift is not None:
+            return self._spread((1 << self.n_days) - 1, 1 << shift)
+        day_text, _, shift_text = text.rpartition(" ")
+        day_mask, shift = _days(day_text, days), _shift(shift_text, shifts)
+        if day_mask and shift is not None:
+            return self._spread(day_mask, 1 << shift)
+        return None
+
+    def _spread(self, day_mask, shift_mask):
+        """Slot mask covering `shift_mask` on every day in `day_mask`."""
+        mask = 0
+        for d in range(self.n_days):
+            if day_mask >> d & 1:
+                mask |= shift_mask << d * self.n_shifts
+        return mask
+
+    def rest_bits(self, emp, slots):
+        """Slots an employee's rest rules rule out, given the slots they hold."""
+        mask = 0
+        n_shifts = self.n_shifts
+        last = (self.n_days - 1) * n_shifts
+        for slot in slots:
+            base = slot - slot % n_shifts
+            shift = slot - base
+            for first, second in self.rest[emp]:
+                if shift == first and base < last:
+                    mask |= 1 << base + n_shifts + second
+                if shift == second and base:
+                    mask |= 1 << base - n_shifts + first
+        return mask
+
+def _days(text, days):
+    """Bits of the horizon days whose label or preference day is `text`."""
+    mask = 0
+    for d, labels in enumerate(days):
+        if text in labels:
+            mask |= 1 << d
+    return mask
+
+def _shift(text, shifts):
+    for s, names in enumerate(shifts):
+        if text in names:
+            return s
+    return None
@@ -0,0 +1,127 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+from array import array
+from collections import OrderedDict
+
+class CSVIndex:
+    """
+    Random access to the rows of a CSV file without loading it.
+
+    Opening the file records the byte offset where each row starts
+    (quoted fields spanning several lines are kept in one row). Rows are
+    parsed on demand through a small LRU cache, edits live in a sparse
+    {(row, column): value} overlay, and `save` streams unchanged rows
+    straight through with the edited ones re-encoded.
+
+    Row numbers exclude the header, which is available as `headers`.
+    Edited rows are written with the file's own line ending, taken from
+    its first line (`lineterminator`, "\r\n" for a single unterminated line).
+    """
+
+    CACHE_ROWS = 512
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self._load()
+
+    def _load(self):
+        self.edits = {}
+        self._cache = OrderedDict()
+        self.offsets = array('Q')
+        self.lineterminator = "\r\n"
+        with open(self.path, 'rb') as f:
+            offset = 0
+            start = 0
+            quotes = 0
+            for line in f:
+                if not offset and line.endswith(b"\n"):
+                    self.lineterminator = "\r\n" if line.endswith(b"\r\n") else "\n"
+                quotes += line.count(b'"')
+                offset += len(line)
+                if quotes % 2 == 0:
+                    self.offsets.append(start)
+                    start = offset
+                    quotes = 0
+            if start < offset:
+                self.offsets.append(start)
+            self.offsets.append(offset)
+        self.headers = self._parse(0) if len(self.offsets) > 1 else []
+
+    def __len__(self):
+        return max(len(self.offsets) - 2, 0)
+
+    def _raw(self, index):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[index])
+            return f.read(self.offsets[index + 1] - self.offsets[index])
+
+    def _parse(self, index):
+        text = self._raw(index).decode(self.encoding)
+        return next(csv.reader(io.StringIO(text, newline='')), [])
+
+    def row(self, row):
+        """Return a data row with any pending edits applied."""
+        values = self._cache.get(row)
+        if values is None:
+            values = self._parse(row + 1)
+            self._cache[row] = values
+            if len(self._cache) > self.CACHE_ROWS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(row)
+        if not self.edits:
+            return list(values)
+        values = list(values)
+        for col in range(len(self.headers)):
+            if (row, col) in self.edits:
+                while len(values) <= col:
+                    values.append("")
+                values[col] = self.edits[(row, col)]
+        return values
+
+    def rows(self, start, stop):
+        """Return data rows start..stop-1, clipped to the file."""
+        return [self.row(i) for i in range(max(start, 0), min(stop, len(self)))]
+
+    def set(self, row, col, value):
+        """Record an edit in the overlay."""
+        self.edits[(row, col)] = value
+
+    def edited_rows(self):
+        return sorted({row for row, _ in self.edits})
+
+    def save(self, path):
+        """
+        Write the file with edits applied. Unchanged rows are copied byte
+        for byte; saving over the source goes through a temporary file.
+        """
+        edited = set(self.edited_rows())
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".csv.tmp")
+        try:
+            with os.fdopen(fd, 'wb') as out, open(self.path, 'rb') as src:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator=self.lineterminator)
+                for index in range(len(self.offsets) - 1):
+                    chunk = src.read(self.offsets[index + 1] - self.offsets[index])
+                    if index - 1 in edited:
+                        buffer.seek(0)
+                        buffer.truncate()
+                        writer.writerow(self.row(index - 1))
+                        line = buffer.getvalue()
+                        if not chunk.endswith(b"\n"):
+                            line = line.rstrip("\r\n")
+                        chunk = line.encode(self.encoding)
+                    out.write(chunk)
+            shutil.copymode(self.path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # The saved file is now the source of truth for further edits
+        self.path = path
+        self._load()
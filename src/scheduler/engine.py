@@ -0,0 +1,572 @@
+import copy
+import random
+from array import array
+from itertools import compress
+
+from .catalog import Calendar
+from .constraints import Availability
+from .mincost import assign_day
+from .rng import substream
+
+SOLVERS = ("greedy", "mincost")
+
+# Byte translation table that flips 0 <-> 1, used to invert on-day markers
+_NOT = bytes([1, 0]) + bytes(254)
+
+class SolveCancelled(Exception):
+    """Raised by solve() when `config.cancel` is set between days."""
+
+class SolveConfig:
+    """
+    Knobs for a solve. With `seed` set, each day draws from its own
+    substream of the seed, so a day's random choices do not depend on which
+    other days were solved before it in the same process: repairs and
+    parallel runs reproduce a serial solve bit for bit. Otherwise `rng`
+    (anything with a `randrange` method) is shared by every day, falling
+    back to the global `random` module, so seeding with `random.seed()`
+    still gives repeatable schedules. `solver` is "greedy" (the
+    original first-come passes) or "mincost" (optimal per-day assignment).
+    Nobody is given more than `max_days` days in any week of the calendar
+    (None for no cap), and employees who would otherwise end a week below
+    `min_days` are seated first.
+    `progress(days_done, n_days)` is called after each day, and `cancel`
+    (e.g. a threading.Event) is checked before each day. `calendar` sets
+    the horizon, shifts and per-slot capacity; without one the roster's own
+    days and shifts are used with `capacity` seats everywhere. `profiler`
+    (a scheduler.profiling.Profiler) records per-phase timings and counters.
+    """
+
+    def __init__(self, capacity=2, rng=None, solver="greedy", max_days=5, min_days=0,
+                 progress=None, cancel=None, calendar=None, seed=None, profiler=None):
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver!r}; expected one of {', '.join(SOLVERS)}")
+        if max_days is not None and min_days > max_days:
+            raise ValueError(f"min_days ({min_days}) cannot exceed max_days ({max_days})")
+        self.capacity = capacity
+        self.rng = rng
+        self.seed = seed
+        self.solver = solver
+        self.max_days = max_days
+        self.min_days = min_days
+        self.progress = progress
+        self.cancel = cancel
+        self.calendar = calendar
+        self.profiler = profiler
+
+    def day_rng(self, day_index):
+        """The random source for one day of the solve."""
+        if self.seed is not None:
+            return substream(self.seed, "day", day_index)
+        return self.rng if self.rng is not None else random
+
+    def calendar_for(self, roster):
+        """The calendar to solve `roster` on."""
+        if self.calendar is not None:
+            return self.calendar
+        return Calendar(roster.days, roster.shifts, self.capacity)
+
+    def checkpoint(self, days_done, n_days):
+        """Report progress and stop the solve if it has been cancelled."""
+        if days_done and self.progress is not None:
+            self.progress(days_done, n_days)
+        if days_done < n_days and self.cancel is not None and self.cancel.is_set():
+            raise SolveCancelled()
+
+class Schedule:
+    """
+    Solved horizon. Slot ids are `day * len(shifts) + shift`; a slot owns
+    `slot_capacity[slot]` entries of the flat `seats` array starting at
+    `slot_start[slot]` (-1 marks an empty seat), and `occupancy[slot]`
+    counts how many of them are filled. `pref_index[day]` is the roster
+    day whose preferences apply on a horizon day.
+    `on_day` marks, per day, which employees already hold a seat that day,
+    `days_worked` counts each employee's seats over the horizon and
+    `week_worked[week]` over one calendar week, and `spilled[day]` lists
+    the (slot, employee) seats that day received from the previous day's
+    spillover.
+    `blocked[emp]` has a bit set for every slot the employee may not take
+    under the roster's availability rules (compiled into `availability`,
+    None without rules), including those ruled out by rest rules through
+    the seats they already hold.
+    """
+
+    def __init__(self, roster, calendar=None):
+        calendar = calendar or Calendar(roster.days, roster.shifts)
+        if calendar.shift_names != list(roster.shifts):
+            raise ValueError("Calendar shifts do not match the roster's shifts")
+        self.roster = roster
+        self.calendar = calendar
+        self.days = calendar.days
+        self.shifts = calendar.shift_names
+        self.pref_index = [roster.days.index(day) for day in calendar.pref_days]
+        self.slot_capacity = calendar.slot_capacity
+        self.slot_start = calendar.slot_start
+        n_slots = len(self.days) * len(self.shifts)
+        self.seats = array('i', [-1]) * calendar.n_seats
+        self.occupancy = array('H', [0]) * n_slots
+        self.days_worked = array('H', [0]) * len(roster)
+        self.week_of = calendar.week_of
+        self.week_worked = [array('H', [0]) * len(roster) for _ in range(calendar.n_weeks)]
+        self.on_day = bytearray(len(self.days) * len(roster))
+        self.staffed = array('I', [0]) * len(self.days)
+        self.spilled = [[] for _ in self.days]
+        self.config = None
+        if roster.rules:
+            self.availability = Availability(roster, calendar)
+            self.blocked = list(self.availability.static)
+        else:
+            self.availability = None
+            self.blocked = [0] * len(roster)
+        self.held = {}   # slots held by each employee with rest rules
+
+    def copy(self, roster=None):
+        """
+        An independent copy, so one thread can repair it while another keeps
+        the original. `roster` (e.g. a Roster.copy()) replaces the roster it
+        refers to; the calendar and compiled availability are shared.
+        """
+        other = copy.copy(self)
+        if roster is not None:
+            other.roster = roster
+        other.seats = array('i', self.seats)
+        other.occupancy = array('H', self.occupancy)
+        other.days_worked = array('H', self.days_worked)
+        other.week_worked = [array('H', worked) for worked in self.week_worked]
+        other.on_day = bytearray(self.on_day)
+        other.staffed = array('I', self.staffed)
+        other.spilled = [list(day) for day in self.spilled]
+        other.blocked = list(self.blocked)
+        other.held = {emp: list(slots) for emp, slots in self.held.items()}
+        return other
+
+    def assign(self, slot, emp):
+        self.seats[self.slot_start[slot] + self.occupancy[slot]] = emp
+        self.occupancy[slot] += 1
+        self.days_worked[emp] += 1
+        d = slot // len(self.shifts)
+        self.week_worked[self.week_of[d]][emp] += 1
+        mark = d * len(self.roster) + emp
+        if not self.on_day[mark]:
+            self.on_day[mark] = 1
+            self.staffed[mark // len(self.roster)] += 1
+        if self.availability is not None and emp in self.availability.rest:
+            self.held.setdefault(emp, []).append(slot)
+            self.blocked[emp] |= self.availability.rest_bits(emp, (slot,))
+
+    def day_seats(self, day_index):
+        """Return the (slot, employee) seats of a day in seat order."""
+        n_shifts = len(self.shifts)
+        return [
+            (slot, emp)
+            for slot in range(day_index * n_shifts, (day_index + 1) * n_shifts)
+            for emp in self.slot_ids(slot)
+        ]
+
+    def clear_day(self, day_index):
+        """Empty every seat on a day, giving the days worked back."""
+        n = len(self.roster)
+        n_shifts = len(self.shifts)
+        week_worked = self.week_worked[self.week_of[day_index]]
+        for slot, emp in self.day_seats(day_index):
+            self.days_worked[emp] -= 1
+            week_worked[emp] -= 1
+            if emp in self.held:
+                held = self.held[emp]
+                held.remove(slot)
+                self.blocked[emp] = self.availability.static[emp] | self.availability.rest_bits(emp, held)
+        for slot in range(day_index * n_shifts, (day_index + 1) * n_shifts):
+            start = self.slot_start[slot]
+            self.seats[start:start + self.occupancy[slot]] = array('i', [-1]) * self.occupancy[slot]
+            self.occupancy[slot] = 0
+        self.on_day[day_index * n:(day_index + 1) * n] = bytes(n)
+        self.staffed[day_index] = 0
+
+    def week_counts(self, day_index):
+        """Seats each employee holds in the calendar week of `day_index`."""
+        return self.week_worked[self.week_of[day_index]]
+
+    def available_on(self, day_index):
+        """Return the ids of employees without a seat on the given day."""
+        n = len(self.roster)
+        if self.staffed[day_index] == n:
+            return array('i')
+        free = self.on_day[day_index * n:(day_index + 1) * n].translate(_NOT)
+        return array('i', compress(range(n), free))
+
+    def slot_ids(self, slot):
+        start = self.slot_start[slot]
+        return self.seats[start:start + self.occupancy[slot]].tolist()
+
+    def names(self, day_index, shift_index):
+        slot = day_index * len(self.shifts) + shift_index
+        return [self.roster.names[emp] for emp in self.slot_ids(slot)]
+
+    def as_dict(self):
+        """Return the familiar {day: {shift: [names]}} layout."""
+        return {
+            day: {shift: self.names(d, s) for s, shift in enumerate(self.shifts)}
+            for d, day in enumerate(self.days)
+        }
+
+    def rows(self):
+        """Return one [day, "names", ...] row per day for table output."""
+        return [
+            [day] + [", ".join(self.names(d, s)) for s in range(len(self.shifts))]
+            for d, day in enumerate(self.days)
+        ]
+
+class LoadQueue:
+    """
+    Bucket queue of employees keyed by days worked in the current week.
+    `pop` returns a random employee from the least-loaded bucket, so each
+    pick is O(1) amortised because keys only ever range over 0..max_days.
+    Given `blocked` (a Schedule's bitsets) and a slot, `pop` skips
+    employees who may not take that slot, leaving them queued for the next
+    one.
+    """
+
+    def __init__(self, employees, days_worked, max_days):
+        self.buckets = []
+        for emp in employees:
+            worked = days_worked[emp]
+            if max_days is not None and worked >= max_days:
+                continue
+            while len(self.buckets) <= worked:
+                self.buckets.append(array('i'))
+            self.buckets[worked].append(emp)
+        self.low = 0
+
+    def pop(self, rng, blocked=None, slot=0):
+        skipped = []
+        while True:
+            while self.low < len(self.buckets) and not self.buckets[self.low]:
+                self.low += 1
+            if self.low == len(self.buckets):
+                chosen = None
+                break
+            bucket = self.buckets[self.low]
+            i = rng.randrange(len(bucket))
+            chosen = bucket[i]
+            bucket[i] = bucket[-1]
+            bucket.pop()
+            if blocked is None or not blocked[chosen] >> slot & 1:
+                break
+            skipped.append((self.low, chosen))
+        for worked, emp in skipped:
+            self.buckets[worked].append(emp)
+            self.low = min(self.low, worked)
+        return chosen
+
+def day_order(schedule, day_index, config, ahead=None):
+    """
+    Employees in the order a day's first pass should consider them: those
+    still short of `min_days` this week go first, fewest spare days first
+    (so anyone who must work today leads), then everyone else in roster
+    order. Anyone already at `max_days` for the week, or already seated
+    that day, is left out. `ahead[emp]`, if given, counts the later days of
+    the week the employee is already seated on, which they cannot work again.
+    """
+    days_worked = schedule.week_counts(day_index)
+    max_days = config.max_days
+    eligible = schedule.available_on(day_index)
+    if max_days is not None:
+        eligible = [emp for emp in eligible if days_worked[emp] < max_days]
+    if not config.min_days:
+        return eligible
+    short = [emp for emp in eligible if days_worked[emp] < config.min_days]
+    if not short:
+        return eligible
+    # Spare days are the days left this week less those still needed, so
+    # with the same days left, fewer days worked means fewer to spare
+    if ahead is None:
+        short.sort(key=days_worked.__getitem__)
+    else:
+        short.sort(key=lambda emp: days_worked[emp] - ahead[emp])
+    flagged = set(short)
+    return short + [emp for emp in eligible if emp not in flagged]
+
+def must_work(schedule, day_index, config, emp, ahead=None):
+    """Does `emp` have to work on `day_index` to still reach `min_days` that week?"""
+    # Days left in the week, counting today
+    remaining = schedule.calendar.week_end(day_index) - day_index
+    if ahead is not None:
+        remaining -= ahead[emp]
+    return config.min_days - schedule.week_counts(day_index)[emp] >= remaining
+
+def solve(roster, config=None):
+    """
+    Solve the whole horizon one day at a time with `config.solver`.
+    The returned Schedule remembers its config so it can be repaired later.
+    """
+    config = config or SolveConfig()
+    schedule = Schedule(roster, config.calendar_for(roster))
+    schedule.config = config
+    n_days = len(schedule.days)
+    for d in range(n_days):
+        config.checkpoint(d, n_days)
+        solve_day(schedule, d, config)
+    config.checkpoint(n_days, n_days)
+    return schedule
+
+def solve_day(schedule, day_index, config):
+    if config.solver == "mincost":
+        _mincost_day(schedule, day_index, config)
+    else:
+        _greedy_day(schedule, day_index, config)
+
+def _greedy_day(schedule, d, config):
+    """
+    Greedy assignment shared by every front-end:
+      1. give each employee their highest-ranked open shift, in `day_order`
+         (anyone who must work today for `min_days` takes any open shift),
+      2. put the rest into any open shift that day,
+      3. spill anyone still left over into the next day, keeping a seat
+         there for everyone else who must work it,
+      4. fill remaining vacancies with the least-loaded employees not yet on
+         that day, breaking ties at random.
+    Employees at `config.max_days` for the week are skipped by every step,
+    nobody already seated that day (by spillover) is seated again, and
+    nobody is put in a slot their availability rules block.
+    """
+    roster = schedule.roster
+    capacity = schedule.slot_capacity
+    occupancy = schedule.occupancy
+    n_days = len(schedule.days)
+    n_shifts = len(schedule.shifts)
+    blocked = schedule.blocked
+    max_days = config.max_days if config.max_days is not None else n_days + 1
+    base = d * n_shifts
+    unassigned = array('i')
+    if d + 1 < n_days:
+        schedule.spilled[d + 1] = []
+    profiler = config.profiler
+    if profiler is not None:
+        profiler.begin(schedule, d)
+
+    # First pass: assign based on ranked preferences
+    for emp in day_order(schedule, d, config):
+        for shift in roster.ranked(emp, schedule.pref_index[d]):
+            slot = base + shift
+            if occupancy[slot] < capacity[slot] and not blocked[emp] >> slot & 1:
+                schedule.assign(slot, emp)
+                break
+        else:
+            if config.min_days and must_work(schedule, d, config, emp):
+                for slot in range(base, base + n_shifts):
+                    if occupancy[slot] < capacity[slot] and not blocked[emp] >> slot & 1:
+                        schedule.assign(slot, emp)
+                        break
+                else:
+                    unassigned.append(emp)
+            else:
+                unassigned.append(emp)
+    if profiler is not None:
+        profiler.lap("first_pass")
+
+    # Second pass: any open shift on the same day the employee may work.
+    # Seats only ever fill, so once the day is full everyone left spills.
+    left = array('i')
+    free = sum(capacity[base:base + n_shifts]) - sum(occupancy[base:base + n_shifts])
+    for i, emp in enumerate(unassigned):
+        if not free:
+            left.extend(unassigned[i:])
+            break
+        for slot in range(base, base + n_shifts):
+            if occupancy[slot] < capacity[slot] and not blocked[emp] >> slot & 1:
+                schedule.assign(slot, emp)
+                free -= 1
+                break
+        else:
+            left.append(emp)
+    if profiler is not None:
+        profiler.lap("second_pass")
+
+    # Spillover: the rest go to any open shift on the next day, until it is
+    # full, short of a seat for everyone else who must work that day
+    if d + 1 < n_days:
+        next_base = base + n_shifts
+        # The next day may start a new week
+        days_worked = schedule.week_counts(d + 1)
+        free = sum(capacity[next_base:next_base + n_shifts]) - sum(occupancy[next_base:next_base + n_shifts])
+        if config.min_days and left:
+            spilling = set(left)
+            free -= sum(1 for emp in day_order(schedule, d + 1, config)
+                        if emp not in spilling and must_work(schedule, d + 1, config, emp))
+        for emp in left:
+            if free <= 0:
+                break
+            if days_worked[emp] < max_days:
+                for slot in range(next_base, next_base + n_shifts):
+                    if occupancy[slot] < capacity[slot] and not blocked[emp] >> slot & 1:
+                        schedule.assign(slot, emp)
+                        schedule.spilled[d + 1].append((slot, emp))
+                        free -= 1
+                        break
+    if profiler is not None:
+        profiler.lap("spillover", spilled=len(schedule.spilled[d + 1]) if d + 1 < n_days else 0)
+
+    # Finally, fill remaining vacancies from a bucket queue of the
+    # employees not yet on this day, least-loaded first
+    queue = None
+    for shift in range(n_shifts):
+        while occupancy[base + shift] < capacity[base + shift]:
+            if queue is None:
+                queue = LoadQueue(schedule.available_on(d), schedule.week_counts(d), config.max_days)
+                rng = config.day_rng(d)
+            chosen = queue.pop(rng, blocked, base + shift)
+            if chosen is None:
+                break
+            schedule.assign(base + shift, chosen)
+    if profiler is not None:
+        profiler.lap("random_fill")
+        profiler.end()
+
+def _mincost_day(schedule, d, config):
+    """
+    Solve a day as a min-cost assignment instead of in CSV row order.
+    A seat costs 0 for a first choice, 1 for a second, 2 for a third and
+    `ranks` for an unlisted shift; ties go to whoever has worked fewer days
+    that week. Employees at the week's `max_days` are left out of the day,
+    and those who must work today to reach `min_days` outrank any
+    preference. Every seat that can be filled is filled, so no next-day
+    spillover or random fill is needed.
+    Slots an employee's availability rules block are left out of their row.
+    """
+    roster = schedule.roster
+    n_days = len(schedule.days)
+    n_shifts = len(schedule.shifts)
+    base = d * n_shifts
+    capacity = schedule.slot_capacity[base:base + n_shifts]
+    seats = sum(capacity)
+    # Rank cost dominates: no combination of days-worked tie-breaks can
+    # outweigh a single step in preference rank.
+    weight = seats * n_days + 1
+    unlisted = roster.ranks * weight
+    urgent_bonus = (roster.ranks + 1) * weight * seats
+    pref_day = schedule.pref_index[d]
+    blocked = schedule.blocked
+
+    profiler = config.profiler
+    if profiler is not None:
+        profiler.begin(schedule, d)
+    eligible = day_order(schedule, d, config)
+    remaining = schedule.calendar.week_end(d) - d
+    days_worked = schedule.week_counts(d)
+    costs = []
+    for emp in eligible:
+        worked = days_worked[emp]
+        offset = worked
+        if config.min_days - worked >= remaining:
+            offset -= urgent_bonus
+        row = [unlisted + offset] * n_shifts
+        for rank, shift in enumerate(roster.ranked(emp, pref_day)):
+            row[shift] = min(row[shift], rank * weight + offset)
+        if blocked[emp] >> base:
+            for shift in range(n_shifts):
+                if blocked[emp] >> base + shift & 1:
+                    row[shift] = None
+        costs.extend(row)
+    if profiler is not None:
+        profiler.lap("costs")
+    where = assign_day(costs, len(eligible), n_shifts, capacity)
+    for i in sorted(range(len(eligible)), key=eligible.__getitem__):
+        if where[i] >= 0:
+            schedule.assign(base + where[i], eligible[i])
+    if profiler is not None:
+        profiler.lap("assign")
+        profiler.end()
+
+def repair(schedule, day_index, config=None):
+    """
+    Re-solve a schedule after the roster's preferences for `day_index`
+    changed. Earlier days are untouched. The affected day is solved again
+    from the spillover it originally received, and each following day only
+    while its inputs differ from the previous run: the spillover it
+    receives, and the standing of every employee whose days worked moved.
+    Once a day's inputs match, it and every later day are put back as they
+    were. Returns the indexes of the days that were re-solved.
+    """
+    config = config or schedule.config or SolveConfig()
+    n_days = len(schedule.days)
+    old_final = [array('H', worked) for worked in schedule.week_worked]
+    old_seats = [schedule.day_seats(j) for j in range(n_days)]
+    old_spilled = list(schedule.spilled)
+
+    for j in reversed(range(day_index, n_days)):
+        schedule.clear_day(j)
+    for slot, emp in schedule.spilled[day_index]:
+        schedule.assign(slot, emp)
+
+    resolved = []
+    touched = set()
+    d = day_index
+    while True:
+        solve_day(schedule, d, config)
+        resolved.append(d)
+        touched.update(emp for _, emp in old_seats[d])
+        touched.update(emp for _, emp in schedule.day_seats(d))
+        d += 1
+        if d == n_days:
+            break
+        if _same_inputs(schedule, config, d, touched, old_final, old_seats, old_spilled):
+            schedule.clear_day(d)
+            for j in range(d, n_days):
+                for slot, emp in old_seats[j]:
+                    schedule.assign(slot, emp)
+            break
+    return resolved
+
+def _same_inputs(schedule, config, d, touched, old_final, old_seats, old_spilled):
+    """
+    Would days `d` onwards see the same inputs as in the previous run?
+    Only employees seated on a re-solved day can have a different count of
+    days worked in `d`'s week going into it, and from there on their count
+    moves exactly as it did before, so each of them must keep the same
+    standing against max_days/min_days on every remaining day of the week.
+    Later weeks only count their own seats, which are put back unchanged.
+    """
+    if schedule.spilled[d] != old_spilled[d]:
+        return False
+    # Rest rules tie day d's eligibility to the seats held on the day before
+    if schedule.availability is not None and schedule.availability.rest:
+        rest = schedule.availability.rest
+        if ({seat for seat in old_seats[d - 1] if seat[1] in rest}
+                != {seat for seat in schedule.day_seats(d - 1) if seat[1] in rest}):
+            return False
+    calendar = schedule.calendar
+    week = calendar.week_of[d]
+    week_end = calendar.week_end(d)
+    old_week = old_final[week]
+
+    # Days worked in the week by touched employees as each day j >= d
+    # started in the previous run: everything except the seats handed out
+    # from day j on, counting the spillover into day j as already handed out.
+    after = {emp: 0 for emp in touched}
+    old_start = {}
+    for j in reversed(range(d, week_end)):
+        for _, emp in old_seats[j]:
+            if emp in after:
+                after[emp] += 1
+        counts = dict(after)
+        for _, emp in old_spilled[j]:
+            if emp in counts:
+                counts[emp] -= 1
+        old_start[j] = counts
+
+    week_worked = schedule.week_worked[week]
+    for emp in touched:
+        shift = week_worked[emp] - (old_week[emp] - old_start[d][emp])
+        if not shift:
+            continue
+        for j in range(d, week_end):
+            old = old_week[emp] - old_start[j][emp]
+            new = old + shift
+            # The fill queue and the min-cost tie-break read exact days worked
+            if config.solver == "mincost" or len(old_seats[j]) < calendar.day_capacity(j):
+                return False
+            if config.max_days is not None and (old < config.max_days) != (new < config.max_days):
+                return False
+            # Anyone short of min_days is ordered by their exact days worked
+            if old < config.min_days or new < config.min_days:
+                return False
+    return True
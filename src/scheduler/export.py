@@ -0,0 +1,180 @@
+"""
+Machine-readable schedule exports.
+
+Every format streams long-form assignment rows, one per seat:
+
+    employee, day, shift, rank
+
+where `rank` is the preference rank the employee got (1 for a first
+choice) or empty when the shift was not one they listed. Rows are
+generated straight from the schedule's seat arrays and written as they
+are produced, so no intermediate table is built.
+
+  * csv       a header line, then one row per seat
+  * ndjson    one JSON object per line
+  * columnar  a compact binary file of fixed-width columns in row groups
+              (see write_columnar); read it back with read_columnar
+
+read_assignments reads any of them back, e.g. as the previous week for
+scheduler.warmstart.
+"""
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+
+COLUMNS = ["employee", "day", "shift", "rank"]
+COLUMNAR_MAGIC = b"SCHC\x01"
+ROW_GROUP = 65536
+_GROUP = struct.Struct("<I")
+# Columns are stored little-endian whatever the host byte order
+_SWAP = sys.byteorder == "big"
+
+def iter_assignments(schedule):
+    """Yield (employee id, day index, shift index, rank or 0) per seat in day order."""
+    roster = schedule.roster
+    n_shifts = len(schedule.shifts)
+    for d in range(len(schedule.days)):
+        pref_day = schedule.pref_index[d]
+        for s in range(n_shifts):
+            for emp in schedule.slot_ids(d * n_shifts + s):
+                ranked = roster.ranked(emp, pref_day)
+                yield emp, d, s, ranked.index(s) + 1 if s in ranked else 0
+
+def write_csv(schedule, f):
+    """Write CSV rows to a text file opened with newline=''."""
+    names = schedule.roster.names
+    days = schedule.days
+    shifts = schedule.shifts
+    writer = csv.writer(f)
+    writer.writerow(COLUMNS)
+    writer.writerows(
+        (names[emp], days[d], shifts[s], rank or "")
+        for emp, d, s, rank in iter_assignments(schedule)
+    )
+
+def write_ndjson(schedule, f):
+    """Write one JSON object per line to a text file."""
+    # Encode each distinct string once instead of once per row
+    names = {}
+    days = [json.dumps(day) for day in schedule.days]
+    shifts = [json.dumps(shift) for shift in schedule.shifts]
+    roster_names = schedule.roster.names
+    for emp, d, s, rank in iter_assignments(schedule):
+        name = names.get(emp)
+        if name is None:
+            name = names[emp] = json.dumps(roster_names[emp])
+        f.write(f'{{"employee":{name},"day":{days[d]},"shift":{shifts[s]},"rank":{rank or "null"}}}\n')
+
+def write_columnar(schedule, f):
+    """
+    Write the compact columnar format to a binary file:
+
+        magic b"SCHC\\x01", u32 header length, JSON header
+        row groups: u32 row count, then each column packed little-endian
+                    employee int32 | day uint16 | shift uint8 | rank uint8
+        a final u32 0
+
+    The header holds the dictionaries the integer columns index into
+    (`employees`, `days`, `shifts`). Row groups of up to ROW_GROUP rows
+    are flushed as they fill, so memory stays constant.
+    """
+    header = json.dumps({
+        "columns": COLUMNS,
+        "employees": schedule.roster.names,
+        "days": schedule.days,
+        "shifts": schedule.shifts,
+    }).encode()
+    f.write(COLUMNAR_MAGIC + _GROUP.pack(len(header)) + header)
+    group = _new_group()
+    for row in iter_assignments(schedule):
+        for column, value in zip(group, row):
+            column.append(value)
+        if len(group[0]) == ROW_GROUP:
+            _flush_group(f, group)
+            group = _new_group()
+    if group[0]:
+        _flush_group(f, group)
+    f.write(_GROUP.pack(0))
+
+def _new_group():
+    return [array('i'), array('H'), array('B'), array('B')]
+
+def _flush_group(f, group):
+    f.write(_GROUP.pack(len(group[0])))
+    for column in group:
+        if _SWAP and column.itemsize > 1:
+            column.byteswap()
+        f.write(column.tobytes())
+
+def read_columnar(f):
+    """
+    Read a columnar export from a binary file. Returns the header dict and
+    an iterator of (employee, day, shift, rank) rows with names resolved;
+    rank is None where the shift was not listed.
+    """
+    magic = f.read(len(COLUMNAR_MAGIC))
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar schedule export")
+    (length,) = _GROUP.unpack(f.read(_GROUP.size))
+    header = json.loads(f.read(length))
+
+    def rows():
+        names, days, shifts = header["employees"], header["days"], header["shifts"]
+        while True:
+            (count,) = _GROUP.unpack(f.read(_GROUP.size))
+            if not count:
+                return
+            group = _new_group()
+            for column in group:
+                column.frombytes(f.read(count * column.itemsize))
+                if _SWAP and column.itemsize > 1:
+                    column.byteswap()
+            for emp, d, s, rank in zip(*group):
+                yield names[emp], days[d], shifts[s], rank or None
+
+    return header, rows()
+
+def read_assignments(path, fmt=None):
+    """
+    Yield (employee, day, shift, rank) rows back from an export in any
+    format; rank is None where the shift was not listed.
+    """
+    fmt = fmt or format_for(path)
+    if fmt == "columnar":
+        with open(path, 'rb') as f:
+            _, rows = read_columnar(f)
+            yield from rows
+    elif fmt == "ndjson":
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["employee"], row["day"], row["shift"], row["rank"]
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield row["employee"], row["day"], row["shift"], int(row["rank"]) if row["rank"] else None
+
+FORMATS = {"csv": write_csv, "ndjson": write_ndjson, "columnar": write_columnar}
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".col": "columnar"}
+# (label, pattern) pairs for file dialogs
+FILE_TYPES = [("CSV", "*.csv"), ("NDJSON", "*.ndjson"), ("Columnar", "*.col")]
+
+def format_for(path):
+    """Guess the export format from a file extension (csv by default)."""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+def export(schedule, path, fmt=None):
+    """Write `schedule` to `path` in `fmt` (guessed from the extension if None)."""
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if fmt == "columnar":
+        with open(path, 'wb') as f:
+            write_columnar(schedule, f)
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            FORMATS[fmt](schedule, f)
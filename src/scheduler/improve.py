@@ -0,0 +1,265 @@
+"""
+Time-budgeted local search over a solved schedule.
+
+The greedy passes never revisit a decision, so an employee bumped by CSV
+order or by the random fill stays bumped even when a swap would give two
+people their first choices. `improve` runs simulated annealing over a
+solved schedule within a wall-clock budget, using three neighbourhoods
+that each stay within one day:
+
+  * move     an employee to an open seat on another shift
+  * swap     the shifts of two employees working that day
+  * replace  a seated employee with one who is off that day, or fill an
+             empty seat
+
+Every move is scored in O(1) from the packed preference bytes. The
+objective (lower is better) is the sum of preference ranks over all seats
+(0 for a first choice, `ranks` for an unlisted shift) plus `ranks + 1` per
+empty seat, so filling a seat always beats any preference gain.
+Replacements respect the config's max_days and never take anyone below
+min_days in the week, and no move puts anyone in a slot their availability rules
+block. The best schedule seen is returned, never a worse one.
+
+    schedule = solve(roster, SolveConfig(seed=0))
+    best, report = improve(schedule, budget_ms=200)
+    print(format_report(report))
+"""
+import math
+import random
+from array import array
+from time import perf_counter
+
+from .engine import Schedule
+from .rng import substream
+
+# Moves between clock reads and temperature updates
+CHECK_EVERY = 256
+# Attempts at drawing an employee who is off on a given day
+OFF_TRIES = 8
+
+def rank_counts(schedule):
+    """Seats at each preference rank (1st, 2nd, ..., unlisted), then empty seats."""
+    roster = schedule.roster
+    n_shifts = len(schedule.shifts)
+    counts = [0] * (roster.ranks + 2)
+    for slot in range(len(schedule.occupancy)):
+        d, s = divmod(slot, n_shifts)
+        pref_day = schedule.pref_index[d]
+        for emp in schedule.slot_ids(slot):
+            ranked = roster.ranked(emp, pref_day)
+            counts[ranked.index(s) if s in ranked else roster.ranks] += 1
+        counts[-1] += schedule.slot_capacity[slot] - schedule.occupancy[slot]
+    return counts
+
+def objective(schedule):
+    """Objective value of a schedule (see the module docstring)."""
+    counts = rank_counts(schedule)
+    return sum(rank * count for rank, count in enumerate(counts))
+
+def improve(schedule, budget_ms=200, max_iterations=None, rng=None, temperature=1.0):
+    """
+    Search for a better schedule for up to `budget_ms` milliseconds (and at
+    most `max_iterations` moves, if given). The temperature starts at
+    `temperature` rank steps and cools linearly to zero over the budget.
+    Random draws come from `rng`, or the seed of the schedule's config when
+    it has one. Returns (best schedule, report); the input is not changed.
+    """
+    config = schedule.config
+    if rng is None:
+        if config is not None and config.seed is not None:
+            rng = substream(config.seed, "improve")
+        else:
+            rng = config.rng if config is not None and config.rng is not None else random
+    randrange = rng.randrange
+    uniform = rng.random
+
+    roster = schedule.roster
+    ranks = roster.ranks
+    # find() and count() are only on bytearray, not on a cached memoryview
+    prefs = roster.prefs if isinstance(roster.prefs, bytearray) else bytearray(roster.prefs)
+    row = len(roster.days) * ranks
+    pref_offset = [pref_day * ranks for pref_day in schedule.pref_index]
+    n = len(roster)
+    n_shifts = len(schedule.shifts)
+    slot_start = schedule.slot_start
+    slot_capacity = schedule.slot_capacity
+    n_slots = len(schedule.occupancy)
+    empty_cost = ranks + 1
+    max_days = config.max_days if config is not None and config.max_days is not None else len(schedule.seats) + 1
+    min_days = config.min_days if config is not None else 0
+    availability = schedule.availability
+
+    def cost(emp, d, shift):
+        start = emp * row + pref_offset[d]
+        pos = prefs.find(shift + 1, start, start + ranks)
+        if pos < 0:
+            return ranks
+        # Ranks count listed shifts only, as Roster.ranked does
+        return pos - start - prefs.count(0, start, pos) if pos > start else 0
+
+    # Seats no longer stay packed at the front of their slot; -1 is empty
+    seats = array('i', schedule.seats)
+    seat_slot = array('i', [0]) * len(seats)
+    for slot in range(n_slots):
+        start = slot_start[slot]
+        seat_slot[start:start + slot_capacity[slot]] = array('i', [slot]) * slot_capacity[slot]
+    week_of = schedule.week_of
+    week_worked = [array('H', worked) for worked in schedule.week_worked]
+    on_day = bytearray(len(schedule.days) * n)   # seats held per day and employee
+    # Slots held by employees with rest rules, whose blocked slots move with their seats
+    held = {emp: set() for emp in availability.rest} if availability is not None else {}
+    current = 0
+    for i, emp in enumerate(seats):
+        slot = seat_slot[i]
+        d = slot // n_shifts
+        if emp < 0:
+            current += empty_cost
+        else:
+            on_day[d * n + emp] += 1
+            current += cost(emp, d, slot - d * n_shifts)
+            if emp in held:
+                held[emp].add(slot)
+    baseline = best = current
+    undo = []   # (seat, previous employee) for every change since the best state
+
+    def put(i, emp):
+        d = seat_slot[i] // n_shifts
+        old = seats[i]
+        days_worked = week_worked[week_of[d]]
+        if old >= 0:
+            days_worked[old] -= 1
+            on_day[d * n + old] -= 1
+            if old in held:
+                held[old].discard(seat_slot[i])
+        if emp >= 0:
+            days_worked[emp] += 1
+            on_day[d * n + emp] += 1
+            if emp in held:
+                held[emp].add(seat_slot[i])
+        seats[i] = emp
+        return old
+
+    def blocked(emp, slot):
+        """Do the employee's availability rules rule out `slot`?"""
+        if availability is None:
+            return False
+        mask = availability.static[emp]
+        if emp in held:
+            # Rest rules only link neighbouring days, so the seat being
+            # given up on the same day never matters here
+            mask |= availability.rest_bits(emp, held[emp])
+        return mask >> slot & 1
+
+    def off_duty(d):
+        """A random employee with no seat on day d who may take one more day, or -1."""
+        days_worked = week_worked[week_of[d]]
+        for _ in range(OFF_TRIES):
+            emp = randrange(n)
+            if not on_day[d * n + emp] and days_worked[emp] < max_days:
+                return emp
+        return -1
+
+    start_time = perf_counter()
+    budget = budget_ms / 1000
+    deadline = start_time + budget
+    iterations = accepted = 0
+    heat = temperature
+    n_seats = len(seats)
+    while n_seats and n:
+        if iterations % CHECK_EVERY == 0:
+            now = perf_counter()
+            if now >= deadline or (max_iterations is not None and iterations >= max_iterations):
+                break
+            heat = temperature * (deadline - now) / budget
+        iterations += 1
+
+        i = randrange(n_seats)
+        slot = seat_slot[i]
+        d = slot // n_shifts
+        s = slot - d * n_shifts
+        emp = seats[i]
+        if emp < 0:
+            # Fill an empty seat
+            other = off_duty(d)
+            if other < 0 or blocked(other, slot):
+                continue
+            delta = cost(other, d, s) - empty_cost
+            changes = ((i, other),)
+        elif n_shifts > 1 and uniform() < 0.5:
+            # Move to, or swap with, a seat on another shift that day
+            s2 = randrange(n_shifts - 1)
+            if s2 >= s:
+                s2 += 1
+            slot2 = slot - s + s2
+            if not slot_capacity[slot2]:
+                continue
+            j = slot_start[slot2] + randrange(slot_capacity[slot2])
+            emp2 = seats[j]
+            if emp2 == emp or blocked(emp, slot2) or (emp2 >= 0 and blocked(emp2, slot)):
+                continue
+            delta = cost(emp, d, s2) - cost(emp, d, s)
+            if emp2 >= 0:
+                delta += cost(emp2, d, s) - cost(emp2, d, s2)
+            changes = ((i, emp2), (j, emp))
+        else:
+            # Hand the seat to someone who is off that day
+            if week_worked[week_of[d]][emp] <= min_days:
+                continue
+            other = off_duty(d)
+            if other < 0 or blocked(other, slot):
+                continue
+            delta = cost(other, d, s) - cost(emp, d, s)
+            changes = ((i, other),)
+
+        if delta > 0 and (heat <= 0 or uniform() >= math.exp(-delta / heat)):
+            continue
+        accepted += 1
+        for seat, new in changes:
+            undo.append((seat, put(seat, new)))
+        current += delta
+        if current < best:
+            best = current
+            undo.clear()
+
+    # Walk back to the best state seen
+    for seat, old in reversed(undo):
+        put(seat, old)
+    elapsed = perf_counter() - start_time
+
+    improved = Schedule(roster, schedule.calendar)
+    improved.config = config
+    for slot in range(n_slots):
+        start = slot_start[slot]
+        for emp in seats[start:start + slot_capacity[slot]]:
+            if emp >= 0:
+                improved.assign(slot, emp)
+    # Keep the spillover record for seats that survived, for repair()
+    kept = {(slot, emp) for slot in range(n_slots) for emp in improved.slot_ids(slot)}
+    improved.spilled = [[seat for seat in day if seat in kept] for day in schedule.spilled]
+
+    report = {
+        "baseline": baseline,
+        "best": best,
+        "gain": baseline - best,
+        "seconds": elapsed,
+        "iterations": iterations,
+        "accepted": accepted,
+        "ranks_before": rank_counts(schedule),
+        "ranks_after": rank_counts(improved),
+    }
+    return improved, report
+
+def format_report(report):
+    """Plain-text summary of an improve() report."""
+    share = report["gain"] / report["baseline"] * 100 if report["baseline"] else 0.0
+    ranks = len(report["ranks_before"]) - 2
+    labels = [f"rank {r + 1}" for r in range(ranks)] + ["unlisted", "empty"]
+    lines = [
+        f"local search: objective {report['baseline']} -> {report['best']} "
+        f"(gain {report['gain']}, {share:.1f}%) in {report['seconds'] * 1000:.0f} ms, "
+        f"{report['iterations']} moves tried, {report['accepted']} accepted",
+        "  " + "  ".join(f"{label:>9}" for label in [""] + labels),
+        "  " + "  ".join(f"{v:>9}" for v in ["before"] + report["ranks_before"]),
+        "  " + "  ".join(f"{v:>9}" for v in ["after"] + report["ranks_after"]),
+    ]
+    return "\n".join(lines)
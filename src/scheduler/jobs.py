@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .engine import SolveConfig, solve
+from .loader import read_roster
+from .warmstart import warm_start
+
+_executor = None
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solve")
+    return _executor
+
+def submit(fn, *args):
+    """Run `fn(*args)` on the background worker thread; returns a Future."""
+    return _get_executor().submit(fn, *args)
+
+class SolveJob:
+    """
+    Read a roster CSV and solve it on a background worker thread.
+
+    GUIs poll `days_done` / `n_days` for progress and `done()` for
+    completion (e.g. from `root.after`), then call `result()` to get
+    `(roster, schedule)` or the exception the worker raised. `cancel()`
+    stops the solve at the next day boundary with SolveCancelled.
+    Pass `roster` to solve an already-loaded (possibly edited) roster
+    instead of re-reading the file, and `cache` (a ScheduleCache) to skip
+    parsing and solving inputs that were seen before. With `previous`
+    (a Schedule or assignment rows) the solve warm-starts from it, and
+    `report` holds the warm_start() report once done.
+    """
+
+    def __init__(self, csv_path, config=None, roster=None, cache=None, previous=None):
+        self.csv_path = csv_path
+        self.roster = roster
+        self.cache = cache
+        self.previous = previous
+        self.report = None
+        self.config = config or SolveConfig()
+        self.cancel_event = threading.Event()
+        self.config.progress = self._on_progress
+        self.config.cancel = self.cancel_event
+        self.days_done = 0
+        self.n_days = 0
+        self.future = _get_executor().submit(self._run)
+
+    def _run(self):
+        roster = self.roster
+        if roster is None:
+            read = self.cache.read_roster if self.cache is not None else read_roster
+            roster = read(self.csv_path, self.config.calendar)
+        self.n_days = len(self.config.calendar_for(roster).days)
+        if self.previous is not None:
+            schedule, self.report = warm_start(roster, self.previous, self.config)
+            return roster, schedule
+        if self.cache is not None:
+            return roster, self.cache.solve(roster, self.config)
+        return roster, solve(roster, self.config)
+
+    def _on_progress(self, days_done, n_days):
+        self.days_done = days_done
+        self.n_days = n_days
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
@@ -0,0 +1,163 @@
+import csv
+
+from .catalog import Calendar, Shift
+from .constraints import COLUMN, split_rules
+from .roster import DAYS, RANKS, SHIFTS, Roster
+
+# Stop memoising once this many distinct cell strings have been seen, so
+# free-text columns cannot grow the table without bound.
+MEMO_LIMIT = 4096
+
+class ShiftParser:
+    """
+    Map a cell string to a shift code (shift index + 1, 0 for none).
+    `shifts` is the shift catalog (Shift objects or plain names); a cell
+    matches the first shift in catalog order with a keyword it contains. Rosters only
+    use a handful of distinct strings such as "Morning (8:00 AM - 12:00 PM)",
+    so each one is parsed once and memoised.
+    """
+
+    def __init__(self, shifts=SHIFTS):
+        shifts = [s if isinstance(s, Shift) else Shift(s) for s in shifts]
+        self.keywords = [(keyword, i + 1) for i, shift in enumerate(shifts) for keyword in shift.keywords]
+        self.memo = {}
+
+    def match(self, cell_value):
+        value = cell_value.strip().lower()
+        for keyword, code in self.keywords:
+            if keyword in value:
+                return code
+        return 0
+
+    def __call__(self, cell_value):
+        code = self.memo.get(cell_value)
+        if code is None:
+            code = self.match(cell_value)
+            if len(self.memo) < MEMO_LIMIT:
+                self.memo[cell_value] = code
+        return code
+
+def extract_shift(cell_value, shifts=SHIFTS):
+    """
+    Extract the primary shift keyword from a human-friendly string using
+    the shift catalog. For example, "Morning (8:00 AM - 12:00 PM)" returns
+    "morning"; a cell matching no shift returns "".
+    """
+    code = ShiftParser(shifts).match(cell_value)
+    if not code:
+        return ""
+    shift = list(shifts)[code - 1]
+    return shift.name if isinstance(shift, Shift) else shift
+
+def resolve_layout(header, days=DAYS):
+    """
+    Work out the column layout once from the header row.
+    Returns the index of the `name` column and, for each day, the column
+    indexes holding its preferences in rank order. A simple `Monday` column
+    comes first, followed by ranked `Monday_1`, `Monday_2`, `Monday_3`.
+    """
+    positions = {column: i for i, column in enumerate(header)}
+    if 'name' not in positions:
+        raise ValueError("Roster CSV has no 'name' column")
+    day_columns = []
+    for day in days:
+        columns = [positions[day]] if day in positions else []
+        for rank in ['_1', '_2', '_3']:
+            if day + rank in positions:
+                columns.append(positions[day + rank])
+        day_columns.append(columns)
+    return positions['name'], day_columns
+
+class RecordParser:
+    """
+    Turn rows of a roster CSV into (name, packed preferences), with the
+    column layout resolved once from the header. The packed bytes are laid
+    out [day][rank] exactly like `Roster.prefs`. `rules(row)` reads the
+    optional `unavailable` column.
+    """
+
+    def __init__(self, header, days=DAYS, shifts=SHIFTS, ranks=RANKS):
+        self.name_col, self.day_columns = resolve_layout(header, days)
+        self.parse = ShiftParser(shifts)
+        self.ranks = ranks
+        self.width = len(days) * ranks
+        # (first packed slot, preference columns) for each day that has any
+        self.plan = [(d * ranks, columns) for d, columns in enumerate(self.day_columns) if columns]
+        self.last_col = max([self.name_col] + [max(columns) for _, columns in self.plan])
+        self.rules_col = header.index(COLUMN) if COLUMN in header else None
+
+    def day_of(self, col):
+        """Return the index of the day a column holds preferences for, or None."""
+        for d, columns in enumerate(self.day_columns):
+            if col in columns:
+                return d
+        return None
+
+    def pack(self, row):
+        if len(row) <= self.last_col:
+            row = row + [""] * (self.last_col + 1 - len(row))
+        parse = self.parse
+        memo = parse.memo
+        ranks = self.ranks
+        packed = bytearray(self.width)
+        for slot, columns in self.plan:
+            end = slot + ranks
+            for col in columns:
+                cell = row[col]
+                code = memo.get(cell)
+                if code is None:
+                    code = parse(cell)
+                if code:
+                    packed[slot] = code
+                    slot += 1
+                    if slot == end:
+                        break
+        return row[self.name_col], packed
+
+    def rules(self, row):
+        """The availability rules in a row, or [] without an `unavailable` column."""
+        if self.rules_col is None or len(row) <= self.rules_col:
+            return []
+        return split_rules(row[self.rules_col])
+
+def iter_records(csvfile, days=DAYS, shifts=SHIFTS, ranks=RANKS):
+    """
+    Lazily yield (name, packed preferences) for each row of an open CSV
+    file, so only one row is held in memory at a time.
+    """
+    reader = csv.reader(csvfile)
+    header = next(reader, None)
+    if header is None:
+        return
+    pack = RecordParser(header, days, shifts, ranks).pack
+    for row in reader:
+        if row:
+            yield pack(row)
+
+def read_roster(path, calendar=None):
+    """
+    Read a roster CSV in either the simple layout (one `Monday` column per
+    day) or the ranked layout (`Monday_1`, `Monday_2`, `Monday_3`).
+    Preference columns and shift names come from `calendar` (the standard
+    week and morning/afternoon/evening catalog by default). An optional
+    `unavailable` column holds availability rules (scheduler.constraints).
+    """
+    with open(path, 'r', newline='') as csvfile:
+        return parse_roster(csvfile, calendar)
+
+def parse_roster(csvfile, calendar=None):
+    """read_roster() for an open CSV file, or any iterable of lines."""
+    calendar = calendar or Calendar()
+    roster = Roster(calendar.roster_days, calendar.shift_names)
+    reader = csv.reader(csvfile)
+    header = next(reader, None)
+    if header is None:
+        return roster
+    parser = RecordParser(header, roster.days, calendar.shifts, roster.ranks)
+    for row in reader:
+        if row:
+            emp = roster.append(*parser.pack(row))
+            rules = parser.rules(row)
+            if rules:
+                roster.rules[emp] = rules
+    return roster
@@ -0,0 +1,97 @@
+"""
+Min-cost assignment of one day's seats.
+
+Each day is a transportation problem: employees on one side, shifts with
+their own number of seats on the other, and a cost per (employee, shift) pair taken
+from the preference rank. Because there are only a few shifts but many
+employees, successive shortest paths are run on a compressed graph whose
+nodes are the shifts themselves:
+
+  * source -> s   cheapest unseated employee for shift s
+  * s -> t        cheapest move of an employee already in s over to t
+  * s -> sink     s still has an open seat
+
+Edge weights come from lazily-cleaned heaps, so each augmentation costs
+O(shifts^2 + log n) and a day with k seats costs O(n * shifts + k * shifts^2 log n).
+The result has the maximum number of seats filled and, among those, the
+minimum total cost.
+"""
+import heapq
+from array import array
+
+_SOURCE = -1
+
+def _clean(heap, where, shift):
+    """Drop heap entries for employees no longer in `shift` (-1 = unseated)."""
+    while heap and where[heap[0][1]] != shift:
+        heapq.heappop(heap)
+    return heap[0][0] if heap else None
+
+def assign_day(costs, n, n_shifts, capacity):
+    """
+    Seat employees for one day.
+
+    `costs` is a flat sequence laid out [employee][shift], with None where
+    an employee may not take a shift, and `capacity` is the seat count of
+    every shift, or one count per shift. Returns an
+    array with the shift each employee was given, or -1 if unseated.
+    """
+    if isinstance(capacity, int):
+        capacity = [capacity] * n_shifts
+    where = array('b', [-1]) * n
+    occupancy = [0] * n_shifts
+    free = [[(cost, e) for e, cost in enumerate(costs[s::n_shifts]) if cost is not None] for s in range(n_shifts)]
+    for heap in free:
+        heapq.heapify(heap)
+    moves = [[[] for _ in range(n_shifts)] for _ in range(n_shifts)]
+
+    for _ in range(min(n, sum(capacity))):
+        # Bellman-Ford over the shift nodes
+        dist = [None] * n_shifts
+        pred = [None] * n_shifts
+        for s in range(n_shifts):
+            cost = _clean(free[s], where, -1)
+            if cost is not None:
+                dist[s] = cost
+                pred[s] = _SOURCE
+        for _ in range(n_shifts - 1):
+            changed = False
+            for s in range(n_shifts):
+                if dist[s] is None or not occupancy[s]:
+                    continue
+                for t in range(n_shifts):
+                    if t == s:
+                        continue
+                    delta = _clean(moves[s][t], where, s)
+                    if delta is not None and (dist[t] is None or dist[s] + delta < dist[t]):
+                        dist[t] = dist[s] + delta
+                        pred[t] = s
+                        changed = True
+            if not changed:
+                break
+
+        end = None
+        for t in range(n_shifts):
+            if occupancy[t] < capacity[t] and dist[t] is not None and (end is None or dist[t] < dist[end]):
+                end = t
+        if end is None:
+            break
+
+        # Walk the path back from the open seat, moving one employee per edge
+        occupancy[end] += 1
+        t = end
+        while True:
+            s = pred[t]
+            emp = (free[t] if s == _SOURCE else moves[s][t])[0][1]
+            heapq.heappop(free[t] if s == _SOURCE else moves[s][t])
+            where[emp] = t
+            base = costs[emp * n_shifts + t]
+            for u in range(n_shifts):
+                cost = costs[emp * n_shifts + u]
+                if u != t and cost is not None:
+                    heapq.heappush(moves[t][u], (cost - base, emp))
+            if s == _SOURCE:
+                break
+            t = s
+
+    return where
@@ -0,0 +1,249 @@
+"""
+PDF export of solved schedules.
+
+`write_schedule_pdf` renders the day x shift table, wrapping long name
+lists inside their cells and continuing onto new pages (with the header
+repeated) when the table outgrows one. `export_employee_pdfs` renders one
+personal schedule per employee in worker processes and streams the
+documents into a single zip as they come back.
+
+    cd src
+    python -m scheduler.pdfexport ../rosters/site.csv --out site.pdf --per-employee staff.zip --jobs 8
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from fpdf import FPDF
+
+from .engine import SOLVERS, SolveConfig, solve
+from .loader import read_roster
+
+FONT = "Arial"
+LINE_HEIGHT = 5
+PADDING = 1
+DAY_WIDTH = 32
+CHUNK_EMPLOYEES = 64
+
+def _latin1(text):
+    # The core PDF fonts only cover Latin-1
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+def _pdf_bytes(pdf):
+    data = pdf.output(dest='S')
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+def wrap(pdf, text, width):
+    """Split `text` into lines no wider than `width` in the current font."""
+    if not text:
+        return [""]
+    lines = []
+    line = ""
+    for word in text.split(" "):
+        candidate = f"{line} {word}" if line else word
+        if pdf.get_string_width(candidate) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        # A single word wider than the cell is broken between characters
+        while pdf.get_string_width(word) > width and len(word) > 1:
+            cut = len(word) - 1
+            while cut > 1 and pdf.get_string_width(word[:cut]) > width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        line = word
+    lines.append(line)
+    return lines
+
+class TablePDF(FPDF):
+    """
+    FPDF document that lays out a table with wrapped cells, breaking rows
+    across pages and repeating the header row on every page.
+    """
+
+    def __init__(self, title, headers, widths, orientation="P"):
+        super().__init__(orientation=orientation, unit="mm", format="A4")
+        self.set_auto_page_break(False)
+        self.set_margins(10, 10)
+        self.title_text = _latin1(title)
+        self.headers = [_latin1(h) for h in headers]
+        self.widths = widths
+        self.bottom = self.h - 10
+        self.new_page()
+
+    def new_page(self):
+        self.add_page()
+        if self.page_no() == 1:
+            self.set_font(FONT, 'B', 14)
+            self.cell(0, 10, self.title_text, ln=True, align='C')
+            self.ln(2)
+        self.set_font(FONT, 'B', 10)
+        self.draw_row([[h] for h in self.headers])
+        self.set_font(FONT, '', 10)
+        self.body_top = self.get_y()
+        self.page_room = self.room()
+
+    def room(self):
+        """Lines of text that still fit in a row on this page."""
+        return int((self.bottom - self.get_y() - 2 * PADDING) // LINE_HEIGHT)
+
+    def draw_row(self, cells):
+        """Draw one row of pre-wrapped cells at the current position."""
+        height = max(len(lines) for lines in cells) * LINE_HEIGHT + 2 * PADDING
+        x = self.l_margin
+        y = self.get_y()
+        for width, lines in zip(self.widths, cells):
+            self.rect(x, y, width, height)
+            for i, line in enumerate(lines):
+                self.set_xy(x + PADDING, y + PADDING + i * LINE_HEIGHT)
+                self.cell(width - 2 * PADDING, LINE_HEIGHT, line)
+            x += width
+        self.set_xy(self.l_margin, y + height)
+
+    def add_row(self, values):
+        """Wrap and draw a row, splitting it over as many pages as it needs."""
+        cells = [wrap(self, _latin1(value), width - 2 * PADDING) for width, value in zip(self.widths, values)]
+        while True:
+            room = self.room()
+            needed = max(len(lines) for lines in cells)
+            if needed <= room:
+                self.draw_row(cells)
+                return
+            if self.get_y() > self.body_top and needed <= self.page_room:
+                # The row fits on a page of its own, so move it rather than split it
+                self.new_page()
+                continue
+            self.draw_row([lines[:room] for lines in cells])
+            cells = [lines[room:] or [""] for lines in cells]
+            self.new_page()
+
+def schedule_document(schedule, title="Final Schedule"):
+    """Build the day x shift table for a whole schedule."""
+    n_shifts = len(schedule.shifts)
+    orientation = "L" if n_shifts > 3 else "P"
+    usable = (297 if orientation == "L" else 210) - 20 - DAY_WIDTH
+    widths = [DAY_WIDTH] + [usable / n_shifts] * n_shifts
+    headers = ["Day"] + [shift.label for shift in schedule.calendar.shifts]
+    pdf = TablePDF(title, headers, widths, orientation)
+    for row in schedule.rows():
+        pdf.add_row(row)
+    return pdf
+
+def write_schedule_pdf(schedule, path, title="Final Schedule"):
+    """Write the schedule table to `path`; returns the number of pages."""
+    pdf = schedule_document(schedule, title)
+    pdf.output(path)
+    return pdf.page_no()
+
+def employee_rows(schedule):
+    """
+    Each employee's (name, [(day, shift label), ...]) in one pass over the
+    seats; days without a seat are listed as "Off".
+    """
+    n_shifts = len(schedule.shifts)
+    labels = [shift.label for shift in schedule.calendar.shifts]
+    worked = [[] for _ in range(len(schedule.roster))]
+    for d in range(len(schedule.days)):
+        for s in range(n_shifts):
+            for emp in schedule.slot_ids(d * n_shifts + s):
+                worked[emp].append((d, labels[s]))
+    rows = []
+    for emp, seats in enumerate(worked):
+        by_day = {}
+        for d, label in seats:
+            by_day.setdefault(d, []).append(label)
+        rows.append((schedule.roster.names[emp], [
+            (day, ", ".join(by_day.get(d, ["Off"]))) for d, day in enumerate(schedule.days)
+        ]))
+    return rows
+
+def employee_pdf(name, days):
+    """Render one employee's schedule; returns (pdf bytes, pages)."""
+    pdf = TablePDF(f"Schedule for {name}", ["Day", "Shift"], [60, 130])
+    for day, shifts in days:
+        pdf.add_row([day, shifts])
+    return _pdf_bytes(pdf), pdf.page_no()
+
+def _file_name(index, name):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "employee"
+    return f"{index + 1:05d}_{slug}.pdf"
+
+def _render_chunk(chunk):
+    """Worker entry point: render a list of (index, name, days)."""
+    return [(_file_name(index, name),) + employee_pdf(name, days) for index, name, days in chunk]
+
+def export_employee_pdfs(schedule, zip_path, jobs=None, progress=None):
+    """
+    Write one PDF per employee into `zip_path`, rendering in `jobs` worker
+    processes (in-process when jobs is 1). Documents are written to the zip
+    in roster order as their chunks complete, rather than collected first.
+    `progress(done, total)` is called after each chunk.
+    Returns the total number of pages.
+    """
+    return write_employee_pdfs(employee_rows(schedule), zip_path, jobs, progress)
+
+def write_employee_pdfs(rows, zip_path, jobs=None, progress=None):
+    """
+    `export_employee_pdfs` from rows already taken with `employee_rows`, so
+    a GUI can snapshot the schedule on its own thread and render elsewhere.
+    """
+    chunks = [
+        [(index, name, days) for index, (name, days) in enumerate(rows[start:start + CHUNK_EMPLOYEES], start)]
+        for start in range(0, len(rows), CHUNK_EMPLOYEES)
+    ]
+    pages = 0
+    done = 0
+    # PDF content streams are already compressed, so the zip just stores them
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as archive:
+        if jobs == 1:
+            results = map(_render_chunk, chunks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = executor.map(_render_chunk, chunks)
+        try:
+            for rendered in results:
+                for file_name, data, n_pages in rendered:
+                    archive.writestr(file_name, data)
+                    pages += n_pages
+                done += len(rendered)
+                if progress is not None:
+                    progress(done, len(rows))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    return pages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a roster's schedule as PDF.")
+    parser.add_argument("roster", help="roster CSV")
+    parser.add_argument("--out", help="schedule table PDF to write")
+    parser.add_argument("--per-employee", metavar="ZIP", help="zip of one PDF per employee to write")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes for --per-employee")
+    parser.add_argument("--solver", choices=SOLVERS, default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not args.out and not args.per_employee:
+        parser.error("nothing to do: pass --out and/or --per-employee")
+
+    schedule = solve(read_roster(args.roster), SolveConfig(solver=args.solver, seed=args.seed))
+    if args.out:
+        start = time.perf_counter()
+        pages = write_schedule_pdf(schedule, args.out)
+        print(f"wrote {args.out}: {pages} pages in {time.perf_counter() - start:.2f}s")
+    if args.per_employee:
+        start = time.perf_counter()
+        pages = export_employee_pdfs(schedule, args.per_employee, args.jobs)
+        elapsed = time.perf_counter() - start
+        print(f"wrote {args.per_employee}: {len(schedule.roster)} documents, {pages} pages "
+              f"in {elapsed:.2f}s ({pages / elapsed:.0f} pages/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Opt-in instrumentation of the per-day solve.
+
+Pass a Profiler as `SolveConfig(profiler=...)` and every solved day records
+the wall time of each phase along with its counters: seats filled,
+spillovers into the next day, random fills and the preference ranks
+achieved. Without a profiler the solvers only test `config.profiler is
+None` once per phase, so there is nothing to pay when it is off.
+
+    profiler = Profiler()
+    solve(roster, SolveConfig(profiler=profiler))
+    print(profiler.report())
+    profiler.write("trace.json")      # chrome://tracing, Perfetto or speedscope
+    profiler.write("solve.folded")    # flamegraph.pl / inferno
+"""
+import json
+from time import perf_counter
+
+class Profiler:
+    """
+    Collects `events` (one per phase per day) and `days` (one summary per
+    solved day). Repairs that re-solve a day add to both, so a profiler can
+    be kept for a whole editing session.
+    """
+
+    def __init__(self):
+        self.origin = perf_counter()
+        self.events = []
+        self.days = []
+        self._schedule = None
+
+    # Hooks called by the solvers
+
+    def begin(self, schedule, day_index):
+        self._schedule = schedule
+        self._day = day_index
+        self._counters = {}
+        self._phase_seats = {}
+        self._day_start = self._last = perf_counter()
+        self._seats = self._filled()
+
+    def lap(self, phase, **counters):
+        """Close the phase that has been running since the previous lap."""
+        now = perf_counter()
+        seats = self._filled()
+        counters["seats"] = seats - self._seats
+        self.events.append({
+            "day": self._schedule.days[self._day],
+            "phase": phase,
+            "start": self._last - self.origin,
+            "seconds": now - self._last,
+            "counters": counters,
+        })
+        self._phase_seats[phase] = counters["seats"]
+        for key, value in counters.items():
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._seats = seats
+        self._last = now
+
+    def end(self):
+        schedule = self._schedule
+        roster = schedule.roster
+        ranks = [0] * (roster.ranks + 1)
+        pref_day = schedule.pref_index[self._day]
+        n_shifts = len(schedule.shifts)
+        for slot, emp in schedule.day_seats(self._day):
+            ranked = roster.ranked(emp, pref_day)
+            shift = slot % n_shifts
+            ranks[ranked.index(shift) if shift in ranked else roster.ranks] += 1
+        self.days.append({
+            "day": schedule.days[self._day],
+            "start": self._day_start - self.origin,
+            "seconds": perf_counter() - self._day_start,
+            "ranks": ranks,
+            "phase_seats": self._phase_seats,
+            **self._counters,
+        })
+        self._schedule = None
+
+    def _filled(self):
+        n_shifts = len(self._schedule.shifts)
+        base = self._day * n_shifts
+        return sum(self._schedule.occupancy[base:base + n_shifts])
+
+    # Reports
+
+    def phases(self):
+        """Totals per phase: {phase: {"seconds": s, "seats": n, ...}}, in first-seen order."""
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event["phase"], {"seconds": 0.0})
+            total["seconds"] += event["seconds"]
+            for key, value in event["counters"].items():
+                total[key] = total.get(key, 0) + value
+        return totals
+
+    def report(self):
+        """Plain-text per-day and per-phase summary."""
+        totals = self.phases()
+        lines = [f"{'day':<20} {'ms':>8} " + " ".join(f"{p:>12}" for p in totals) + "   ranks (1st, 2nd, ..., unlisted)"]
+        for day in self.days:
+            lines.append(f"{day['day'][:20]:<20} {day['seconds'] * 1000:>8.2f} "
+                         + " ".join(f"{day['phase_seats'].get(p, 0):>12}" for p in totals)
+                         + "   " + ", ".join(str(n) for n in day["ranks"]))
+        lines.append("")
+        lines.append(f"{'phase':<20} {'ms':>8} {'seats':>8} {'spilled':>8}")
+        for phase, total in totals.items():
+            lines.append(f"{phase:<20} {total['seconds'] * 1000:>8.2f} {total['seats']:>8} {total.get('spilled', 0):>8}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format: one complete event per day with its phases nested inside."""
+        events = [
+            {"name": day["day"], "cat": "day", "ph": "X", "pid": 1, "tid": 1,
+             "ts": day["start"] * 1e6, "dur": day["seconds"] * 1e6,
+             "args": {key: value for key, value in day.items() if key not in ("day", "start", "seconds")}}
+            for day in self.days
+        ]
+        events.extend(
+            {"name": event["phase"], "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+             "ts": event["start"] * 1e6, "dur": event["seconds"] * 1e6, "args": event["counters"]}
+            for event in self.events
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def folded(self):
+        """Folded stacks (`solve;day;phase microseconds`) for flamegraph tools."""
+        weights = {}
+        for event in self.events:
+            stack = f"solve;{event['day']};{event['phase']}".replace(" ", "_")
+            weights[stack] = weights.get(stack, 0) + event["seconds"]
+        return "".join(f"{stack} {max(1, round(seconds * 1e6))}\n" for stack, seconds in weights.items())
+
+    def write(self, path):
+        """Write a Chrome trace (.json) or folded stacks (any other extension)."""
+        with open(path, 'w') as f:
+            if path.lower().endswith(".json"):
+                json.dump(self.chrome_trace(), f)
+            else:
+                f.write(self.folded())
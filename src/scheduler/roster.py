@@ -0,0 +1,127 @@
+import sys
+
+# Global definitions for days and shifts
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SHIFTS = ["morning", "afternoon", "evening"]
+RANKS = 3
+
+class Employee:
+    """
+    View of one roster row, as returned by `roster[emp]`. It holds only the
+    roster and the id, and reads names and preferences from the roster's
+    shared tables when asked.
+    """
+
+    __slots__ = ("roster", "id")
+
+    def __init__(self, roster, emp):
+        self.roster = roster
+        self.id = emp
+
+    def __repr__(self):
+        return f"Employee({self.id}, {self.name!r})"
+
+    @property
+    def name(self):
+        return self.roster.names[self.id]
+
+    @property
+    def preferences(self):
+        """{day: [shift, ...]} in rank order, the layout the scripts used to keep per employee."""
+        roster = self.roster
+        return {day: [roster.shifts[s] for s in roster.ranked(self.id, d)] for d, day in enumerate(roster.days)}
+
+    @property
+    def rules(self):
+        return self.roster.rules.get(self.id, [])
+
+    def ranked(self, day_index):
+        """Shift indexes asked for on a day, best first."""
+        return self.roster.ranked(self.id, day_index)
+
+class Roster:
+    """
+    Employees indexed by integer id (their position in the CSV).
+
+    Names are interned and held once, in `names`, with `index` mapping each
+    back to its id; `roster[emp]` gives an Employee view of one row.
+    Ranked preferences live in one flat bytearray laid out as
+    [employee][day][rank]; each byte is a shift index + 1, with 0 meaning
+    "no preference" for that rank. `rules` maps an employee id to their
+    availability rules (see scheduler.constraints), for those who have any.
+    """
+
+    def __init__(self, days=DAYS, shifts=SHIFTS, ranks=RANKS):
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.ranks = ranks
+        self.names = []
+        self.index = {}
+        self.prefs = bytearray()
+        self.rules = {}
+        self._shift_codes = {shift: i + 1 for i, shift in enumerate(self.shifts)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, emp):
+        if not -len(self.names) <= emp < len(self.names):
+            raise IndexError(f"No employee {emp}")
+        return Employee(self, emp % len(self.names))
+
+    def copy(self):
+        """An independent copy: edits to either roster do not reach the other."""
+        other = Roster(self.days, self.shifts, self.ranks)
+        other.names = list(self.names)
+        other.index = dict(self.index)
+        other.prefs = bytearray(self.prefs)
+        other.rules = {emp: list(rules) for emp, rules in self.rules.items()}
+        return other
+
+    def add(self, name, preferences):
+        """
+        Add an employee with preferences given as {day: [shift, ...]}.
+        A repeated name replaces the earlier preferences but keeps its id,
+        matching how the old per-script dicts behaved.
+        """
+        row = bytearray(len(self.days) * self.ranks)
+        for d, day in enumerate(self.days):
+            codes = [self._shift_codes[s] for s in preferences.get(day, []) if s in self._shift_codes]
+            row[d * self.ranks:d * self.ranks + len(codes[:self.ranks])] = bytes(codes[:self.ranks])
+        return self.append(name, row)
+
+    def append(self, name, packed):
+        """Add an employee whose preferences are already packed [day][rank]."""
+        emp = self.index.get(name)
+        if emp is None:
+            name = sys.intern(name)
+            emp = len(self.names)
+            self.index[name] = emp
+            self.names.append(name)
+            if not isinstance(self.prefs, bytearray):
+                # Loaded from the cache as a fixed-size view of the mapped file
+                self.prefs = bytearray(self.prefs)
+            self.prefs.extend(packed)
+        else:
+            start = emp * len(self.days) * self.ranks
+            self.prefs[start:start + len(packed)] = packed
+        return emp
+
+    def set_day(self, emp, day_index, codes):
+        """Replace one day's packed shift codes (shift index + 1) for an employee."""
+        start = (emp * len(self.days) + day_index) * self.ranks
+        row = bytes(codes[:self.ranks])
+        self.prefs[start:start + self.ranks] = row + bytes(self.ranks - len(row))
+
+    def rename(self, emp, name):
+        """Give an employee a new display name, keeping their id."""
+        name = sys.intern(name)
+        if self.index.get(self.names[emp]) == emp:
+            del self.index[self.names[emp]]
+        self.index.setdefault(name, emp)
+        self.names[emp] = name
+
+    def ranked(self, emp, day_index):
+        """Return the ranked shift indexes an employee asked for on a day."""
+        start = (emp * len(self.days) + day_index) * self.ranks
+        return [code - 1 for code in self.prefs[start:start + self.ranks] if code]
@@ -0,0 +1,249 @@
+"""
+What-if scenarios: one parsed roster, many patched variants solved in
+parallel and compared side by side.
+
+A scenario is a small overlay on the base roster and calendar:
+
+    [
+      {"name": "weekend x3", "capacity": {"Saturday": 3, "Sunday": 3}},
+      {"name": "Bob out",    "remove": ["Bob"]},
+      {"name": "Alice AM",   "preferences": {"Alice": {"Monday": ["morning"], "Tuesday": ["morning"]}},
+                             "unavailable": {"Carol": ["evening"]}}
+    ]
+
+`capacity` takes the calendar's capacity spec and overrides only the
+slots it names. `remove` takes employees out of the week, `preferences`
+replaces their ranked shifts on the days given, and `unavailable` adds
+availability rules (scheduler.constraints), as a list or a ";" string.
+A patched roster shares the base's names and index, and its preference
+bytes too unless the scenario rewrites some, so nothing is re-parsed or
+copied per scenario beyond what it changes. Removed employees stay on the roster with every day
+blocked, so employee ids are the same in every variant.
+
+`run_scenarios` solves the base and every scenario in worker processes.
+The base roster reaches each worker once, through the pool initializer:
+inherited copy-on-write where processes fork, pickled once per worker
+elsewhere. Only the patches travel with each task, and only the metrics
+come back. Give the config a seed so every variant sees the same random
+draws and the differences come from the patches alone.
+
+    cd src
+    python -m scheduler.scenarios ../rosters/site.csv what-if.json --seed 0
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .catalog import Calendar
+from .constraints import split_rules
+from .engine import SOLVERS, SolveConfig, solve
+from .improve import rank_counts
+from .loader import read_roster
+
+_base = None   # (roster, calendar) shared with a worker process by _share
+
+class Scenario:
+    """One named overlay; see the module docstring for the fields."""
+
+    def __init__(self, name, capacity=None, remove=(), preferences=None, unavailable=None):
+        self.name = name
+        self.capacity = capacity
+        self.remove = list(remove)
+        self.preferences = preferences or {}
+        self.unavailable = unavailable or {}
+
+    @classmethod
+    def from_spec(cls, spec):
+        unknown = set(spec) - {"name", "capacity", "remove", "preferences", "unavailable"}
+        if unknown:
+            raise ValueError(f"Unknown scenario field(s): {', '.join(sorted(unknown))}")
+        return cls(spec.get("name", "scenario"), spec.get("capacity"), spec.get("remove", ()),
+                   spec.get("preferences"), spec.get("unavailable"))
+
+    def apply(self, roster, calendar):
+        """(roster, calendar) with the patches applied, sharing whatever they leave alone."""
+        if self.capacity is not None:
+            calendar = calendar.with_capacity(self.capacity)
+        if not (self.remove or self.preferences or self.unavailable):
+            return roster, calendar
+        patched = copy.copy(roster)
+        if self.preferences:
+            patched.prefs = bytearray(roster.prefs)
+            for name, days in self.preferences.items():
+                emp = _employee(roster, name)
+                for day, shifts in days.items():
+                    if day not in roster.days:
+                        raise ValueError(f"Scenario {self.name!r}: unknown day {day!r}")
+                    unknown = [shift for shift in shifts if shift not in roster.shifts]
+                    if unknown:
+                        raise ValueError(f"Scenario {self.name!r}: unknown shift {unknown[0]!r}")
+                    patched.set_day(emp, roster.days.index(day), [roster.shifts.index(s) + 1 for s in shifts])
+        if self.remove or self.unavailable:
+            patched.rules = dict(roster.rules)
+            for name, rules in self.unavailable.items():
+                emp = _employee(roster, name)
+                rules = split_rules(rules) if isinstance(rules, str) else list(rules)
+                patched.rules[emp] = patched.rules.get(emp, []) + rules
+            for name in self.remove:
+                emp = _employee(roster, name)
+                # A rule per preference day blocks every day of the horizon
+                patched.rules[emp] = patched.rules.get(emp, []) + list(roster.days)
+        return patched, calendar
+
+def _employee(roster, name):
+    emp = roster.index.get(name)
+    if emp is None:
+        raise ValueError(f"No employee named {name!r} on the roster")
+    return emp
+
+def load_scenarios(path):
+    """Scenarios from a JSON file holding a list of scenario specs."""
+    with open(path) as f:
+        specs = json.load(f)
+    if not isinstance(specs, list):
+        raise ValueError("Scenario file must hold a JSON list")
+    return [Scenario.from_spec(spec) for spec in specs]
+
+def metrics(schedule, removed=()):
+    """
+    Coverage and preference satisfaction of a solved schedule. Days-worked
+    figures leave out removed employees.
+    """
+    counts = rank_counts(schedule)
+    empty = counts.pop()
+    filled = sum(counts)
+    removed = {schedule.roster.index[name] for name in removed}
+    worked = [w for emp, w in enumerate(schedule.days_worked) if emp not in removed]
+    return {
+        "seats": filled + empty,
+        "filled": filled,
+        "coverage": filled / (filled + empty) if filled + empty else 1.0,
+        "empty": empty,
+        "rank_counts": counts,
+        "first_choice": counts[0] / filled if filled else 0.0,
+        "listed": sum(counts[:-1]) / filled if filled else 0.0,
+        "mean_rank": (sum(rank * n for rank, n in enumerate(counts)) / filled + 1) if filled else 0.0,
+        "working": sum(1 for w in worked if w),
+        "days_min": min(worked, default=0),
+        "days_max": max(worked, default=0),
+    }
+
+def _share(roster, calendar):
+    """Pool initializer: keep the base roster for every task in this worker."""
+    global _base
+    _base = (roster, calendar)
+
+def _solve_scenario(scenario, options):
+    """Worker: apply one scenario to the shared base, solve it and score it."""
+    start = time.perf_counter()
+    roster, calendar = scenario.apply(*_base)
+    schedule = solve(roster, SolveConfig(calendar=calendar, **options))
+    return {"name": scenario.name, "metrics": metrics(schedule, scenario.remove),
+            "seconds": time.perf_counter() - start}
+
+def run_scenarios(roster, scenarios, config=None, jobs=None, progress=None):
+    """
+    Solve the unpatched base and each scenario, in `jobs` worker processes
+    (in-process when jobs is 1). Returns one {"name", "metrics", "seconds"}
+    dict per variant, base first, in the order given. Only the config's
+    solver, limits, seed, capacity and calendar carry over; `progress(done,
+    total)` is called as variants finish.
+    """
+    config = config or SolveConfig()
+    calendar = config.calendar_for(roster)
+    options = {"solver": config.solver, "max_days": config.max_days, "min_days": config.min_days,
+               "seed": config.seed, "capacity": config.capacity}
+    variants = [Scenario("base")] + list(scenarios)
+    # Bad patches fail here, before any worker starts
+    for scenario in variants:
+        scenario.apply(roster, calendar)
+
+    results = [None] * len(variants)
+    if jobs == 1 or len(variants) == 1:
+        _share(roster, calendar)
+        try:
+            for i, scenario in enumerate(variants):
+                results[i] = _solve_scenario(scenario, options)
+                if progress is not None:
+                    progress(i + 1, len(variants))
+        finally:
+            _share(None, None)
+        return results
+
+    workers = min(jobs or os.cpu_count() or 1, len(variants))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_share, initargs=(roster, calendar)) as executor:
+        futures = {executor.submit(_solve_scenario, scenario, options): i for i, scenario in enumerate(variants)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(variants))
+    return results
+
+# (label, metric key, format) rows of the comparison table
+ROWS = [
+    ("seats", "seats", "{}"),
+    ("filled", "filled", "{}"),
+    ("coverage", "coverage", "{:.1%}"),
+    ("empty seats", "empty", "{}"),
+    ("1st choice", "first_choice", "{:.1%}"),
+    ("any listed", "listed", "{:.1%}"),
+    ("mean rank", "mean_rank", "{:.2f}"),
+    ("working", "working", "{}"),
+    ("days min-max", None, None),
+]
+
+def comparison_rows(results):
+    """[label, value per variant...] rows comparing run_scenarios() results."""
+    rows = []
+    for label, key, fmt in ROWS:
+        if key is None:
+            values = [f"{r['metrics']['days_min']}-{r['metrics']['days_max']}" for r in results]
+        else:
+            values = [fmt.format(r["metrics"][key]) for r in results]
+        rows.append([label] + values)
+    return rows
+
+def format_comparison(results):
+    """Plain-text side-by-side table of run_scenarios() results."""
+    header = [""] + [r["name"] for r in results]
+    rows = [header] + comparison_rows(results)
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(header))]
+    return "\n".join("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve what-if variants of a roster and compare them.")
+    parser.add_argument("roster", help="roster CSV")
+    parser.add_argument("scenarios", help="JSON list of scenarios (see the module docstring)")
+    parser.add_argument("--seed", type=int, default=0, help="seed shared by every variant")
+    parser.add_argument("--solver", choices=SOLVERS, default="greedy")
+    parser.add_argument("--max-days", type=int, default=5)
+    parser.add_argument("--min-days", type=int, default=0)
+    parser.add_argument("--calendar", help="JSON calendar with the days, shift catalog and capacities")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    calendar = Calendar.load(args.calendar) if args.calendar else None
+    config = SolveConfig(solver=args.solver, max_days=args.max_days, min_days=args.min_days,
+                         seed=args.seed, calendar=calendar)
+    try:
+        roster = read_roster(args.roster, calendar)
+        scenarios = load_scenarios(args.scenarios)
+        start = time.perf_counter()
+        results = run_scenarios(roster, scenarios, config, args.jobs)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Failed to run scenarios: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_comparison(results))
+    print(f"{len(results)} variants in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
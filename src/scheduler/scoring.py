@@ -0,0 +1,152 @@
+"""
+Batched scoring of candidate schedules.
+
+A Scorer turns a roster into an employees x days x shifts int8 tensor of
+preference ranks (0 for a first choice, `ranks` for an unlisted shift),
+once. Each candidate schedule becomes an employees x days int8 assignment
+(the shift worked, -1 for a day off), and `score` evaluates a whole stack
+of them in one vectorized pass:
+
+  * filled         seats filled
+  * rank_share     fraction of seats at each rank (1st, 2nd, ..., unlisted)
+  * gaps           seats left empty against the calendar's capacity
+  * days_variance  variance of days worked per employee
+
+NumPy is used when it is installed; otherwise the same numbers are
+computed with plain loops over `array` buffers.
+
+    scorer = Scorer(roster)
+    scores = scorer.score([solve(roster, SolveConfig(seed=s)) for s in range(1000)])
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .catalog import Calendar
+
+class Scorer:
+    """
+    Scores candidate schedules of one roster on one calendar. Pass
+    `use_numpy=False` to force the pure-Python path. The solvers seat an
+    employee at most once a day, so one shift per employee-day is enough.
+    """
+
+    def __init__(self, roster, calendar=None, use_numpy=True):
+        self.calendar = calendar or Calendar(roster.days, roster.shifts)
+        self.numpy = use_numpy and np is not None
+        self.n_employees = len(roster)
+        self.n_days = len(self.calendar.days)
+        self.n_shifts = len(self.calendar.shifts)
+        self.ranks = roster.ranks
+        pref_index = [roster.days.index(day) for day in self.calendar.pref_days]
+        if self.numpy:
+            self.rank_table = self._numpy_ranks(roster, pref_index)
+            self.capacity = np.frombuffer(self.calendar.slot_capacity, dtype=np.uint16).reshape(self.n_days, self.n_shifts)
+        else:
+            self.rank_table = self._python_ranks(roster, pref_index)
+            self.capacity = self.calendar.slot_capacity
+
+    def _numpy_ranks(self, roster, pref_index):
+        codes = np.frombuffer(bytes(roster.prefs), dtype=np.uint8).reshape(len(roster), len(roster.days), roster.ranks)
+        codes = codes[:, pref_index, :]
+        table = np.full((self.n_employees, self.n_days, self.n_shifts), self.ranks, dtype=np.int8)
+        # Blank ranks are skipped, as in Roster.ranked: a shift's rank is its
+        # place among the shifts actually listed that day
+        listed = np.cumsum(codes != 0, axis=2, dtype=np.int8) - 1
+        # Lower ranks are written last so a shift listed twice keeps its best rank
+        for rank in reversed(range(self.ranks)):
+            emp, day = np.nonzero(codes[:, :, rank])
+            table[emp, day, codes[emp, day, rank].astype(np.intp) - 1] = listed[emp, day, rank]
+        return table
+
+    def _python_ranks(self, roster, pref_index):
+        table = array('b', [self.ranks]) * (self.n_employees * self.n_days * self.n_shifts)
+        for emp in range(self.n_employees):
+            for d, pref_day in enumerate(pref_index):
+                base = (emp * self.n_days + d) * self.n_shifts
+                for rank, shift in reversed(list(enumerate(roster.ranked(emp, pref_day)))):
+                    table[base + shift] = rank
+        return table
+
+    def assignment(self, schedule):
+        """One schedule as an employees x days int8 assignment (-1 = off)."""
+        n_shifts = self.n_shifts
+        if self.numpy:
+            seats = np.frombuffer(schedule.seats, dtype=np.int32)
+            slots = np.repeat(np.arange(len(schedule.occupancy)), np.frombuffer(schedule.slot_capacity, dtype=np.uint16))
+            position = np.arange(len(seats)) - np.frombuffer(schedule.slot_start, dtype=np.uint32)[slots]
+            taken = position < np.frombuffer(schedule.occupancy, dtype=np.uint16)[slots]
+            result = np.full((self.n_employees, self.n_days), -1, dtype=np.int8)
+            result[seats[taken], slots[taken] // n_shifts] = slots[taken] % n_shifts
+            return result
+        result = array('b', [-1]) * (self.n_employees * self.n_days)
+        for slot in range(len(schedule.occupancy)):
+            for emp in schedule.slot_ids(slot):
+                result[emp * self.n_days + slot // n_shifts] = slot % n_shifts
+        return result
+
+    def stack(self, candidates):
+        """A candidates x employees x days tensor from schedules (or ready assignments)."""
+        assignments = [c if not hasattr(c, "seats") else self.assignment(c) for c in candidates]
+        if self.numpy:
+            return np.stack(assignments) if assignments else np.empty((0, self.n_employees, self.n_days), dtype=np.int8)
+        return assignments
+
+    def score(self, candidates):
+        """
+        Score a list of schedules or assignments, or an already stacked
+        tensor. Every metric is a sequence with one entry per candidate.
+        """
+        if self.numpy:
+            tensor = candidates if isinstance(candidates, np.ndarray) else self.stack(candidates)
+            return self._score_numpy(tensor)
+        return self._score_python(self.stack(candidates))
+
+    def _score_numpy(self, tensor):
+        n = len(tensor)
+        n_ranks = self.ranks + 1
+        n_days, n_shifts = self.n_days, self.n_shifts
+        # Work on the seated cells only; most of the tensor is days off
+        flat = tensor.reshape(n, self.n_employees * n_days)
+        candidate, cell = np.nonzero(flat >= 0)
+        shift = flat[candidate, cell].astype(np.intp)
+        rank = self.rank_table.reshape(-1)[cell * n_shifts + shift]
+
+        filled = np.bincount(candidate, minlength=n)
+        counts = np.bincount(candidate * n_ranks + rank, minlength=n * n_ranks).reshape(n, n_ranks)
+        slot = (candidate * n_days + cell % n_days) * n_shifts + shift
+        occupancy = np.bincount(slot, minlength=n * n_days * n_shifts).reshape(n, n_days, n_shifts)
+        gaps = np.maximum(self.capacity[None].astype(np.int64) - occupancy, 0).sum(axis=(1, 2))
+        worked = np.bincount(candidate * self.n_employees + cell // n_days, minlength=n * self.n_employees)
+        worked = worked.reshape(n, self.n_employees)
+        return {
+            "filled": filled,
+            "rank_share": counts / np.maximum(filled, 1)[:, None],
+            "gaps": gaps,
+            "days_variance": worked.var(axis=1) if self.n_employees else np.zeros(n),
+        }
+
+    def _score_python(self, assignments):
+        n_days, n_shifts = self.n_days, self.n_shifts
+        table = self.rank_table
+        scores = {"filled": [], "rank_share": [], "gaps": [], "days_variance": []}
+        for assigned in assignments:
+            counts = [0] * (self.ranks + 1)
+            occupancy = [0] * (n_days * n_shifts)
+            worked = [0] * self.n_employees
+            for i, shift in enumerate(assigned):
+                if shift < 0:
+                    continue
+                counts[table[i * n_shifts + shift]] += 1
+                occupancy[i % n_days * n_shifts + shift] += 1
+                worked[i // n_days] += 1
+            filled = sum(counts)
+            mean = sum(worked) / len(worked) if worked else 0.0
+            scores["filled"].append(filled)
+            scores["rank_share"].append([count / max(filled, 1) for count in counts])
+            scores["gaps"].append(sum(max(cap - occ, 0) for cap, occ in zip(self.capacity, occupancy)))
+            scores["days_variance"].append(sum((w - mean) ** 2 for w in worked) / len(worked) if worked else 0.0)
+        return scores
@@ -0,0 +1,331 @@
+"""
+Local HTTP/JSON scheduling service.
+
+Other tools POST a roster and get its schedule back, without starting a
+Python process or re-parsing the CSV on every call:
+
+    cd src
+    python -m scheduler.service --port 8765 --jobs 4
+
+    POST /solve    {"roster": "<CSV text>", "seed": 0, "solver": "greedy",
+                    "max_days": 5, "min_days": 0, "calendar": {...}}
+               ->  {"schedule": {day: {shift: [names]}}, "filled": 42, "seats": 42,
+                    "roster_cached": true, "coalesced": false, "ms": 3.1}
+    GET  /metrics  queue depth, cache counters and request latency percentiles
+    GET  /health
+
+`calendar` takes the same spec as a `--calendar` JSON file. Parsing and
+solving run in a bounded ProcessPoolExecutor. Parsed rosters are kept in
+an LRU keyed by the CSV's SHA-256 and the calendar, so a roster seen
+before is only sent to a worker to be solved. Identical requests arriving
+while one is in progress wait for its result instead of starting their
+own: always for parsing, and for solving when a seed makes the result
+deterministic. Once --max-queue pool tasks are outstanding, new work is
+turned away with 503. SIGTERM or SIGINT stops the server and shuts the
+worker processes down before it exits.
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from .batch import percentile
+from .cache import calendar_key
+from .catalog import Calendar
+from .engine import SOLVERS, SolveConfig, solve
+from .loader import parse_roster
+
+MAX_BODY = 64 * 1024 * 1024
+LATENCY_WINDOW = 4096
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _parse(text, calendar):
+    """Worker: parse roster CSV text."""
+    return parse_roster(io.StringIO(text, newline=''), calendar)
+
+def _solve(roster, calendar, options):
+    """Worker: solve and return the JSON-ready result."""
+    schedule = solve(roster, SolveConfig(calendar=calendar, **options))
+    return {"schedule": schedule.as_dict(), "filled": sum(schedule.occupancy), "seats": len(schedule.seats)}
+
+def _ready():
+    return os.getpid()
+
+class SchedulingService:
+    """
+    Request handling and state shared by every connection: the worker
+    pool, the parsed-roster LRU, in-flight work keyed for coalescing, and
+    the counters behind /metrics. All of it is touched only from the event
+    loop thread.
+    """
+
+    def __init__(self, jobs=None, max_queue=64, cache_size=128):
+        self.jobs = jobs or os.cpu_count()
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.rosters = OrderedDict()  # roster key -> Roster, least recently used first
+        self.in_flight = {}           # work key -> future shared by identical requests
+        self.pool_tasks = 0           # submitted to the pool and not finished
+        self.peak_pool_tasks = 0
+        self.open_requests = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = dict.fromkeys(
+            ["requests", "parses", "solves", "coalesced", "roster_hits", "roster_misses", "rejected", "errors"], 0)
+        self.started = time.monotonic()
+
+    async def warm_up(self):
+        """Start the worker processes before the first request needs them."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _ready) for _ in range(self.jobs)))
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def run_in_pool(self, fn, *args):
+        if self.pool_tasks >= self.max_queue:
+            self.counters["rejected"] += 1
+            raise HTTPError(503, "Too many solves queued; retry later")
+        self.pool_tasks += 1
+        self.peak_pool_tasks = max(self.peak_pool_tasks, self.pool_tasks)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pool_tasks -= 1
+
+    async def shared(self, key, make):
+        """
+        Await `make()` once for every concurrent caller with the same key.
+        Returns (result, coalesced). The work is shielded, so one client
+        going away does not cancel it for the others.
+        """
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(future), True
+        future = asyncio.ensure_future(make())
+        self.in_flight[key] = future
+
+        def forget(_):
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+        future.add_done_callback(forget)
+        return await asyncio.shield(future), False
+
+    async def roster(self, text, calendar):
+        """The parsed roster for CSV `text`, from the LRU or a worker. Returns (key, roster, cached)."""
+        key = hashlib.sha256(text.encode() + b"\0" + calendar_key(calendar).encode()).hexdigest()
+        roster = self.rosters.get(key)
+        if roster is not None:
+            self.rosters.move_to_end(key)
+            self.counters["roster_hits"] += 1
+            return key, roster, True
+        self.counters["roster_misses"] += 1
+
+        async def parse():
+            self.counters["parses"] += 1
+            return await self.run_in_pool(_parse, text, calendar)
+
+        roster, _ = await self.shared(("parse", key), parse)
+        self.rosters[key] = roster
+        self.rosters.move_to_end(key)
+        while len(self.rosters) > self.cache_size:
+            self.rosters.popitem(last=False)
+        return key, roster, False
+
+    async def solve(self, request):
+        text = request.get("roster")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "'roster' must be the roster CSV as a string")
+        options = {
+            "solver": request.get("solver", "greedy"),
+            "max_days": request.get("max_days", 5),
+            "min_days": request.get("min_days", 0),
+            "seed": request.get("seed"),
+        }
+        if options["solver"] not in SOLVERS:
+            raise HTTPError(400, f"'solver' must be one of {', '.join(SOLVERS)}")
+        for name in ("max_days", "min_days", "seed"):
+            value = options[name]
+            # Only max_days (no cap) and seed (random) may be null
+            if (value is None and name == "min_days") or (
+                    value is not None and (not isinstance(value, int) or isinstance(value, bool))):
+                raise HTTPError(400, f"'{name}' must be an integer")
+        max_days, min_days = options["max_days"], options["min_days"]
+        if min_days < 0 or (max_days is not None and max_days < 0):
+            raise HTTPError(400, "'max_days' and 'min_days' cannot be negative")
+        if max_days is not None and min_days > max_days:
+            raise HTTPError(400, f"'min_days' ({min_days}) cannot exceed 'max_days' ({max_days})")
+        try:
+            calendar = Calendar.from_spec(request["calendar"]) if request.get("calendar") else Calendar()
+            key, roster, cached = await self.roster(text, calendar)
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPError(400, f"Bad roster or calendar: {e}")
+
+        async def run():
+            self.counters["solves"] += 1
+            return await self.run_in_pool(_solve, roster, calendar, options)
+
+        if options["seed"] is None:
+            # Unseeded solves are random, so each request gets its own
+            result, coalesced = await run(), False
+        else:
+            result, coalesced = await self.shared(("solve", key, json.dumps(options, sort_keys=True)), run)
+        return dict(result, roster_cached=cached, coalesced=coalesced)
+
+    def metrics(self):
+        latencies = list(self.latencies)
+        summary = {"count": len(latencies)}
+        if latencies:
+            summary.update({f"p{round(q * 100)}": round(percentile(latencies, q), 3) for q in (0.5, 0.95, 0.99)})
+            summary["max"] = round(max(latencies), 3)
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 3),
+            "workers": self.jobs,
+            "open_requests": self.open_requests,
+            "pool_tasks": self.pool_tasks,
+            # Pool tasks beyond the number of workers are waiting for one
+            "queue_depth": max(0, self.pool_tasks - self.jobs),
+            "peak_pool_tasks": self.peak_pool_tasks,
+            "max_queue": self.max_queue,
+            "in_flight_keys": len(self.in_flight),
+            "rosters_cached": len(self.rosters),
+            **self.counters,
+            "solve_latency_ms": summary,
+        }
+
+    async def dispatch(self, method, target, body):
+        path = target.split("?", 1)[0]
+        try:
+            if path == "/solve":
+                if method != "POST":
+                    raise HTTPError(405, "Use POST")
+                try:
+                    request = json.loads(body)
+                except ValueError:
+                    raise HTTPError(400, "Body must be JSON")
+                if not isinstance(request, dict):
+                    raise HTTPError(400, "Body must be a JSON object")
+                start = time.perf_counter()
+                result = await self.solve(request)
+                elapsed = (time.perf_counter() - start) * 1000
+                self.latencies.append(elapsed)
+                result["ms"] = round(elapsed, 3)
+                return 200, result
+            if method != "GET":
+                raise HTTPError(405, "Use GET")
+            if path == "/metrics":
+                return 200, self.metrics()
+            if path == "/health":
+                return 200, {"status": "ok"}
+            raise HTTPError(404, "Not found")
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            self.counters["errors"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle(self, reader, writer):
+        """One client connection: HTTP/1.1 requests with keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    await self.respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                method, target, version = parts
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {"error": "Body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                self.counters["requests"] += 1
+                self.open_requests += 1
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                finally:
+                    self.open_requests -= 1
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + data)
+        await writer.drain()
+
+async def serve(service, host="127.0.0.1", port=8765):
+    # Stop cleanly on SIGTERM too (e.g. process.terminate()), so main() can
+    # shut the pool down rather than leave its workers behind
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass   # Windows: Ctrl+C still ends the loop with KeyboardInterrupt
+    await service.warm_up()
+    server = await asyncio.start_server(service.handle, host, port)
+    address = server.sockets[0].getsockname()
+    # Flushed at once so a parent process can read the bound port (e.g. with --port 0)
+    print(f"listening on http://{address[0]}:{address[1]} with {service.jobs} workers", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        # Open keep-alive connections are cancelled with the loop rather than awaited
+        server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the scheduling engine over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--max-queue", type=int, default=64, help="outstanding pool tasks before requests get 503")
+    parser.add_argument("--cache-size", type=int, default=128, help="parsed rosters kept in memory")
+    args = parser.parse_args(argv)
+
+    service = SchedulingService(args.jobs, args.max_queue, args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Warm-start re-solves from a previous schedule.
+
+Consecutive weeks of a stable roster should come out nearly the same, but
+a fresh solve reshuffles everyone the random fill touches. `warm_start`
+instead seeds the new schedule with the previous assignments, matched by
+employee name, day label and shift name, and only re-decides the seats
+those assignments can no longer hold. A previous seat is dropped when:
+
+  * the employee has left the roster, or the day or shift no longer exists
+  * the employee now ranks that shift lower than when it was assigned
+  * the slot has lost capacity, or the employee would pass the week's max_days
+  * the employee's availability rules now block the slot
+
+The seats left open are then filled day by day as in the greedy solve:
+first by preference, then by the least-loaded employees off that day.
+Kept seats count toward `min_days` from the start, so someone already
+kept on later days of the week is only urgent if the days they have left
+to work need them today. Kept seats that came from spillover stay in the
+schedule's spillover record for `repair`. The report counts what was
+kept, dropped and filled, plus the employee-days whose shifts changed.
+
+    schedule, report = warm_start(roster, last_week)   # a Schedule, or rows from read_assignments()
+    print(format_report(report))
+"""
+from array import array
+from itertools import compress
+from time import perf_counter
+
+from .engine import LoadQueue, Schedule, SolveConfig, day_order
+from .export import iter_assignments
+
+def previous_assignments(schedule):
+    """(employee, day, shift, rank or None) for every seat of a solved schedule, by name."""
+    names, days, shifts = schedule.roster.names, schedule.days, schedule.shifts
+    return [(names[emp], days[d], shifts[s], rank or None) for emp, d, s, rank in iter_assignments(schedule)]
+
+def assignment_changes(previous, schedule):
+    """
+    (employee, day, shifts before, shifts after) for every employee-day whose
+    shifts differ between `previous` assignments and `schedule`. An empty
+    list of shifts means the employee was off.
+    """
+    before = _by_employee_day((name, day, shift) for name, day, shift, _ in previous)
+    names = schedule.roster.names
+    n_shifts = len(schedule.shifts)
+    after = _by_employee_day(
+        (names[emp], schedule.days[slot // n_shifts], schedule.shifts[slot % n_shifts])
+        for slot in range(len(schedule.occupancy))
+        for emp in schedule.slot_ids(slot)
+    )
+    changed = [key for key, shifts in before.items() if after.get(key) != shifts]
+    changed.extend(key for key in after if key not in before)
+    return [(name, day, _listed(before.get((name, day))), _listed(after.get((name, day))))
+            for name, day in sorted(changed)]
+
+def _spilled_seats(schedule):
+    names, days, shifts = schedule.roster.names, schedule.days, schedule.shifts
+    n_shifts = len(shifts)
+    return {(names[emp], days[d], shifts[slot % n_shifts])
+            for d, day in enumerate(schedule.spilled) for slot, emp in day}
+
+def _doubled_seats(previous):
+    held = _by_employee_day((name, day, shift) for name, day, shift, _ in previous)
+    return {(name, day, shift) for (name, day), shifts in held.items()
+            if isinstance(shifts, frozenset) for shift in shifts}
+
+def _by_employee_day(seats):
+    # Nearly everyone holds one seat a day, so a bare shift name is stored
+    # and only a second seat (from spillover) turns it into a frozenset
+    shifts = {}
+    for name, day, shift in seats:
+        key = (name, day)
+        held = shifts.get(key)
+        if held is None:
+            shifts[key] = shift
+        elif held != shift:
+            shifts[key] = (held if isinstance(held, frozenset) else frozenset([held])) | {shift}
+    return shifts
+
+def _listed(shifts):
+    if shifts is None:
+        return []
+    return sorted(shifts) if isinstance(shifts, frozenset) else [shifts]
+
+def warm_start(roster, previous, config=None):
+    """
+    Solve `roster` starting from `previous`: a Schedule, or (employee, day,
+    shift, rank) rows where rank is the 1-based preference rank the seat had
+    (None if unlisted). Returns (schedule, report).
+    """
+    config = config or SolveConfig()
+    if isinstance(previous, Schedule):
+        spilled = _spilled_seats(previous)
+        previous = previous_assignments(previous)
+    else:
+        previous = list(previous)
+        # Exports keep no spillover record, but only spillover can seat an
+        # employee twice on one day
+        spilled = _doubled_seats(previous)
+    start = perf_counter()
+    schedule = Schedule(roster, config.calendar_for(roster))
+    schedule.config = config
+    n = len(roster)
+    n_days = len(schedule.days)
+    n_shifts = len(schedule.shifts)
+    max_days = config.max_days if config.max_days is not None else n_days + 1
+    day_index = {day: d for d, day in enumerate(schedule.days)}
+    shift_index = {shift: s for s, shift in enumerate(schedule.shifts)}
+
+    seats = []
+    dropped = 0
+    for name, day, shift, rank in previous:
+        emp = roster.index.get(name)
+        d = day_index.get(day)
+        s = shift_index.get(shift)
+        if emp is None or d is None or s is None:
+            dropped += 1
+        else:
+            seats.append((d, s, emp, rank - 1 if rank else roster.ranks, (name, day, shift) in spilled))
+    # Earlier days claim max_days first, as they would in a solve
+    seats.sort(key=lambda seat: seat[0])
+
+    kept = 0
+    for d, s, emp, old_rank, was_spilled in seats:
+        slot = d * n_shifts + s
+        ranked = roster.ranked(emp, schedule.pref_index[d])
+        if ((ranked.index(s) if s in ranked else roster.ranks) > old_rank
+                or schedule.occupancy[slot] >= schedule.slot_capacity[slot]
+                or schedule.on_day[d * n + emp]
+                or schedule.week_counts(d)[emp] >= max_days
+                or schedule.blocked[emp] >> slot & 1):
+            dropped += 1
+            continue
+        schedule.assign(slot, emp)
+        if was_spilled and d:
+            schedule.spilled[d].append((slot, emp))
+        kept += 1
+
+    filled = 0
+    for d in range(n_days):
+        config.checkpoint(d, n_days)
+        filled += _fill_day(schedule, d, config)
+    config.checkpoint(n_days, n_days)
+
+    changes = assignment_changes(previous, schedule)
+    report = {
+        "kept": kept,
+        "dropped": dropped,
+        "filled": filled,
+        "changed": len(changes),
+        "changes": changes,
+        "seconds": perf_counter() - start,
+    }
+    return schedule, report
+
+def _fill_day(schedule, d, config):
+    """Fill a day's open seats: preferences first, then the least-loaded. Returns seats filled."""
+    roster = schedule.roster
+    n_shifts = len(schedule.shifts)
+    base = d * n_shifts
+    capacity = schedule.slot_capacity
+    occupancy = schedule.occupancy
+    free = sum(capacity[base:base + n_shifts]) - sum(occupancy[base:base + n_shifts])
+    if not free:
+        return 0
+    filled = 0
+    blocked = schedule.blocked
+    pref_day = schedule.pref_index[d]
+    ahead = _kept_ahead(schedule, d) if config.min_days else None
+    for emp in day_order(schedule, d, config, ahead):
+        for shift in roster.ranked(emp, pref_day):
+            slot = base + shift
+            if occupancy[slot] < capacity[slot] and not blocked[emp] >> slot & 1:
+                schedule.assign(slot, emp)
+                filled += 1
+                free -= 1
+                break
+        if not free:
+            return filled
+
+    queue = LoadQueue(schedule.available_on(d), schedule.week_counts(d), config.max_days)
+    rng = config.day_rng(d)
+    for shift in range(n_shifts):
+        while occupancy[base + shift] < capacity[base + shift]:
+            chosen = queue.pop(rng, blocked, base + shift)
+            if chosen is None:
+                return filled
+            schedule.assign(base + shift, chosen)
+            filled += 1
+    return filled
+
+def _kept_ahead(schedule, d):
+    """Later days of `d`'s week each employee is already seated on."""
+    n = len(schedule.roster)
+    ahead = array('H', [0]) * n
+    for j in range(d + 1, schedule.calendar.week_end(d)):
+        for emp in compress(range(n), schedule.on_day[j * n:(j + 1) * n]):
+            ahead[emp] += 1
+    return ahead
+
+def format_report(report):
+    """One-line summary of a warm_start() report."""
+    return (f"warm start: kept {report['kept']}, dropped {report['dropped']}, filled {report['filled']}; "
+            f"{report['changed']} assignments changed in {report['seconds'] * 1000:.1f} ms")
@@ -0,0 +1,161 @@
+"""
+Keep a solved schedule in step with a roster file that is edited outside
+the app.
+
+`FileWatcher` polls the file's size and modification time (the engine is
+stdlib-only, so there is no inotify) and reports a change once it has
+settled: a burst of writes from an editor or a sync tool within the
+debounce window counts as one update. `sync_roster` then diffs the
+re-read roster against the one the schedule was solved from and re-solves
+only what changed:
+
+  * renamed rows are renamed in place, with nothing re-solved
+  * changed preference days are patched into the roster and `repair()`
+    re-solves from each affected day until the rest of the week agrees
+  * added or removed rows and changed availability rules need a full solve
+
+With a seed the result matches a fresh solve of the new file exactly.
+
+    watcher = FileWatcher("roster.csv")
+    while True:
+        seen = watcher.wait()
+        schedule, report = sync_roster(schedule, read_roster("roster.csv"), config)
+        print(format_report(report, seen))
+"""
+import os
+import time
+
+from .engine import SolveConfig, repair, solve
+
+POLL_INTERVAL = 0.2
+# Preference bytes are compared this many at a time before narrowing down
+# to single employees, so an unchanged roster costs one pass over memory
+CHUNK = 4096
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class FileWatcher:
+    """
+    Polls `path` and reports a change once its size and mtime have stayed
+    the same for `debounce` seconds. A missing file (mid-save by editors
+    that replace it) is a change that has not settled yet.
+    """
+
+    def __init__(self, path, debounce=0.3, interval=POLL_INTERVAL):
+        self.path = path
+        self.debounce = debounce
+        self.interval = interval
+        self.stamp = _stamp(path)
+        self.pending = None   # (stamp, when it was last seen to move, when the change was first seen)
+
+    def poll(self, now=None):
+        """Time the settled change was first seen, or None if there is nothing to act on yet."""
+        now = time.perf_counter() if now is None else now
+        stamp = _stamp(self.path)
+        if self.pending is None:
+            if stamp == self.stamp:
+                return None
+            self.pending = (stamp, now, now)
+            return None
+        last, moved, first = self.pending
+        if stamp != last:
+            self.pending = (stamp, now, first)
+            return None
+        if stamp is None or now - moved < self.debounce:
+            return None
+        self.pending = None
+        if stamp == self.stamp:
+            return None   # written back exactly as it was
+        self.stamp = stamp
+        return first
+
+    def wait(self, stop=None):
+        """Block until a settled change; returns when it was first seen, or None once `stop` is set."""
+        while stop is None or not stop.is_set():
+            seen = self.poll()
+            if seen is not None:
+                return seen
+            time.sleep(self.interval)
+        return None
+
+def diff_rosters(old, new):
+    """
+    Compare two rosters row by row. Returns None when they differ in length,
+    layout or availability rules (a full solve is needed), else
+    (renamed, changed): the ids whose names differ, and {id: [roster day,
+    ...]} for the employees whose preferences differ.
+    """
+    if (len(old) != len(new) or old.days != new.days or old.shifts != new.shifts
+            or old.ranks != new.ranks or old.rules != new.rules):
+        return None
+    renamed = [emp for emp, (a, b) in enumerate(zip(old.names, new.names)) if a != b]
+    changed = {}
+    row = len(old.days) * old.ranks
+    old_prefs, new_prefs = memoryview(old.prefs), memoryview(new.prefs)
+    for start in range(0, len(new_prefs), CHUNK):
+        if old_prefs[start:start + CHUNK] == new_prefs[start:start + CHUNK]:
+            continue
+        for emp in range(start // row, min(len(new), (start + CHUNK - 1) // row + 1)):
+            days = [d for d in range(len(old.days))
+                    if old_prefs[emp * row + d * old.ranks:emp * row + (d + 1) * old.ranks]
+                    != new_prefs[emp * row + d * old.ranks:emp * row + (d + 1) * old.ranks]]
+            if days:
+                changed[emp] = days
+    return renamed, changed
+
+def sync_roster(schedule, new_roster, config=None):
+    """
+    Bring `schedule` up to date with `new_roster`. Small changes are made
+    to the schedule and its roster in place; otherwise `new_roster` is
+    solved from scratch. Returns (schedule, report).
+    """
+    config = config or schedule.config or SolveConfig()
+    start = time.perf_counter()
+    roster = schedule.roster
+    diff = diff_rosters(roster, new_roster)
+    report = {"full": diff is None, "renamed": 0, "employees": 0, "resolved": [], "seconds": 0.0}
+    if diff is None:
+        schedule = solve(new_roster, config)
+        report["resolved"] = list(range(len(schedule.days)))
+    else:
+        renamed, changed = diff
+        for emp in renamed:
+            roster.rename(emp, new_roster.names[emp])
+        # Horizon days that read each changed roster day's preferences
+        days = set()
+        for emp, pref_days in changed.items():
+            for d in pref_days:
+                start_byte = (emp * len(roster.days) + d) * roster.ranks
+                roster.set_day(emp, d, new_roster.prefs[start_byte:start_byte + roster.ranks])
+            days.update(pref_days)
+        horizon = sorted(h for h, d in enumerate(schedule.pref_index) if d in days)
+        resolved = set()
+        for d in horizon:
+            # repair() stops once the following days' inputs match the old
+            # run, which says nothing about preferences changed further on,
+            # so each changed day not already re-solved gets its own pass
+            if d not in resolved:
+                resolved.update(repair(schedule, d, config))
+        report.update(renamed=len(renamed), employees=len(changed), resolved=sorted(resolved))
+    report["seconds"] = time.perf_counter() - start
+    return schedule, report
+
+def format_report(report, seen=None):
+    """One-line summary of a sync_roster() report, with the latency since the change was seen."""
+    if report["full"]:
+        what = "rows added, removed or rules changed: full solve"
+    elif not report["resolved"] and not report["renamed"]:
+        what = "no schedule changes"
+    else:
+        what = f"{report['employees']} employees changed, {len(report['resolved'])} days re-solved"
+        if report["renamed"]:
+            what += f", {report['renamed']} renamed"
+    line = f"{what} in {report['seconds'] * 1000:.1f} ms"
+    if seen is not None:
+        line += f" ({(time.perf_counter() - seen) * 1000:.0f} ms since the change was seen)"
+    return line
@@ -0,0 +1,26 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Tests import the engine the same way the front-ends and benchmarks do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from scheduler import Roster
+
+def random_roster(n, seed=0, blank=0.2):
+    """A roster of `n` employees with random ranked preferences; `blank` is the share of empty ranks."""
+    rng = random.Random(seed)
+    roster = Roster()
+    for emp in range(n):
+        packed = bytearray()
+        for _ in roster.days:
+            shifts = rng.sample(range(1, len(roster.shifts) + 1), roster.ranks)
+            packed.extend(0 if rng.random() < blank else code for code in shifts)
+        roster.append(f"Employee {emp}", packed)
+    return roster
+
+@pytest.fixture
+def make_roster():
+    return random_roster
@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import Future
+
+from scheduler import batch
+from scheduler.batch import job_seed
+from scheduler.rng import derive_seed
+
+def test_same_file_names_in_different_sites_get_different_seeds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [os.path.join("sites", site, "employee_shifts.csv") for site in ("a", "b")]
+    assert job_seed(0, paths[0], 0) != job_seed(0, paths[1], 0)
+
+class InlinePool:
+    """Runs batch jobs in the test process instead of a process pool."""
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, job):
+        future = Future()
+        future.set_result(fn(job))
+        return future
+
+def test_seeds_do_not_depend_on_the_rest_of_the_batch(tmp_path, monkeypatch):
+    for site in ("a", "b"):
+        (tmp_path / "sites" / site).mkdir(parents=True)
+        (tmp_path / "sites" / site / "employee_shifts.csv").write_text("name,Monday\nAlice,Morning\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", InlinePool)
+    seeds = {}
+    monkeypatch.setattr(batch, "run_job", lambda job: seeds.setdefault(job[0], []).append(job[2]) or 0.0)
+    assert batch.main(["sites/*/employee_shifts.csv"]) == 0
+    assert batch.main(["sites/a/employee_shifts.csv"]) == 0
+    site_a = os.path.join("sites", "a", "employee_shifts.csv")
+    assert len(seeds[site_a]) == 2 and len(set(seeds[site_a])) == 1
+    assert seeds[site_a] != seeds[os.path.join("sites", "b", "employee_shifts.csv")]
+
+def test_absolute_and_relative_paths_share_a_seed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert job_seed(42, "site.csv", 0) == job_seed(42, str(tmp_path / "site.csv"), 0) == derive_seed(42, "site.csv", 0)
@@ -0,0 +1,17 @@
+import pytest
+
+from scheduler import batch, cli
+
+@pytest.mark.parametrize("main", [cli.main, batch.main], ids=["cli", "batch"])
+@pytest.mark.parametrize("argv, message", [
+    (["--min-days", "6", "--max-days", "5"], "--min-days (6) cannot exceed --max-days (5)"),
+    (["--min-days", "-1"], "cannot be negative"),
+    (["--calendar", "{tmp}/missing.json"], "argument --calendar"),
+])
+def test_bad_options_are_usage_errors(tmp_path, capsys, main, argv, message):
+    roster = tmp_path / "roster.csv"
+    roster.write_text("name,Monday\nAlice,morning\n")
+    with pytest.raises(SystemExit) as exit:
+        main([str(roster)] + [arg.format(tmp=tmp_path) for arg in argv])
+    assert exit.value.code == 2
+    assert message in capsys.readouterr().err
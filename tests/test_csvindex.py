@@ -0,0 +1,21 @@
+import pytest
+
+from scheduler.csvindex import CSVIndex
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+def test_edited_rows_keep_the_file_line_ending(tmp_path, newline):
+    path = tmp_path / "roster.csv"
+    path.write_bytes(newline.join([b"name,Monday", b"Alice,Morning", b"Bob,Evening", b""]))
+    index = CSVIndex(str(path))
+    index.set(0, 1, "Afternoon")
+    index.save(str(path))
+    assert path.read_bytes() == newline.join([b"name,Monday", b"Alice,Afternoon", b"Bob,Evening", b""])
+
+def test_unterminated_last_row_stays_unterminated(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_bytes(b"name,Monday\nAlice,Morning\nBob,Evening")
+    index = CSVIndex(str(path))
+    index.set(1, 0, "Robert")
+    index.save(str(path))
+    assert path.read_bytes() == b"name,Monday\nAlice,Morning\nRobert,Evening"
+    assert index.row(1) == ["Robert", "Evening"]
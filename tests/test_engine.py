@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from scheduler import DAYS, Calendar, SolveConfig, repair, solve
+from scheduler.improve import improve
+from scheduler.warmstart import warm_start
+
+def seats(schedule):
+    return [schedule.slot_ids(slot) for slot in range(len(schedule.occupancy))]
+
+def doubled(schedule):
+    """Seats held by an employee who already has a seat that day."""
+    return sum(len(ids) - len(set(ids)) for ids in (
+        [emp for _, emp in schedule.day_seats(d)] for d in range(len(schedule.days))))
+
+@pytest.mark.parametrize("solver", ["greedy", "mincost"])
+@pytest.mark.parametrize("calendar", [Calendar(capacity=4), Calendar.weeks(2, capacity=3)], ids=["week", "two-weeks"])
+def test_repair_matches_fresh_solve(make_roster, solver, calendar):
+    rng = random.Random(1)
+    for trial in range(8):
+        roster = make_roster(40, seed=trial)
+        config = SolveConfig(seed=trial, solver=solver, calendar=calendar, min_days=1)
+        schedule = solve(roster, config)
+        day = rng.randrange(len(roster.days))
+        for emp in rng.sample(range(len(roster)), 5):
+            roster.set_day(emp, day, rng.sample(range(1, 4), rng.randint(0, 3)))
+        for d in sorted(d for d, pref_day in enumerate(schedule.pref_index) if pref_day == day):
+            repair(schedule, d)
+        fresh = solve(roster, config)
+        assert seats(schedule) == seats(fresh)
+        assert list(schedule.days_worked) == list(fresh.days_worked)
+
+def test_repair_matches_fresh_solve_with_rest_rules(make_roster):
+    rng = random.Random(2)
+    for trial in range(8):
+        roster = make_roster(30, seed=trial)
+        for emp in rng.sample(range(len(roster)), 10):
+            roster.rules[emp] = ["evening then morning"]
+        config = SolveConfig(seed=trial, capacity=3)
+        schedule = solve(roster, config)
+        day = rng.randrange(len(roster.days))
+        for emp in rng.sample(range(len(roster)), 5):
+            roster.set_day(emp, day, rng.sample(range(1, 4), 3))
+        repair(schedule, day)
+        assert seats(schedule) == seats(solve(roster, config))
+
+def week_totals(schedule):
+    """{(week, employee): seats} counted from the seats themselves."""
+    n_shifts = len(schedule.shifts)
+    totals = {}
+    for slot in range(len(schedule.occupancy)):
+        week = schedule.calendar.week_of[slot // n_shifts]
+        for emp in schedule.slot_ids(slot):
+            totals[week, emp] = totals.get((week, emp), 0) + 1
+    return totals
+
+def test_calendar_weeks():
+    calendar = Calendar.weeks(3)
+    assert calendar.n_weeks == 3
+    assert calendar.week_start == [0, 7, 14, 21]
+    assert calendar.week_end(9) == 14
+    # A horizon that starts mid-week still splits where a preference column repeats
+    assert Calendar(DAYS[3:] + DAYS).week_start == [0, 7, 11]
+
+@pytest.mark.parametrize("solver", ["greedy", "mincost"])
+def test_max_days_applies_per_week(make_roster, solver):
+    calendar = Calendar.weeks(4, capacity=1)
+    config = SolveConfig(seed=0, solver=solver, calendar=calendar, max_days=5)
+    schedule = solve(make_roster(8), config)
+    # 8 employees x 5 days cover the 21 seats of every week
+    assert all(len(schedule.day_seats(d)) == calendar.day_capacity(d) for d in range(len(schedule.days)))
+    assert max(week_totals(schedule).values()) <= 5
+    for week, worked in enumerate(schedule.week_worked):
+        assert all(worked[emp] == week_totals(schedule).get((week, emp), 0) for emp in range(8))
+
+def test_min_days_applies_per_week(make_roster):
+    calendar = Calendar.weeks(2, capacity=1)
+    schedule = solve(make_roster(6), SolveConfig(seed=0, calendar=calendar, min_days=3, max_days=4))
+    totals = week_totals(schedule)
+    assert all(totals.get((week, emp), 0) >= 3 for week in range(2) for emp in range(6))
+
+@pytest.mark.parametrize("solver", ["greedy", "mincost"])
+@pytest.mark.parametrize("employees, min_days", [(10, 4), (12, 3)])
+def test_min_days_met_with_few_spare_seats(make_roster, solver, employees, min_days):
+    # The default week has 42 seats: 40 and 36 of them are needed
+    roster = make_roster(employees)
+    for seed in range(20):
+        schedule = solve(roster, SolveConfig(seed=seed, solver=solver, min_days=min_days))
+        assert min(schedule.days_worked) >= min_days
+        assert doubled(schedule) == 0
+
+@pytest.mark.parametrize("solver", ["greedy", "mincost"])
+def test_no_one_works_twice_on_a_day(make_roster, solver):
+    rng = random.Random(3)
+    for trial in range(20):
+        # Few employees and spare seats, so days spill over into the next
+        roster = make_roster(rng.randint(3, 12), seed=trial)
+        config = SolveConfig(seed=trial, solver=solver, calendar=Calendar.weeks(2, capacity=2),
+                             min_days=rng.randint(0, 3))
+        schedule = solve(roster, config)
+        improved, _ = improve(schedule, max_iterations=500, budget_ms=10000)
+        for emp in rng.sample(range(len(roster)), min(3, len(roster))):
+            roster.set_day(emp, rng.randrange(len(roster.days)), rng.sample(range(1, 4), rng.randint(0, 3)))
+        warm, _ = warm_start(roster, schedule, config)
+        for d in range(len(schedule.days)):
+            repair(schedule, d)
+        for result in (schedule, improved, warm):
+            assert doubled(result) == 0
+
+def test_warm_start_and_improve_keep_the_weekly_cap(make_roster):
+    config = SolveConfig(seed=0, calendar=Calendar.weeks(2, capacity=1), max_days=4)
+    roster = make_roster(9)
+    schedule = solve(roster, config)
+    warm, _ = warm_start(roster, schedule, config)
+    improved, _ = improve(schedule, max_iterations=20000, budget_ms=10000)
+    for result in (schedule, warm, improved):
+        assert max(week_totals(result).values()) <= 4
+        assert all(result.staffed)
+
+def test_schedule_copy_is_independent(make_roster):
+    roster = make_roster(30)
+    schedule = solve(roster, SolveConfig(seed=0, min_days=2))
+    before = seats(schedule)
+    other = schedule.copy(roster.copy())
+    other.roster.set_day(0, 0, bytes([3, 2, 1]))
+    repair(other, 0)
+    assert seats(schedule) == before != seats(other)
+    assert seats(other) == seats(solve(other.roster, SolveConfig(seed=0, min_days=2)))
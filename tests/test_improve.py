@@ -0,0 +1,40 @@
+import random
+
+from scheduler import Availability, Calendar, SolveConfig, solve
+from scheduler.improve import improve, objective
+
+def doubled(schedule):
+    """Seats held by an employee who already has a seat that day."""
+    return sum(len(ids) - len(set(ids)) for ids in (
+        [emp for _, emp in schedule.day_seats(d)] for d in range(len(schedule.days))))
+
+def rest_violations(schedule):
+    """Employees holding a pair of seats their "A then B" rules forbid."""
+    availability = Availability(schedule.roster, schedule.calendar)
+    held = {}
+    for slot in range(len(schedule.occupancy)):
+        for emp in schedule.slot_ids(slot):
+            held.setdefault(emp, set()).add(slot)
+    return sum(1 for emp, slots in held.items()
+               if emp in availability.rest and availability.rest_bits(emp, slots) & sum(1 << slot for slot in slots))
+
+def test_improve_never_seats_anyone_twice_on_a_day(make_roster):
+    rng = random.Random(0)
+    for trial in range(200):
+        # Small rosters spill over into the next day
+        schedule = solve(make_roster(rng.randint(3, 12), seed=trial), SolveConfig(seed=trial, capacity=2))
+        best, report = improve(schedule, max_iterations=1000, budget_ms=10000)
+        assert doubled(schedule) == doubled(best) == 0
+        assert objective(best) == report["best"] <= report["baseline"]
+
+def test_improve_keeps_rest_rules(make_roster):
+    rng = random.Random(1)
+    for trial in range(200):
+        roster = make_roster(rng.randint(3, 12), seed=trial)
+        for emp in range(len(roster)):
+            roster.rules[emp] = [rng.choice(["morning then evening", "evening then morning", "afternoon then morning"])]
+        schedule = solve(roster, SolveConfig(seed=trial, capacity=2))
+        assert rest_violations(schedule) == 0
+        best, _ = improve(schedule, max_iterations=1000, budget_ms=10000)
+        assert rest_violations(best) == 0
+        assert doubled(best) == 0
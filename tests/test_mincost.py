@@ -0,0 +1,37 @@
+import itertools
+import random
+
+from scheduler.mincost import assign_day
+
+def brute_force(costs, n, n_shifts, capacity):
+    """(seats filled, total cost) of the best assignment, trying every one."""
+    best = None
+    for choice in itertools.product(range(-1, n_shifts), repeat=n):
+        if any(choice.count(s) > capacity[s] for s in range(n_shifts)):
+            continue
+        if any(s >= 0 and costs[e * n_shifts + s] is None for e, s in enumerate(choice)):
+            continue
+        filled = sum(1 for s in choice if s >= 0)
+        total = sum(costs[e * n_shifts + s] for e, s in enumerate(choice) if s >= 0)
+        if best is None or (-filled, total) < (-best[0], best[1]):
+            best = (filled, total)
+    return best
+
+def test_assign_day_is_optimal():
+    rng = random.Random(0)
+    for _ in range(300):
+        n = rng.randint(1, 6)
+        n_shifts = rng.randint(1, 3)
+        capacity = [rng.randint(0, 3) for _ in range(n_shifts)]
+        costs = [None if rng.random() < 0.2 else rng.randint(0, 9) for _ in range(n * n_shifts)]
+        where = assign_day(costs, n, n_shifts, capacity)
+        for s in range(n_shifts):
+            assert list(where).count(s) <= capacity[s]
+        assert all(s < 0 or costs[e * n_shifts + s] is not None for e, s in enumerate(where))
+        filled = sum(1 for s in where if s >= 0)
+        total = sum(costs[e * n_shifts + s] for e, s in enumerate(where) if s >= 0)
+        assert (filled, total) == brute_force(costs, n, n_shifts, capacity)
+
+def test_assign_day_with_shared_capacity():
+    where = assign_day([0, 1, 0, 1, 0, 1], 3, 2, 1)
+    assert sorted(where) == [-1, 0, 1]
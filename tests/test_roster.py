@@ -0,0 +1,15 @@
+from scheduler import Roster
+
+def test_copy_is_independent_of_later_edits(make_roster):
+    roster = make_roster(5)
+    roster.rules[1] = ["Monday"]
+    # Rosters read from the cache hold their preferences in a read-only view
+    roster.prefs = memoryview(bytes(roster.prefs))
+    copy = roster.copy()
+    copy.rename(0, "Zoe")
+    copy.set_day(2, 0, [3])
+    copy.rules[1].append("evening")
+    assert roster.names[0] == "Employee 0" and "Zoe" not in roster.index
+    assert roster.ranked(2, 0) != [2] and copy.ranked(2, 0) == [2]
+    assert roster.rules[1] == ["Monday"]
+    assert isinstance(copy, Roster) and len(copy) == len(roster)
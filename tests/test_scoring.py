@@ -0,0 +1,28 @@
+import pytest
+
+from scheduler import Calendar, SolveConfig, solve
+from scheduler.scoring import Scorer, np
+
+def reference(schedule):
+    """(filled, gaps) counted seat by seat."""
+    filled = sum(schedule.occupancy)
+    return filled, sum(schedule.slot_capacity) - filled
+
+@pytest.mark.parametrize("use_numpy", [False] + ([True] if np is not None else []))
+def test_filled_and_gaps_match_the_seats(make_roster, use_numpy):
+    # Few seats and a min_days target, so days spill over and fill up
+    roster = make_roster(40, seed=3)
+    calendar = Calendar.weeks(2, capacity=2)
+    schedules = [solve(roster, SolveConfig(calendar=calendar, seed=seed, min_days=3)) for seed in range(5)]
+    scores = Scorer(roster, calendar, use_numpy=use_numpy).score(schedules)
+    assert [(int(f), int(g)) for f, g in zip(scores["filled"], scores["gaps"])] == list(map(reference, schedules))
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_numpy_and_python_paths_agree(make_roster):
+    roster = make_roster(60, seed=3)
+    calendar = Calendar.weeks(2, capacity=3)
+    schedules = [solve(roster, SolveConfig(calendar=calendar, seed=seed)) for seed in range(5)]
+    fast = Scorer(roster, calendar).score(schedules)
+    slow = Scorer(roster, calendar, use_numpy=False).score(schedules)
+    for key in fast:
+        assert np.allclose(np.asarray(fast[key]), np.asarray(slow[key]))
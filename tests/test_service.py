@@ -0,0 +1,45 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from scheduler.service import SchedulingService
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+ROSTER = "name,Monday_1\nAlice,Morning\n"
+
+@pytest.mark.parametrize("options, message", [
+    ({"min_days": 3, "max_days": 2}, "cannot exceed"),
+    ({"min_days": -1}, "negative"),
+    ({"min_days": None}, "integer"),
+    ({"max_days": "5"}, "integer"),
+    ({"solver": "fastest"}, "solver"),
+])
+def test_bad_options_are_rejected_before_solving(options, message):
+    service = SchedulingService(jobs=1)
+    try:
+        body = json.dumps(dict(options, roster=ROSTER)).encode()
+        status, payload = asyncio.run(service.dispatch("POST", "/solve", body))
+    finally:
+        service.close()
+    assert status == 400
+    assert message in payload["error"]
+    assert service.counters["parses"] == 0
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX signals")
+def test_sigterm_shuts_the_workers_down():
+    process = subprocess.Popen([sys.executable, "-m", "scheduler.service", "--port", "0", "--jobs", "2"],
+                               cwd=SRC, stdout=subprocess.PIPE, text=True)
+    try:
+        assert process.stdout.readline().startswith("listening on")
+        process.send_signal(signal.SIGTERM)
+        # Workers left running would keep the pipe open and the read would never end
+        out, _ = process.communicate(timeout=30)
+    finally:
+        process.kill()
+    assert process.returncode == 0
+    assert out == ""
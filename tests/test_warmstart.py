@@ -0,0 +1,32 @@
+from scheduler import Calendar, Roster, SolveConfig, solve
+from scheduler.warmstart import previous_assignments, warm_start
+
+def test_kept_spillover_stays_in_the_spillover_record(make_roster):
+    roster = make_roster(40, seed=5)
+    config = SolveConfig(calendar=Calendar.weeks(2, capacity=1), seed=5)
+    schedule = solve(roster, config)
+    assert any(schedule.spilled)
+    for previous in (schedule, previous_assignments(schedule)):
+        warm, _ = warm_start(roster, previous, config)
+        for d, seats in enumerate(warm.spilled):
+            assert set(seats) <= set(warm.day_seats(d))
+        # Every seat is kept when nothing changed, and one per employee-day
+        kept = {(d, emp) for d in range(len(warm.days)) for _, emp in warm.day_seats(d)}
+        assert kept == {(d, emp) for d in range(len(schedule.days)) for _, emp in schedule.day_seats(d)}
+    # Only a Schedule carries the exact record; exports just mark doubled days
+    warm, _ = warm_start(roster, schedule, config)
+    assert {(d, emp) for d, day in enumerate(warm.spilled) for _, emp in day} == {
+        (d, emp) for d, day in enumerate(schedule.spilled) for _, emp in day}
+
+def test_min_days_counts_seats_kept_later_in_the_week():
+    # Alice is kept on Wednesday, so her one other day this week has to be
+    # Tuesday once Bob has taken Monday
+    roster = Roster()
+    roster.add("Bob", {day: ["morning"] for day in ("Monday", "Tuesday", "Wednesday")})
+    roster.add("Alice", {day: ["morning"] for day in ("Monday", "Tuesday", "Wednesday")})
+    days = ["Monday", "Tuesday", "Wednesday"]
+    capacity = {"default": 0, **{day: {"morning": 1} for day in days}}
+    config = SolveConfig(calendar=Calendar(days, capacity=capacity), min_days=2, seed=0)
+    warm, report = warm_start(roster, [("Alice", "Wednesday", "morning", 1)], config)
+    assert report["kept"] == 1
+    assert [warm.names(d, 0) for d in range(3)] == [["Bob"], ["Alice"], ["Alice"]]